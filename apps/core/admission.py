@@ -0,0 +1,362 @@
+"""
+Control de admisión de los ViewSets de heroes y teams
+
+Una ráfaga de GET /api/heroes/?limit=100 de un solo cliente apila
+requests sobre SQLite hasta que todos los clientes dan timeout. Con
+ADMISSION['enabled'] cada request de HeroViewSet/TeamViewSet (y sus
+versiones async) pasa, después de la autenticación de DRF, por:
+
+1. Un token bucket por cliente y clase de endpoint: `rate` requests por
+   segundo con ráfagas de hasta `burst`. Sin tokens → 429 con
+   Retry-After (lo que falta para el próximo token)
+2. Un límite de requests en curso por clase de endpoint en el proceso
+   (`max_concurrency`). Si está lleno, el request espera en una cola de
+   hasta `max_queue` lugares, como mucho `queue_timeout` segundos. Cola
+   llena o timeout → 503 con Retry-After (se descarta temprano, antes de
+   tocar la base de datos)
+
+Clases de endpoint:
+- writes: POST/PUT/PATCH/DELETE
+- exports: GET con limit >= export_min_limit o include_archived (páginas
+  grandes y lecturas del archivo)
+- reads: el resto de los GET/HEAD
+
+El cliente es el token del header Authorization (hasheado) o, sin token,
+la IP (BaseThrottle.get_ident de DRF, que respeta NUM_PROXIES).
+
+Las vistas async esperan su lugar en la cola sin bloquear el event loop.
+Requests en curso, profundidad de la cola, esperas y rechazos se publican
+en /api/metrics (api_admission_*).
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+from .metrics import registry
+
+DEFAULT_ADMISSION_CONFIG = {
+    'enabled': False,
+    'export_min_limit': 50,
+    'max_clients': 10000,
+    'retry_after': 1,
+    'classes': {
+        'reads': {'rate': 50, 'burst': 100, 'max_concurrency': 32, 'max_queue': 64, 'queue_timeout': 0.5},
+        'writes': {'rate': 10, 'burst': 20, 'max_concurrency': 4, 'max_queue': 32, 'queue_timeout': 1.0},
+        'exports': {'rate': 1, 'burst': 5, 'max_concurrency': 2, 'max_queue': 4, 'queue_timeout': 0.5},
+    },
+}
+
+REJECTION_REASONS = ('rate_limited', 'queue_full', 'queue_timeout')
+
+
+def get_config() -> dict:
+    return {**DEFAULT_ADMISSION_CONFIG, **getattr(settings, 'ADMISSION', {})}
+
+
+class TooManyRequests(Throttled):
+    default_detail = 'Demasiados requests de este cliente.'
+    extra_detail_singular = 'Reintentar en {wait} segundo.'
+    extra_detail_plural = 'Reintentar en {wait} segundos.'
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'El servidor está saturado, reintentar más tarde.'
+    default_code = 'overloaded'
+
+    def __init__(self, wait: int):
+        super().__init__()
+        # exception_handler de DRF lo publica como Retry-After
+        self.wait = wait
+
+
+class ClientBuckets:
+    """
+    Token buckets por cliente de una clase de endpoint (LRU de hasta
+    max_clients clientes: el menos reciente se descarta con el bucket lleno).
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        # cliente → [tokens, último refill]
+        self._buckets: 'OrderedDict[str, list]' = OrderedDict()
+
+    def take(self, client: str) -> float:
+        """
+        Consume un token. Retorna 0 si había, o los segundos hasta el próximo.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """
+    Requests en curso de una clase de endpoint, con una cola de espera acotada.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.queue_wait_seconds = 0.0
+        self.rejections = dict.fromkeys(REJECTION_REASONS, 0)
+
+    def try_acquire(self) -> Optional[bool]:
+        """
+        True si hay lugar (ya lo ocupa), False si hay que esperar en la cola
+        (ya está anotado en ella) o None si la cola está llena.
+        """
+        with self._condition:
+            if self.in_flight < self.max_concurrency:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.max_queue:
+                self.rejections['queue_full'] += 1
+                return None
+            self.waiting += 1
+            self.queued += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            return False
+
+    def wait(self) -> bool:
+        """
+        Espera (bloqueando el thread) un lugar después de try_acquire() == False.
+        """
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        with self._condition:
+            try:
+                while self.in_flight >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejections['queue_timeout'] += 1
+                        return False
+                    self._condition.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+                self.queue_wait_seconds += time.monotonic() - start
+
+    def reject(self, reason: str) -> None:
+        with self._condition:
+            self.rejections[reason] += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'max_concurrency': self.max_concurrency,
+                'queue_depth': self.waiting,
+                'max_queue_depth': self.max_waiting,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'queue_wait_seconds': self.queue_wait_seconds,
+                'rejections': dict(self.rejections),
+            }
+
+
+class AdmissionController:
+    """
+    Token buckets y límites de concurrencia de todas las clases de endpoint.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.buckets: Dict[str, ClientBuckets] = {}
+        self.limiters: Dict[str, ConcurrencyLimiter] = {}
+        for name, limits in config['classes'].items():
+            self.buckets[name] = ClientBuckets(limits['rate'], limits['burst'], config['max_clients'])
+            self.limiters[name] = ConcurrencyLimiter(
+                limits['max_concurrency'], limits['max_queue'], limits['queue_timeout']
+            )
+
+    def endpoint_class(self, request) -> str:
+        if request.method not in SAFE_METHODS:
+            return 'writes'
+        params = request.query_params
+        try:
+            limit = int(params.get('limit', 0))
+        except ValueError:
+            limit = 0
+        if limit >= self.config['export_min_limit'] or params.get('include_archived', '').lower() in ('true', '1'):
+            return 'exports'
+        return 'reads'
+
+    def check_rate(self, request, endpoint_class: str) -> ConcurrencyLimiter:
+        """
+        Consume el token del cliente (o lanza TooManyRequests) y retorna el
+        limitador de la clase.
+        """
+        limiter = self.limiters[endpoint_class]
+        wait = self.buckets[endpoint_class].take(client_key(request))
+        if wait:
+            limiter.reject('rate_limited')
+            raise TooManyRequests(wait=max(1, math.ceil(wait)))
+        return limiter
+
+    def overloaded(self) -> Overloaded:
+        return Overloaded(self.config['retry_after'])
+
+    def stats(self) -> Dict[str, dict]:
+        stats = {name: limiter.stats() for name, limiter in self.limiters.items()}
+        for name, buckets in self.buckets.items():
+            stats[name]['clients'] = len(buckets)
+        return stats
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_controller() -> Optional[AdmissionController]:
+    """
+    Controlador para la configuración actual (None si está desactivado).
+    Se arma de nuevo si ADMISSION cambia (por ejemplo con override_settings).
+    """
+    global _controller
+    config = get_config()
+    if not config['enabled']:
+        return None
+    controller = _controller
+    if controller is None or controller.config != config:
+        with _controller_lock:
+            if _controller is None or _controller.config != config:
+                _controller = AdmissionController(config)
+                registry.register_admission(_controller)
+            controller = _controller
+    return controller
+
+
+def reset_controller(setting, **kwargs):
+    """
+    Receiver de setting_changed: con cada override_settings(ADMISSION=...)
+    los buckets y las colas arrancan de cero.
+    """
+    global _controller
+    if setting == 'ADMISSION':
+        with _controller_lock:
+            _controller = None
+
+
+def client_key(request) -> str:
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if authorization:
+        return 'token:' + hashlib.sha1(authorization.encode()).hexdigest()[:20]
+    return 'ip:' + BaseThrottle().get_ident(request)
+
+
+def admit(request) -> Optional[ConcurrencyLimiter]:
+    """
+    Admite el request (esperando en la cola si hace falta) y retorna el
+    limitador a liberar al terminar, o lanza TooManyRequests/Overloaded.
+    """
+    controller = get_controller()
+    if controller is None:
+        return None
+    limiter = controller.check_rate(request, controller.endpoint_class(request))
+    acquired = limiter.try_acquire()
+    if acquired is None or (acquired is False and not limiter.wait()):
+        raise controller.overloaded()
+    return limiter
+
+
+async def aadmit(request) -> Optional[ConcurrencyLimiter]:
+    """
+    admit() para vistas async: la espera en la cola corre en un thread
+    (solo cuando el límite está lleno; la cola acota cuántos).
+    """
+    controller = get_controller()
+    if controller is None:
+        return None
+    limiter = controller.check_rate(request, controller.endpoint_class(request))
+    acquired = limiter.try_acquire()
+    if acquired is False:
+        acquired = await sync_to_async(limiter.wait, thread_sensitive=False)()
+    if not acquired:
+        raise controller.overloaded()
+    return limiter
+
+
+class AdmissionControlMixin:
+    """
+    Control de admisión para un ViewSet sync: admite en initial() (después
+    de la autenticación de DRF) y libera el lugar al terminar dispatch().
+    Los rechazos son APIException: DRF responde 429/503 con Retry-After.
+    """
+    admission = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.admission = admit(request)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            self._release_admission()
+
+    def _release_admission(self):
+        if self.admission is not None:
+            self.admission.release()
+            self.admission = None
+
+
+class AsyncAdmissionControlMixin(AdmissionControlMixin):
+    """
+    Control de admisión para un AsyncViewSet: admite en ainitial() sin
+    bloquear el event loop.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super(AdmissionControlMixin, self).initial(request, *args, **kwargs)
+
+    async def ainitial(self, request, *args, **kwargs):
+        await super().ainitial(request, *args, **kwargs)
+        self.admission = await aadmit(request)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super(AdmissionControlMixin, self).dispatch(request, *args, **kwargs)
+        finally:
+            self._release_admission()
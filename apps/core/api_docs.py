@@ -0,0 +1,281 @@
+"""
+Documentación OpenAPI (drf_yasg) cargada recién cuando se pide
+
+drf_yasg y los docs.py de cada app (decenas de swagger_auto_schema,
+openapi.Parameter y openapi.Response armados al importar) se pagaban en
+el arranque de cada worker, aunque nadie abriera /docs/.
+
+- Las vistas toman sus decoradores de LazyDocs('apps.heroes.docs'):
+  `@docs.list_heroes_docs` solo anota la acción, sin importar docs.py.
+  Con API_DOCS_ENABLED=False ni eso: devuelve la función tal cual
+- docs_urlpatterns() registra /docs/, /redoc/ y /swagger.json|.yaml con
+  vistas livianas. El primer request importa drf_yasg y los docs.py,
+  aplica los decoradores anotados a las acciones (mismo resultado que
+  decorarlas al importar) y arma schema_view
+- Con API_DOCS_ENABLED=False esas rutas no existen (404)
+
+`manage.py bench_startup` mide el arranque con y sin documentación.
+
+Schema prearmado (/swagger.json y /swagger.yaml): generar el schema
+recorre todos los ViewSets y serializers (decenas de ms de CPU que
+crecen con la API), así que no se hace en cada request:
+- `manage.py build_openapi` lo escribe en settings.OPENAPI_SCHEMA_DIR
+  al desplegar (más una copia .gz para servirlo desde nginx)
+- schema_file_view() sirve el archivo: lo lee una vez y lo guarda en
+  memoria con su versión gzip y su ETag (se vuelve a leer si cambia el
+  mtime). Responde 304 con If-None-Match y gzip con Accept-Encoding
+- Si el archivo no existe, genera el schema una vez (get_artifact) y lo
+  memoriza igual
+- Swagger UI y ReDoc cargan el schema de /swagger.json (SPEC_URL)
+"""
+import gzip
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import path, re_path
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+# Formato de la URL (/swagger.json, /swagger.yaml) → (archivo, Content-Type)
+SCHEMA_FORMATS = {
+    '.json': ('swagger.json', 'application/json'),
+    '.yaml': ('swagger.yaml', 'application/yaml'),
+}
+
+# Acciones anotadas por LazyDocs y todavía sin decorar: (módulo docs, nombre del decorador, acción)
+_pending: List[Tuple[str, str, Callable]] = []
+_lock = threading.RLock()
+_schema_view: Optional[Any] = None
+
+
+class SchemaArtifact(NamedTuple):
+    """
+    Schema listo para servir: cuerpo, cuerpo gzip y sus ETags.
+    """
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+    # (ruta, mtime) del archivo leído; mtime None si se generó porque no había archivo
+    version: Optional[Tuple[str, Optional[int]]]
+
+
+# Formato → último SchemaArtifact servido
+_artifacts: Dict[str, SchemaArtifact] = {}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'API_DOCS_ENABLED', True)
+
+
+class LazyDocs:
+    """
+    Decoradores de documentación de un módulo docs.py, sin importarlo:
+
+        docs = LazyDocs('apps.heroes.docs')
+
+        @docs.list_heroes_docs
+        def list(self, request): ...
+
+    Va encima de @action, igual que el decorador real.
+    """
+
+    def __init__(self, module: str):
+        self.module = module
+
+    def __getattr__(self, name: str) -> Callable[[Callable], Callable]:
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def decorator(view_method: Callable) -> Callable:
+            if is_enabled():
+                with _lock:
+                    _pending.append((self.module, name, view_method))
+            return view_method
+        return decorator
+
+
+def load() -> None:
+    """
+    Importa los docs.py y aplica sus decoradores a las acciones anotadas.
+
+    swagger_auto_schema guarda los overrides como atributo de la función
+    (_swagger_auto_schema) y la retorna: decorarla ahora equivale a
+    haberla decorado al definir la clase.
+    """
+    with _lock:
+        while _pending:
+            module, name, view_method = _pending.pop(0)
+            getattr(import_module(module), name)(view_method)
+
+
+def api_info() -> Any:
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="API REST Django",
+        default_version='v1',
+        description="Documentación de la API REST con Django REST Framework",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@api.local"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def get_schema_view() -> Any:
+    """
+    schema_view de drf_yasg (se arma una sola vez, al primer request de documentación).
+    """
+    global _schema_view
+    with _lock:
+        if _schema_view is None:
+            from drf_yasg.views import get_schema_view as build_schema_view
+            from rest_framework import permissions
+
+            load()
+            _schema_view = build_schema_view(api_info(), public=True, permission_classes=(permissions.AllowAny,))
+    return _schema_view
+
+
+# ==================== SCHEMA PREARMADO ====================
+def generate_schema(fmt: str) -> bytes:
+    """
+    Genera el schema OpenAPI completo en formato '.json' o '.yaml'.
+
+    Sin request: el schema no fija host ni esquema y los clientes usan el
+    del servidor que lo sirve (el mismo archivo sirve en cualquier entorno).
+    """
+    from drf_yasg.app_settings import swagger_settings
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+    load()
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(api_info())
+    schema = generator.get_schema(request=None, public=True)
+    codec = OpenAPICodecJson(validators=[]) if fmt == '.json' else OpenAPICodecYaml(validators=[])
+    return codec.encode(schema)
+
+
+def schema_path(fmt: str, directory: Optional[str] = None) -> Path:
+    return Path(directory or settings.OPENAPI_SCHEMA_DIR) / SCHEMA_FORMATS[fmt][0]
+
+
+def build_artifact(body: bytes, version: Optional[Tuple[str, Optional[int]]] = None) -> SchemaArtifact:
+    digest = hashlib.sha1(body).hexdigest()
+    # mtime=0: el mismo schema produce siempre el mismo .gz
+    return SchemaArtifact(body, gzip.compress(body, mtime=0), quote_etag(digest), quote_etag(f'{digest}-gzip'), version)
+
+
+def write_schema(fmt: str, directory: Optional[str] = None) -> Tuple[Path, SchemaArtifact]:
+    """
+    Genera el schema y lo escribe (más su .gz) en `directory`. Cada archivo
+    se escribe aparte y se reemplaza con os.replace: un worker nunca lee
+    un archivo a medio escribir.
+    """
+    artifact = build_artifact(generate_schema(fmt))
+    target = schema_path(fmt, directory)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    for content, destination in ((artifact.gzipped, target.with_name(target.name + '.gz')), (artifact.body, target)):
+        fd, tmp = tempfile.mkstemp(dir=str(target.parent), prefix=f'.{target.name}.')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, destination)
+    return target, artifact
+
+
+def get_artifact(fmt: str) -> SchemaArtifact:
+    """
+    Schema a servir: el archivo de build_openapi (releído solo si cambia
+    su mtime) o, si no existe, el generado en este proceso.
+    """
+    target = schema_path(fmt)
+    try:
+        version = (str(target), os.stat(target).st_mtime_ns)
+    except FileNotFoundError:
+        version = (str(target), None)
+
+    artifact = _artifacts.get(fmt)
+    if artifact is not None and artifact.version == version:
+        return artifact
+
+    with _lock:
+        artifact = _artifacts.get(fmt)
+        if artifact is None or artifact.version != version:
+            if version[1] is None:
+                logger.warning('No existe %s (manage.py build_openapi): se genera el schema en el proceso', target)
+                artifact = build_artifact(generate_schema(fmt), version)
+            else:
+                artifact = build_artifact(target.read_bytes(), version)
+            _artifacts[fmt] = artifact
+    return artifact
+
+
+def accepts_gzip(request) -> bool:
+    return re.search(r'\bgzip\b', request.headers.get('Accept-Encoding', '')) is not None
+
+
+@csrf_exempt
+@require_safe
+def schema_file_view(request, format):
+    """
+    GET/HEAD /swagger.json y /swagger.yaml: el schema prearmado, con ETag
+    (304 con If-None-Match) y gzip si el cliente lo acepta.
+    """
+    artifact = get_artifact(format)
+    gzipped = accepts_gzip(request)
+    etag = artifact.gzip_etag if gzipped else artifact.etag
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(artifact.gzipped if gzipped else artifact.body,
+                                content_type=SCHEMA_FORMATS[format][1])
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Content-Length'] = str(len(response.content))
+
+    response.headers['ETag'] = etag
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
+
+
+def lazy_view(build: Callable[[], Callable]) -> Callable:
+    """
+    Vista que arma la vista real (build()) recién en su primer request.
+    """
+    view = None
+
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = build()
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def docs_urlpatterns() -> list:
+    """
+    Rutas de Swagger UI, ReDoc y el schema OpenAPI (vacío si API_DOCS_ENABLED es False).
+    """
+    if not is_enabled():
+        return []
+    return [
+        re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_file_view, name='schema-json'),
+        path('docs/', lazy_view(lambda: get_schema_view().with_ui('swagger', cache_timeout=0)),
+             name='schema-swagger-ui'),
+        path('redoc/', lazy_view(lambda: get_schema_view().with_ui('redoc', cache_timeout=0)),
+             name='schema-redoc'),
+    ]
@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+        from django.test.signals import setting_changed
+        from .admission import reset_controller
+        from .query_hooks import install
+        from .sqlite_profile import apply_profile
+
+        # Hooks de queries por contexto (apps/core/query_hooks.py)
+        connection_created.connect(install, dispatch_uid='apps.core.query_hooks')
+        # PRAGMAs de settings.SQLITE_PROFILE (apps/core/sqlite_profile.py)
+        connection_created.connect(apply_profile, dispatch_uid='apps.core.sqlite_profile')
+        # Control de admisión nuevo en cada override_settings(ADMISSION=...) (apps/core/admission.py)
+        setting_changed.connect(reset_controller, dispatch_uid='apps.core.admission')
+        for connection in connections.all(initialized_only=True):
+            if connection.connection is not None:
+                install(sender=type(connection), connection=connection)
+                apply_profile(sender=type(connection), connection=connection)
@@ -0,0 +1,94 @@
+"""
+ViewSets async para DRF
+
+DRF 3.16 no tiene vistas async: APIView.dispatch() es sync y, bajo ASGI,
+Django la ejecuta en un thread (sync_to_async) por cada request. Además
+el Response de DRF se renderiza después, con otro salto de thread.
+
+AsyncViewSet reimplementa dispatch() como corrutina:
+- las acciones son `async def` y usan el ORM async (aget, acount, async for)
+- la autenticación (initial, desde ainitial) solo se manda a un thread si
+  el request trae credenciales (Authorization o cookie de sesión); sin
+  credenciales no hay queries y corre en el event loop
+- el Response se renderiza acá y se devuelve como HttpResponse plano, así
+  Django no vuelve a saltar de thread para renderizarlo (se conserva .data)
+
+Los routers de DRF funcionan igual: AsyncViewSet.as_view() retorna la
+misma vista de ViewSetMixin marcada como corrutina.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+
+class AsyncViewSet(viewsets.ViewSet):
+    """
+    ViewSet cuyas acciones son corrutinas (async def).
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        # La vista de ViewSetMixin retorna self.dispatch(...), que acá es
+        # una corrutina: marcarla hace que Django la await sin usar threads
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Igual que APIView.dispatch() pero awaiteando la acción.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, '__await__'):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self._render(self.response)
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        initial() de DRF (autenticación, permisos, throttles), en un thread
+        solo si el request trae credenciales.
+        """
+        if self._has_credentials(request):
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+        else:
+            self.initial(request, *args, **kwargs)
+
+    @staticmethod
+    def _has_credentials(request) -> bool:
+        meta = request._request.META
+        return 'HTTP_AUTHORIZATION' in meta or settings.SESSION_COOKIE_NAME in request._request.COOKIES
+
+    @staticmethod
+    def _render(response):
+        if not isinstance(response, Response):
+            return response
+
+        response.render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        rendered.cookies = response.cookies
+        # Los tests (y quien use el objeto) siguen viendo los datos sin renderizar
+        rendered.data = response.data
+        rendered.exception = response.exception
+        return rendered
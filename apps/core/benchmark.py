@@ -0,0 +1,102 @@
+"""
+Utilidades para microbenchmarks con baselines versionadas
+
+- measure(): mejor tiempo por llamada (timeit con autorange + repeticiones).
+- peak_allocation(): pico de memoria asignada por una llamada (tracemalloc).
+- calibrate(): tiempo de una carga Python fija. Los tiempos se guardan
+  también divididos por este valor para que una baseline tomada en otra
+  máquina siga siendo comparable.
+- compare(): detecta regresiones contra una baseline según un umbral.
+
+Las baselines se guardan en benchmarks/baselines/<suite>.json.
+"""
+import json
+import os
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from django.conf import settings
+
+BASELINES_DIR = os.path.join(str(settings.BASE_DIR), 'benchmarks', 'baselines')
+
+# Métricas que se comparan contra la baseline (más alto = peor)
+COMPARED_METRICS = ('normalized_time', 'peak_bytes_per_row')
+
+
+def _reference_workload():
+    data = {}
+    for i in range(2000):
+        data[f'k{i}'] = [i, str(i), {'nivel': i % 100}]
+    return sorted(data.items(), key=lambda item: item[1][0], reverse=True)
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Segundos de la carga de referencia (mejor de `repeat`).
+    """
+    return measure(_reference_workload, repeat=repeat)
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Mejor tiempo por llamada en segundos. Cada repetición dura al menos 0.2 s.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_allocation(func: Callable[[], object]) -> int:
+    """
+    Pico de bytes asignados durante una llamada.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINES_DIR, f'{suite}.json')
+
+
+def load_baseline(suite: str, path: Optional[str] = None) -> Optional[dict]:
+    path = path or baseline_path(suite)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(suite: str, report: dict, path: Optional[str] = None) -> str:
+    path = path or baseline_path(suite)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    return path
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Retorna una línea por cada métrica que empeoró más que `threshold`
+    (0.25 = 25%) respecto de la baseline. Los casos nuevos no se comparan.
+    """
+    regressions = []
+    for case, metrics in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before = reference.get(metric)
+            after = metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > threshold:
+                regressions.append(f'{case} {metric}: {before:g} -> {after:g} (+{change:.0%})')
+    return regressions
@@ -0,0 +1,304 @@
+"""
+Cachés de la API
+
+1. RepresentationCache - representaciones serializadas (backend de Django)
+2. LRUCache - lookups en memoria del proceso, acotados (LRU) y con TTL
+
+== RepresentationCache ==
+
+Guarda el resultado YA SERIALIZADO de un recurso (el dict que devuelve
+el Read Schema) junto con sus validadores HTTP (ETag/Last-Modified).
+Un acierto evita tanto la query a la base de datos como el serializer.
+
+Claves y versiones:
+- "<ns>:gen"        → generación del namespace (invalidate_all la renueva)
+- "<ns>:ver:<pk>"   → versión del registro (invalidate la renueva)
+- "<ns>:obj:<pk>"   → (token, representación)
+
+Las versiones son tokens aleatorios, no contadores: si el backend expulsa
+una clave de versión, se genera un token nuevo y las entradas viejas dejan
+de coincidir (nunca se "resucita" un valor obsoleto).
+
+El token se lee ANTES de ir a la base de datos. Si una escritura invalida
+el registro mientras tanto, la entrada se guarda con el token viejo y
+nunca llega a leerse.
+
+Los Services devuelven un DeferredRepresentation: los validadores salen
+de la entrada cacheada o del registro cargado, y el serializer corre
+(y la entrada se guarda) recién con build(). Un 304 o un HEAD con la
+caché fría no serializa nada.
+
+Nota: con el backend por defecto (LocMemCache) la caché es por proceso.
+Con varios workers, configurar un backend compartido en CACHES.
+
+== LRUCache ==
+
+Diccionario en memoria protegido por un lock, sin serialización (pickle)
+ni viaje al backend de caché. Pensado para datos pequeños que cambian
+poco (por ejemplo los teams en el camino de escritura de heroes).
+Expone contadores de hits/misses/evictions con stats().
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from .conditional import Validators
+from .db_router import cache_fill_allowed
+
+
+class Representation(NamedTuple):
+    """
+    Representación serializada de un recurso + sus validadores HTTP
+    """
+    data: Dict[str, Any]
+    validators: Validators
+
+
+class DeferredRepresentation:
+    """
+    Validadores HTTP ya calculados + la representación, que se arma recién
+    con build() (serializer y guardado en la caché). Las vistas responden
+    304/HEAD con los validadores sin llamarlo.
+
+    En los Services async build() es una corrutina.
+    """
+
+    def __init__(self, validators: Validators, build: Callable[[], Any]):
+        self.validators = validators
+        self.build = build
+
+    @classmethod
+    def ready(cls, representation: Representation) -> 'DeferredRepresentation':
+        """Representación ya armada (acierto de caché)"""
+        return cls(representation.validators, lambda: representation)
+
+    @classmethod
+    def aready(cls, representation: Representation) -> 'DeferredRepresentation':
+        """ready() para los Services async (build() es una corrutina)"""
+        async def build() -> Representation:
+            return representation
+
+        return cls(representation.validators, build)
+
+
+class RepresentationCache:
+    """
+    Caché read-through de representaciones, versionada por id.
+
+    Uso típico (en un Service):
+        representation, token = cache.lookup(pk)
+        if representation is None:
+            representation = ...  # query + serializer
+            cache.store(pk, token, representation)
+    (con DeferredRepresentation el serializer y el store van en build())
+    """
+
+    def __init__(self, namespace: str, alias: str = 'default', timeout: Optional[int] = None):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _keys(self, pk: Any) -> Tuple[str, str, str]:
+        return (
+            f'{self.namespace}:gen',
+            f'{self.namespace}:ver:{pk}',
+            f'{self.namespace}:obj:{pk}',
+        )
+
+    def _ensure_token(self, key: str) -> str:
+        """Crea el token de versión si no existe (add es atómico)"""
+        token = uuid.uuid4().hex
+        if self.cache.add(key, token, None):
+            return token
+        return self.cache.get(key) or token
+
+    def lookup(self, pk: Any) -> Tuple[Optional[Representation], str]:
+        """
+        Busca la representación de un registro.
+
+        Hace un único get_many (generación + versión + entrada).
+
+        Args:
+            pk: ID del registro
+
+        Returns:
+            Tuple: (Representation o None si no está/está obsoleta, token de versión)
+                   El token debe pasarse a store() si hay que rellenar la entrada.
+        """
+        gen_key, ver_key, obj_key = self._keys(pk)
+        found = self.cache.get_many([gen_key, ver_key, obj_key])
+
+        generation = found.get(gen_key) or self._ensure_token(gen_key)
+        version = found.get(ver_key) or self._ensure_token(ver_key)
+        token = f'{generation}:{version}'
+
+        entry = found.get(obj_key)
+        if entry is not None and entry[0] == token:
+            return Representation(*entry[1]), token
+        return None, token
+
+    def store(self, pk: Any, token: str, representation: Representation) -> None:
+        """
+        Guarda la representación con el token obtenido en lookup().
+
+        No guarda nada si la lectura pudo salir de una réplica atrasada
+        (ver db_router.cache_fill_allowed()).
+        """
+        if not cache_fill_allowed():
+            return
+        timeout = self.timeout if self.timeout is not None else settings.REPRESENTATION_CACHE_TIMEOUT
+        _, _, obj_key = self._keys(pk)
+        self.cache.set(obj_key, (token, (dict(representation.data), representation.validators)), timeout)
+
+    def invalidate(self, pk: Any) -> None:
+        """
+        Invalida la representación de un registro (update/delete).
+        """
+        _, ver_key, obj_key = self._keys(pk)
+        self.cache.set(ver_key, uuid.uuid4().hex, None)
+        self.cache.delete(obj_key)
+
+    def invalidate_all(self) -> None:
+        """
+        Invalida todas las representaciones del namespace de una vez.
+        """
+        gen_key, _, _ = self._keys(None)
+        self.cache.set(gen_key, uuid.uuid4().hex, None)
+
+
+class LRUCache:
+    """
+    Caché en memoria del proceso, acotada (LRU) y con expiración (TTL).
+
+    Thread-safe. Solo guarda valores distintos de None (no cachea "no existe").
+
+    Uso típico (en un Repository):
+        team = cache.get_or_load(team_id, lambda: Team.objects.get(...))
+        team = await cache.aget_or_load(team_id, lambda: Team.objects.aget(...))
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[Any, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Se incrementa en cada invalidación: una carga que empezó antes
+        # de invalidar no puede guardar un valor que ya es viejo
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        """
+        Retorna el valor cacheado o None si no está o expiró.
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Any, value: Any) -> None:
+        """
+        Guarda un valor (expulsa el menos usado si se supera maxsize).
+        """
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: Any, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Retorna el valor cacheado o lo carga con loader() y lo guarda.
+
+        Args:
+            key: Clave del valor
+            loader: Función que consulta la fuente (se llama solo en un miss)
+
+        Returns:
+            El valor, o None si loader() retorna None (no se cachea)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            epoch = self._epoch
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if epoch == self._epoch:
+                    self._store(key, value)
+        return value
+
+    async def aget_or_load(self, key: Any, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """
+        Versión async de get_or_load(): loader() retorna un awaitable
+        (por ejemplo una query del ORM async). El lock solo protege el
+        diccionario, nunca se mantiene tomado durante el await.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            epoch = self._epoch
+
+        value = await loader()
+        if value is not None:
+            with self._lock:
+                if epoch == self._epoch:
+                    self._store(key, value)
+        return value
+
+    def invalidate(self, key: Any) -> None:
+        """
+        Elimina una clave (se llama desde las escrituras).
+        """
+        with self._lock:
+            self._epoch += 1
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores de la caché: hits, misses, evictions, size, maxsize.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+    def _store(self, key: Any, value: Any) -> None:
+        # Debe llamarse con el lock tomado
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
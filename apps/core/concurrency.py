@@ -0,0 +1,121 @@
+"""
+Lecturas independientes en paralelo dentro de un request
+
+Los Services declaran las lecturas que no dependen entre sí (por ejemplo
+el team, el COUNT y la página de GET /api/heroes/{team_id}/by-team/) y
+las ejecutan juntas:
+
+    team, total, heroes = run_concurrently(
+        lambda: team_repository.get_team_by_id(team_id),
+        lambda: hero_repository.count_heroes_by_team(team_id),
+        lambda: hero_repository.list_heroes_by_team(team_id, offset, limit),
+    )
+
+- Sync (WSGI): un ThreadPoolExecutor acotado (PARALLEL_READS['max_workers']).
+  Cada thread usa su propia conexión (las conexiones de Django son por
+  thread) y la cierra o reutiliza según CONN_MAX_AGE, igual que al final
+  de un request. Las lecturas corren con una copia del contexto: ven el
+  Identity Map y los hooks de queries del request.
+- Async (ASGI): arun_concurrently() hace asyncio.gather de las corrutinas.
+  En Django 4.2 el ORM async sigue ejecutando las queries en el thread
+  sync compartido, así que solo se solapan las esperas.
+
+Los resultados vuelven en el orden declarado y, si varias lecturas fallan,
+se lanza el error de la primera en ese orden (nunca el que terminó antes):
+las validaciones del Service dan siempre el mismo mensaje.
+
+Se ejecuta en secuencia cuando PARALLEL_READS['enabled'] es False (por
+defecto con SQLite, donde una query local cuesta menos que pasarla a otro
+thread) o dentro de una transacción (transaction.atomic, TestCase): otra
+conexión no vería los datos no confirmados.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+DEFAULT_PARALLEL_READS_CONFIG = {
+    'enabled': False,
+    'max_workers': 4,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_config() -> dict:
+    return {**DEFAULT_PARALLEL_READS_CONFIG, **getattr(settings, 'PARALLEL_READS', {})}
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='parallel-read')
+    return _executor
+
+
+def _in_transaction() -> bool:
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def _run_in_worker(read: Callable[[], Any]) -> Any:
+    try:
+        return read()
+    finally:
+        # Como al terminar un request: cierra la conexión del thread si
+        # superó CONN_MAX_AGE o quedó inutilizable
+        close_old_connections()
+
+
+def _merge(outcomes: Sequence[Any], errors: Sequence[Optional[BaseException]]) -> List[Any]:
+    for error in errors:
+        if error is not None:
+            raise error
+    return list(outcomes)
+
+
+def run_concurrently(*reads: Callable[[], Any]) -> List[Any]:
+    """
+    Ejecuta lecturas independientes (callables sin argumentos) y retorna
+    sus resultados en el orden declarado.
+
+    Raises:
+        La excepción de la primera lectura (en orden) que haya fallado
+    """
+    config = get_config()
+    if len(reads) < 2 or not config['enabled'] or _in_transaction():
+        return [read() for read in reads]
+
+    executor = _get_executor(config['max_workers'])
+    futures = [
+        executor.submit(contextvars.copy_context().run, _run_in_worker, read)
+        for read in reads
+    ]
+
+    outcomes, errors = [], []
+    for future in futures:
+        try:
+            outcomes.append(future.result())
+            errors.append(None)
+        except Exception as exc:
+            outcomes.append(None)
+            errors.append(exc)
+    return _merge(outcomes, errors)
+
+
+async def arun_concurrently(*reads: Callable[[], Awaitable[Any]]) -> List[Any]:
+    """
+    Versión async de run_concurrently(): cada lectura retorna un awaitable
+    (por ejemplo un método async del Repository).
+    """
+    if len(reads) < 2 or not get_config()['enabled']:
+        return [await read() for read in reads]
+
+    outcomes = await asyncio.gather(*(read() for read in reads), return_exceptions=True)
+    errors = [outcome if isinstance(outcome, BaseException) else None for outcome in outcomes]
+    return _merge(outcomes, errors)
@@ -0,0 +1,92 @@
+"""
+Peticiones HTTP condicionales (ETag / Last-Modified)
+
+Utilidades compartidas por los ViewSets de Teams y Heroes para responder
+304 Not Modified sin consultar ni serializar el contenido completo.
+
+Flujo típico en una view:
+1. El Service calcula la "versión" del recurso (COUNT + MAX(fecha_actualizacion))
+2. build_validators() convierte esa versión en un ETag fuerte + Last-Modified
+   (solo en los recursos individuales: en los listados MAX(fecha_actualizacion)
+   no cambia al borrar una fila, así que llevan solo el ETag, que incluye el COUNT)
+3. conditional_response() responde 304 (If-None-Match / If-Modified-Since)
+   o una respuesta HEAD vacía, sin llegar a serializar nada
+4. Si hay que devolver el cuerpo, apply_validators() agrega las cabeceras
+"""
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+# (etag, last_modified)
+Validators = Tuple[str, Optional[datetime]]
+
+
+def latest(*dates: Optional[datetime]) -> Optional[datetime]:
+    """
+    Retorna la fecha más reciente ignorando los None.
+
+    Útil cuando el Last-Modified depende de varias tablas
+    (por ejemplo un héroe y el team que lleva anidado).
+    """
+    present = [date for date in dates if date is not None]
+    return max(present) if present else None
+
+
+def build_validators(*parts: Any, last_modified: Optional[datetime] = None) -> Validators:
+    """
+    Construye un ETag fuerte a partir de las partes que identifican la versión.
+
+    Args:
+        *parts: Valores que cambian cuando cambia la representación
+                (prefijo del recurso, COUNT, MAX(fecha_actualizacion), paginación...)
+        last_modified: Fecha de la última modificación (opcional)
+
+    Returns:
+        Validators: (etag entre comillas, last_modified)
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest), last_modified
+
+
+def apply_validators(response: HttpResponseBase, validators: Validators) -> HttpResponseBase:
+    """
+    Agrega las cabeceras ETag y Last-Modified a una respuesta.
+    """
+    etag, last_modified = validators
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+    return response
+
+
+def conditional_response(request, validators: Validators) -> Optional[HttpResponseBase]:
+    """
+    Resuelve la petición sin cuerpo cuando es posible.
+
+    - 304 Not Modified si If-None-Match / If-Modified-Since coinciden
+    - 200 vacío (solo cabeceras) si el método es HEAD
+
+    Args:
+        request: Request de DRF (o HttpRequest de Django)
+        validators: Resultado de build_validators()
+
+    Returns:
+        La respuesta a devolver, o None si la view debe construir el cuerpo
+    """
+    etag, last_modified = validators
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified is not None else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return apply_validators(not_modified, validators)
+
+    if request.method == 'HEAD':
+        return apply_validators(Response(status=status.HTTP_200_OK), validators)
+
+    return None
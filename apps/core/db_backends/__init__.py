@@ -0,0 +1,6 @@
+"""
+Backends de Django con pool de conexiones (ver apps/core/db_pool.py)
+
+settings.DB_POOL_ENABLED reemplaza el ENGINE django.db.backends.<vendor>
+por apps.core.db_backends.<vendor> (sqlite3, postgresql o mysql).
+"""
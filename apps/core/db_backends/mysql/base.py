@@ -0,0 +1,9 @@
+"""
+MySQL/MariaDB con pool de conexiones.
+"""
+from django.db.backends.mysql import base
+from apps.core.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
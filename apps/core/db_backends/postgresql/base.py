@@ -0,0 +1,26 @@
+"""
+PostgreSQL con pool de conexiones.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from apps.core.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        # Django fija self.isolation_level al abrir la conexión; una conexión
+        # del pool ya viene abierta (y configurada), así que se fija acá
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = IsolationLevel(isolation_level)
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f'Invalid transaction isolation level {isolation_level} '
+                    f'specified. Use one of the psycopg.IsolationLevel values.'
+                )
+        return super().get_new_connection(conn_params)
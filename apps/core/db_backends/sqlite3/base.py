@@ -0,0 +1,9 @@
+"""
+SQLite con pool de conexiones.
+"""
+from django.db.backends.sqlite3 import base
+from apps.core.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
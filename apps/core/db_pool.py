@@ -0,0 +1,318 @@
+"""
+Pool de conexiones a la base de datos
+
+Django 4.2 abre una conexión por request (CONN_MAX_AGE=0) o mantiene una
+por thread (CONN_MAX_AGE>0). Con una base de red el handshake domina los
+requests cortos, y con conexiones persistentes por thread el total queda
+atado a la cantidad de threads.
+
+ConnectionPool guarda conexiones DB-API ya abiertas por alias y las presta
+a los DatabaseWrapper de Django:
+- connect() de Django pide una conexión al pool (get_new_connection) y
+  close() la devuelve (_close) en lugar de cerrarla
+- min_size conexiones se abren en el primer checkout; nunca hay más de max_size
+- si no hay una libre y el pool está lleno, se espera hasta
+  checkout_timeout segundos y después se lanza PoolTimeout
+- health check al prestar: SELECT 1 sobre la conexión ociosa (si falla se
+  descarta y se abre otra)
+- recycle: una conexión con más de `recycle` segundos de vida se cierra
+  al devolverla o al prestarla
+
+Los backends de apps/core/db_backends/ (sqlite3, postgresql, mysql) son
+los de Django con PooledDatabaseWrapperMixin; settings.DB_POOL los activa
+para cualquier DB_ENGINE soportado. Como Django devuelve la conexión al
+final de cada request (CONN_MAX_AGE=0), el pool es el que la reutiliza.
+
+Los contadores (uso, espera de checkout, timeouts...) se publican en
+/api/metrics (api_db_pool_*).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from django.db.utils import OperationalError
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONFIG = {
+    'min_size': 0,
+    'max_size': 10,
+    'checkout_timeout': 5.0,
+    'health_check': True,
+    'recycle': 3600.0,
+}
+
+
+class PoolTimeout(OperationalError):
+    """
+    No se obtuvo una conexión del pool dentro de checkout_timeout.
+    """
+
+
+class PooledConnection:
+    """
+    Conexión DB-API del pool + momento en que se abrió.
+    """
+    __slots__ = ('raw', 'created_at')
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.created_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones DB-API (thread-safe).
+
+    Args:
+        min_size / max_size / checkout_timeout / health_check / recycle:
+            ver DEFAULT_POOL_CONFIG
+        ping_sql: Query del health check
+    """
+
+    def __init__(self, min_size: int = 0, max_size: int = 10, checkout_timeout: float = 5.0,
+                 health_check: bool = True, recycle: float = 3600.0, ping_sql: str = 'SELECT 1'):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError('El pool necesita 0 <= min_size <= max_size y max_size >= 1')
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+        self.recycle = recycle
+        self.ping_sql = ping_sql
+
+        self._condition = threading.Condition()
+        self._idle: Deque[PooledConnection] = deque()
+        self._in_use: Dict[int, PooledConnection] = {}
+        self._opening = 0
+        self._filled = False
+
+        self.checkouts = 0
+        self.checkout_wait = 0.0
+        self.max_checkout_wait = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.closed = 0
+        self.health_check_failures = 0
+
+    @property
+    def size(self) -> int:
+        # Debe llamarse con el lock tomado
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _open(self, connect: Callable[[], Any]) -> PooledConnection:
+        connection = PooledConnection(connect())
+        with self._condition:
+            self.created += 1
+        return connection
+
+    def _fill(self, connect: Callable[[], Any]) -> None:
+        # Abre min_size conexiones en el primer checkout
+        with self._condition:
+            if self._filled:
+                return
+            self._filled = True
+            missing = max(self.min_size - self.size, 0)
+            self._opening += missing
+        try:
+            for _ in range(missing):
+                connection = self._open(connect)
+                with self._condition:
+                    self._opening -= 1
+                    missing -= 1
+                    self._idle.append(connection)
+                    self._condition.notify()
+        finally:
+            with self._condition:
+                self._opening -= missing
+
+    def _discard(self, connection: PooledConnection) -> None:
+        try:
+            connection.raw.close()
+        except Exception:
+            logger.debug('Error cerrando una conexión descartada del pool', exc_info=True)
+        with self._condition:
+            self.closed += 1
+
+    def _expired(self, connection: PooledConnection) -> bool:
+        return self.recycle is not None and time.monotonic() - connection.created_at > self.recycle
+
+    def _healthy(self, connection: PooledConnection) -> bool:
+        try:
+            cursor = connection.raw.cursor()
+            try:
+                cursor.execute(self.ping_sql)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            with self._condition:
+                self.health_check_failures += 1
+            return False
+
+    def acquire(self, connect: Callable[[], Any]) -> Any:
+        """
+        Presta una conexión DB-API (una libre, una nueva o la primera que se
+        devuelva antes de checkout_timeout).
+
+        Args:
+            connect: Abre una conexión nueva (get_new_connection del backend)
+
+        Raises:
+            PoolTimeout: Si el pool está lleno durante checkout_timeout segundos
+        """
+        if not self._filled:
+            self._fill(connect)
+
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        while True:
+            with self._condition:
+                while not self._idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f'No hay conexiones libres en el pool ({self.max_size} en uso) '
+                            f'después de {self.checkout_timeout:.1f}s'
+                        )
+                    self._condition.wait(remaining)
+
+                connection = self._idle.popleft() if self._idle else None
+                if connection is None:
+                    self._opening += 1
+
+            # Abrir/verificar fuera del lock (puede ser I/O de red)
+            if connection is None:
+                try:
+                    connection = self._open(connect)
+                finally:
+                    with self._condition:
+                        self._opening -= 1
+                        self._condition.notify()
+            elif self._expired(connection) or (self.health_check and not self._healthy(connection)):
+                self._discard(connection)
+                with self._condition:
+                    self._condition.notify()
+                continue
+
+            waited = time.monotonic() - start
+            with self._condition:
+                self._in_use[id(connection.raw)] = connection
+                self.checkouts += 1
+                self.checkout_wait += waited
+                self.max_checkout_wait = max(self.max_checkout_wait, waited)
+            return connection.raw
+
+    def release(self, raw: Any, discard: bool = False) -> None:
+        """
+        Devuelve una conexión prestada. Se hace rollback de cualquier
+        transacción abierta; si falla, o si discard/recycle, se cierra.
+        """
+        with self._condition:
+            connection = self._in_use.pop(id(raw), None)
+        if connection is None:
+            # No es del pool (por ejemplo, abierta antes de activarlo)
+            raw.close()
+            return
+
+        if not discard:
+            try:
+                raw.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._expired(connection):
+            self._discard(connection)
+        else:
+            with self._condition:
+                self._idle.append(connection)
+
+        with self._condition:
+            self._condition.notify()
+
+    def close(self) -> None:
+        """
+        Cierra las conexiones ociosas (las prestadas se cierran al devolverlas).
+        """
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Uso del pool y contadores de checkout.
+        """
+        with self._condition:
+            return {
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                'checkouts': self.checkouts,
+                'checkout_wait_seconds': self.checkout_wait,
+                'max_checkout_wait_seconds': self.max_checkout_wait,
+                'timeouts': self.timeouts,
+                'created': self.created,
+                'closed': self.closed,
+                'health_check_failures': self.health_check_failures,
+            }
+
+
+# ==================== POOLS POR ALIAS ====================
+_pools: Dict[Tuple[str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, conn_params: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> ConnectionPool:
+    """
+    Retorna el pool del alias para esos parámetros de conexión (lo crea la
+    primera vez). Si cambian los parámetros (por ejemplo la base de tests)
+    se crea otro pool.
+    """
+    key = (alias, repr(sorted(conn_params.items(), key=lambda item: item[0])))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(**{**DEFAULT_POOL_CONFIG, **(config or {})})
+                registry.register_pool(alias, pool)
+    return pool
+
+
+def close_all_pools() -> None:
+    """
+    Cierra las conexiones ociosas de todos los pools (scripts, tests).
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixin para un DatabaseWrapper de Django: toma las conexiones del pool
+    en lugar de abrirlas y las devuelve en lugar de cerrarlas.
+
+    La configuración sale de settings_dict['POOL'] (ver settings.DB_POOL).
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, conn_params, self.settings_dict.get('POOL'))
+        self._pool = pool
+        return pool.acquire(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params))
+
+    def _close(self):
+        pool = getattr(self, '_pool', None)
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # Cerrada dentro de una transacción (error): el wrapper sigue
+            # apuntando a la conexión, así que no puede volver al pool
+            pool.release(self.connection, discard=self.in_atomic_block)
@@ -0,0 +1,179 @@
+"""
+Router de lecturas/escrituras con réplicas de lectura
+
+ReadReplicaRouter (settings.DATABASE_ROUTERS) manda las lecturas de los
+modelos de heroes y teams (las queries de HeroRepository/TeamRepository)
+a una de las réplicas de settings.DB_REPLICAS y todas las escrituras a
+`default`. El resto de las apps (auth, sessions...) no se toca.
+
+Las lecturas vuelven a `default` cuando:
+- hay una transacción abierta en `default` (transaction.atomic, TestCase):
+  la réplica no vería los datos sin confirmar
+- read-your-writes: el cliente escribió hace menos de
+  DB_READ_YOUR_WRITES_SECONDS. Dentro del request lo marca
+  db_for_write(); para los requests siguientes ReadYourWritesMiddleware
+  guarda el plazo en una cookie. Fuera de un request (scripts, comandos)
+  hay que abrir routing_scope() para tener read-your-writes.
+
+Réplicas SQLite (DB_<ALIAS>_MODE):
+- readonly: el mismo archivo que `default` abierto con mode=ro. No hay
+  retraso; reparte las conexiones de lectura y garantiza que las
+  lecturas no escriban.
+- copy: un archivo aparte que `manage.py refresh_replicas` actualiza con
+  la API de backup de SQLite (ver refresh_replica()). Las lecturas pueden
+  ir hasta un intervalo de refresco atrasadas.
+
+Cachés compartidas: una lectura de una réplica copy justo después de una
+escritura puede traer los datos de antes. Si se guardara en la caché de
+representaciones o de páginas (con la generación ya incrementada por la
+escritura), el cliente que escribió la leería de la caché sin llegar a
+`default`. Por eso cada escritura marca RECENT_WRITE_KEY en la caché por
+DB_READ_YOUR_WRITES_SECONDS y, mientras tanto, cache_fill_allowed() impide
+guardar lo que se leyó de una réplica copy.
+"""
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Apps cuyas lecturas pueden ir a una réplica
+ROUTED_APP_LABELS = frozenset({'heroes', 'teams'})
+
+# Presente durante DB_READ_YOUR_WRITES_SECONDS después de cada escritura
+RECENT_WRITE_KEY = 'db_router:recent_write'
+
+
+class RoutingState:
+    """
+    Estado de ruteo de un request: hasta cuándo (time.time()) leer de `default`
+    y si leyó de una réplica copy (lagging_read).
+    """
+    __slots__ = ('primary_until', 'wrote', 'lagging_read')
+
+    def __init__(self, primary_until: float = 0.0):
+        self.primary_until = primary_until
+        self.wrote = False
+        self.lagging_read = False
+
+    def mark_write(self) -> None:
+        self.wrote = True
+        self.primary_until = time.time() + settings.DB_READ_YOUR_WRITES_SECONDS
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def routing_scope(primary_until: float = 0.0) -> Iterator[RoutingState]:
+    """
+    Abre el estado de ruteo de un request (ReadYourWritesMiddleware) o de un script.
+    """
+    state = RoutingState(primary_until)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replica_aliases() -> List[str]:
+    return list(getattr(settings, 'DB_REPLICAS', []))
+
+
+class ReadReplicaRouter:
+    """
+    Lecturas de heroes/teams a una réplica al azar, escrituras a `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APP_LABELS:
+            return None
+        replicas = replica_aliases()
+        if not replicas:
+            return None
+
+        state = _state.get()
+        if state is not None and state.primary_until > time.time():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        alias = random.choice(replicas)
+        if state is not None and settings.DATABASES.get(alias, {}).get('REPLICA_MODE') == 'copy':
+            state.lagging_read = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APP_LABELS or not replica_aliases():
+            return None
+
+        state = _state.get()
+        if state is not None:
+            state.mark_write()
+        cache.set(RECENT_WRITE_KEY, True, settings.DB_READ_YOUR_WRITES_SECONDS)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas y primaria tienen los mismos datos
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def cache_fill_allowed() -> bool:
+    """
+    False si lo leído en este request (o refresco de caché) salió de una
+    réplica copy y hubo una escritura hace menos de
+    DB_READ_YOUR_WRITES_SECONDS: puede no incluirla y no debe guardarse en
+    las cachés compartidas.
+    """
+    state = _state.get()
+    if state is None or not state.lagging_read:
+        return True
+    return cache.get(RECENT_WRITE_KEY) is None
+
+
+def refresh_replica(alias: str) -> bool:
+    """
+    Copia `default` sobre una réplica SQLite en modo copy (API de backup de
+    SQLite: copia consistente sin bloquear a los escritores en WAL).
+
+    Returns:
+        True si la réplica se actualizó, False si no es una réplica copy
+    """
+    replica = connections[alias].settings_dict
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict
+    if replica.get('REPLICA_MODE') != 'copy' or connections[alias].vendor != 'sqlite':
+        return False
+
+    copy_sqlite_database(str(primary['NAME']), str(replica['NAME']))
+    return True
+
+
+def copy_sqlite_database(source_path: str, target_path: str) -> None:
+    """
+    Copia una base SQLite sobre otra con la API de backup (la destino se
+    reemplaza en una sola transacción: sus lectores ven la copia anterior
+    o la nueva, nunca una a medias).
+    """
+    os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+    source = sqlite3.connect(source_path)
+    try:
+        destination = sqlite3.connect(target_path)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+    finally:
+        source.close()
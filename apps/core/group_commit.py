@@ -0,0 +1,263 @@
+"""
+Group commit: un único escritor para las altas y modificaciones
+
+Con SQLite solo puede escribir una conexión a la vez: con muchos POST
+concurrentes cada request espera el lock (busy_timeout) o falla con
+"database is locked", y cada commit paga su propio fsync.
+
+Con GROUP_COMMIT['enabled'] los métodos de escritura de los Services
+marcados con @batched_write no se ejecutan en el thread del request:
+- se encolan para un único thread escritor, que junta las escrituras
+  que llegan durante GROUP_COMMIT['window_ms'] (hasta 'max_batch')
+- ejecuta cada una (validaciones + escritura del Repository) dentro de
+  una sola transacción, cada una en su savepoint: si una falla (por
+  ejemplo ValidationError por nombre repetido) solo se deshace esa
+- hace un único COMMIT y completa cada request con su resultado o su
+  excepción
+
+Las validaciones corren en el escritor, así que ven las escrituras
+anteriores del mismo lote (dos POST con el mismo nombre en un lote: el
+segundo recibe el error de nombre único).
+
+Cada escritura corre con una copia del contexto del request (Identity
+Map, hooks de queries/métricas, read-your-writes). Las invalidaciones de
+caché registradas con after_commit() se ejecutan recién después del
+COMMIT, para que nadie vuelva a cachear los datos viejos mientras el lote
+sigue abierto. Sin group commit after_commit() ejecuta la función en el
+momento.
+
+Las vistas async usan asubmit(): el request espera el resultado sin
+ocupar un thread.
+"""
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP_COMMIT_CONFIG = {
+    'enabled': False,
+    'window_ms': 2.0,
+    'max_batch': 128,
+}
+
+# Callbacks after_commit() de la escritura en curso (None fuera del escritor)
+_pending: contextvars.ContextVar[Optional[List[Callable[[], Any]]]] = contextvars.ContextVar(
+    'group_commit_pending', default=None
+)
+
+
+def get_config() -> dict:
+    return {**DEFAULT_GROUP_COMMIT_CONFIG, **getattr(settings, 'GROUP_COMMIT', {})}
+
+
+def is_enabled() -> bool:
+    return get_config()['enabled']
+
+
+def _caller_in_transaction() -> bool:
+    return transaction.get_connection().in_atomic_block
+
+
+def after_commit(callback: Callable[[], Any]) -> None:
+    """
+    Ejecuta `callback` cuando la escritura actual quede confirmada: al
+    terminar el lote si corre en el escritor, o en el momento si no.
+    """
+    pending = _pending.get()
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+
+class WriteJob:
+    """
+    Escritura encolada: la función, el contexto del request y su Future.
+    """
+    __slots__ = ('func', 'context', 'future', 'callbacks')
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+        self.context = contextvars.copy_context()
+        self.future: Future = Future()
+        self.callbacks: List[Callable[[], Any]] = []
+
+    def run(self) -> Any:
+        _pending.set(self.callbacks)
+        return self.func()
+
+
+class GroupCommitWriter:
+    """
+    Thread escritor: junta las escrituras encoladas y las confirma en lotes.
+
+    Contadores (stats()): lotes, escrituras, tamaño máximo de lote y lotes fallidos.
+    """
+
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 128):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: 'queue.Queue[WriteJob]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.writes = 0
+        self.max_batch_size = 0
+        self.failed_batches = 0
+
+    def in_writer(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, func: Callable[[], Any]) -> Future:
+        """
+        Encola una escritura y retorna su Future (resultado o excepción).
+        """
+        self._ensure_started()
+        job = WriteJob(func)
+        self._queue.put(job)
+        return job.future
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    thread = threading.Thread(target=self._loop, name='group-commit-writer', daemon=True)
+                    self._thread = thread
+                    thread.start()
+
+    def _collect(self) -> List[WriteJob]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                self._commit(batch)
+            except BaseException:  # pragma: no cover - nunca dejar requests esperando
+                logger.exception('Error inesperado en el escritor de group commit')
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(RuntimeError('El escritor de group commit falló'))
+            finally:
+                # Como al final de un request: devuelve/cierra la conexión según CONN_MAX_AGE
+                close_old_connections()
+
+    def _commit(self, batch: List[WriteJob]) -> None:
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for job in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((job, job.context.run(job.run), None))
+                    except Exception as exc:
+                        outcomes.append((job, None, exc))
+        except Exception as exc:
+            # Falló el BEGIN o el COMMIT: ninguna escritura del lote quedó guardada
+            self.failed_batches += 1
+            logger.warning('Falló el commit de un lote de %d escrituras: %s', len(batch), exc)
+            for job in batch:
+                job.future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        for job, result, error in outcomes:
+            if error is not None:
+                job.future.set_exception(error)
+                continue
+            for callback in job.callbacks:
+                try:
+                    job.context.run(callback)
+                except Exception:
+                    logger.exception('Error en un callback after_commit')
+            job.future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            'batches': self.batches,
+            'writes': self.writes,
+            'max_batch_size': self.max_batch_size,
+            'failed_batches': self.failed_batches,
+            'queued': self._queue.qsize(),
+        }
+
+
+_writer: Optional[GroupCommitWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> GroupCommitWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                config = get_config()
+                _writer = GroupCommitWriter(config['window_ms'], config['max_batch'])
+    return _writer
+
+
+def submit(func: Callable[[], Any]) -> Any:
+    """
+    Ejecuta `func` en el escritor y espera su resultado (o relanza su excepción).
+    """
+    return get_writer().submit(func).result()
+
+
+async def asubmit(func: Callable[[], Any]) -> Any:
+    """
+    Versión async de submit(): espera sin bloquear el event loop. Si el
+    thread del ORM async tiene una transacción abierta, `func` corre ahí.
+    """
+    if await sync_to_async(_caller_in_transaction)():
+        return await sync_to_async(func)()
+    return await asyncio.wrap_future(get_writer().submit(func))
+
+
+def batched_write(method: Optional[Callable] = None, *, unless: Optional[Callable[[], bool]] = None) -> Callable:
+    """
+    Decorador para los métodos de escritura de los Services: con group
+    commit activo el método completo (validaciones + Repository) corre en
+    el escritor; si no, si ya está en el escritor o si el llamador tiene
+    una transacción abierta, se llama directo.
+
+    `unless`: función sin argumentos; si retorna True la escritura también
+    se llama directo (por ejemplo si escribe en otra base además de
+    `default`: el lote solo confirma o deshace lo de `default`).
+    Se usa como @batched_write o @batched_write(unless=...).
+    """
+    def decorate(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            # Dentro de una transacción del llamador (transaction.atomic, TestCase)
+            # la escritura tiene que formar parte de esa transacción
+            if not is_enabled() or get_writer().in_writer() or _caller_in_transaction():
+                return method(*args, **kwargs)
+            if unless is not None and unless():
+                return method(*args, **kwargs)
+            return submit(lambda: method(*args, **kwargs))
+        return wrapper
+
+    if method is not None:
+        return decorate(method)
+    return decorate
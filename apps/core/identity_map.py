@@ -0,0 +1,98 @@
+"""
+Identity Map por request
+
+Guarda los objetos del modelo que ya se leyeron de la base de datos
+durante el request actual, indexados por (modelo, pk). Los Repositories
+lo consultan antes de hacer una query: cada fila se lee como máximo una
+vez por request (por ejemplo en PATCH /api/heroes/{id}/ el Service y el
+Repository comparten el mismo objeto Hero).
+
+- El mapa vive en un ContextVar: lo abre IdentityMapMiddleware (o
+  identity_map_scope() en scripts/tests) y desaparece al terminar.
+- Fuera de un request no hay mapa y los Repositories consultan siempre la BD.
+- Solo se registran objetos leídos de la BD en este request (nunca copias
+  de una caché entre requests), así las escrituras parten de datos frescos.
+- Los hilos que se lanzan desde el request (por ejemplo el refresco de
+  páginas en segundo plano) no heredan el mapa.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+from django.db import models
+
+
+class IdentityMap:
+    """
+    Mapa (modelo, pk) → instancia del request actual.
+
+    hits cuenta las queries evitadas.
+    """
+
+    def __init__(self):
+        self._objects: Dict[Tuple[Type[models.Model], Any], models.Model] = {}
+        self.hits = 0
+
+    def get(self, model: Type[models.Model], pk: Any) -> Optional[models.Model]:
+        instance = self._objects.get((model, pk))
+        if instance is not None:
+            self.hits += 1
+        return instance
+
+    def add(self, instance: models.Model) -> models.Model:
+        self._objects[(type(instance), instance.pk)] = instance
+        return instance
+
+    def discard(self, model: Type[models.Model], pk: Any) -> None:
+        self._objects.pop((model, pk), None)
+
+
+_current_map: ContextVar[Optional[IdentityMap]] = ContextVar('identity_map', default=None)
+
+
+@contextmanager
+def identity_map_scope() -> Iterator[IdentityMap]:
+    """
+    Abre un Identity Map para el bloque (un request, un script, un test).
+    """
+    identity_map = IdentityMap()
+    token = _current_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_map.reset(token)
+
+
+def get_identity_map() -> Optional[IdentityMap]:
+    """
+    Retorna el Identity Map activo o None si no hay ninguno.
+    """
+    return _current_map.get()
+
+
+def lookup(model: Type[models.Model], pk: Any) -> Optional[models.Model]:
+    """
+    Busca una instancia en el Identity Map activo (None si no hay mapa o no está).
+    """
+    identity_map = _current_map.get()
+    if identity_map is None:
+        return None
+    return identity_map.get(model, pk)
+
+
+def register(instance: Optional[models.Model]) -> Optional[models.Model]:
+    """
+    Registra una instancia recién leída de la BD y la retorna (acepta None).
+    """
+    identity_map = _current_map.get()
+    if identity_map is not None and instance is not None:
+        identity_map.add(instance)
+    return instance
+
+
+def forget(model: Type[models.Model], pk: Any) -> None:
+    """
+    Quita una instancia del Identity Map activo (después de eliminarla).
+    """
+    identity_map = _current_map.get()
+    if identity_map is not None:
+        identity_map.discard(model, pk)
@@ -0,0 +1,347 @@
+"""
+Motor de pruebas de carga en proceso
+
+Levanta la aplicación dentro del mismo proceso (WSGIHandler vía
+django.test.Client o ASGIHandler vía AsyncClient), sin red ni servidor,
+y ejecuta una mezcla configurable de operaciones sobre /api/heroes/ y
+/api/teams/ desde varios threads (wsgi) o tareas asyncio (asgi).
+
+El resultado es un dict serializable a JSON con throughput y latencias
+p50/p95/p99 por operación, para comparar corridas entre sí.
+
+Lo usa el comando `python manage.py loadtest`.
+"""
+import asyncio
+import math
+import random
+import threading
+import uuid
+from collections import Counter
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+from django.core.cache import cache
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from apps.heroes.models import Hero
+from apps.teams.cache import team_lookup_cache
+from apps.teams.models import Team
+
+# Mezcla por defecto (pesos relativos)
+DEFAULT_MIX = {
+    'heroes.list': 25,
+    'heroes.retrieve': 25,
+    'heroes.by-team': 10,
+    'heroes.by-name': 5,
+    'heroes.create': 5,
+    'heroes.update': 5,
+    'heroes.delete': 5,
+    'teams.list': 10,
+    'teams.retrieve': 8,
+    'teams.by-name': 2,
+}
+
+# Hasta cuántos IDs/nombres del dataset se cargan en memoria para elegir objetivos
+DATASET_SAMPLE_SIZE = 10000
+
+RequestSpec = Tuple[str, str, Optional[dict]]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """
+    Convierte "heroes.list=50,heroes.create=10" en {'heroes.list': 50, ...}.
+    """
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Operación desconocida '{name}'. Opciones: {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise ValueError('La mezcla debe tener al menos una operación con peso mayor a 0')
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Percentil por rango más cercano sobre una lista ya ordenada.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def latency_summary(latencies: List[float]) -> dict:
+    values = sorted(latencies)
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0, 'max': 0.0}
+    return {
+        'p50': round(percentile(values, 50) * 1000, 3),
+        'p95': round(percentile(values, 95) * 1000, 3),
+        'p99': round(percentile(values, 99) * 1000, 3),
+        'mean': round(sum(values) / len(values) * 1000, 3),
+        'max': round(values[-1] * 1000, 3),
+    }
+
+
+class Dataset:
+    """
+    Muestra de IDs y nombres existentes para elegir los objetivos de cada operación.
+    """
+
+    def __init__(self):
+        self.team_count = Team.objects.count()
+        self.hero_count = Hero.objects.count()
+        heroes = list(Hero.objects.order_by('id').values_list('id', 'nombre')[:DATASET_SAMPLE_SIZE])
+        teams = list(Team.objects.order_by('id').values_list('id', 'nombre')[:DATASET_SAMPLE_SIZE])
+        if not heroes or not teams:
+            raise ValueError('La base de datos no tiene heroes o teams; usa --teams/--heroes para generarlos')
+        self.hero_ids = [hero_id for hero_id, _ in heroes]
+        self.hero_names = [nombre for _, nombre in heroes]
+        self.team_ids = [team_id for team_id, _ in teams]
+        self.team_names = [nombre for _, nombre in teams]
+
+
+class Worker:
+    """
+    Estado de un thread/tarea: su RNG, los heroes que creó (para borrarlos)
+    y las muestras de latencia por operación.
+    """
+
+    def __init__(self, index: int, seed: int, dataset: Dataset, mix: Dict[str, int], run_id: str):
+        self.index = index
+        self.rng = random.Random(seed + index)
+        self.dataset = dataset
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.run_id = run_id
+        self.sequence = 0
+        self.created: List[int] = []
+        self.latencies: Dict[str, List[float]] = {name: [] for name in self.operations}
+        self.statuses: Dict[str, Counter] = {name: Counter() for name in self.operations}
+        self.errors: Counter = Counter()
+
+    def next_operation(self) -> str:
+        return self.rng.choices(self.operations, self.weights)[0]
+
+    def _new_hero(self) -> dict:
+        self.sequence += 1
+        return {
+            'nombre': f'Loadtest {self.run_id}-{self.index}-{self.sequence}',
+            'descripcion': 'Creado por manage.py loadtest',
+            'poder_principal': 'Carga',
+            'nivel': self.rng.randint(1, 100),
+            'team_id': self.rng.choice(self.dataset.team_ids),
+        }
+
+    def plan(self, operation: str) -> RequestSpec:
+        """
+        Retorna (método, url, datos) para la operación.
+        """
+        rng = self.rng
+        dataset = self.dataset
+        page = {'offset': rng.randrange(0, 100, 10), 'limit': 10}
+
+        if operation == 'heroes.list':
+            return 'get', reverse('hero-list'), page
+        if operation == 'heroes.retrieve':
+            return 'get', reverse('hero-detail', args=[rng.choice(dataset.hero_ids)]), None
+        if operation == 'heroes.by-team':
+            return 'get', reverse('hero-get-by-team', args=[rng.choice(dataset.team_ids)]), page
+        if operation == 'heroes.by-name':
+            return 'get', reverse('hero-get-by-name'), {'nombre': rng.choice(dataset.hero_names)}
+        if operation == 'heroes.create':
+            return 'post', reverse('hero-list'), self._new_hero()
+        if operation == 'heroes.update':
+            data = {'nivel': rng.randint(1, 100)}
+            return 'patch', reverse('hero-detail', args=[rng.choice(dataset.hero_ids)]), data
+        if operation == 'heroes.delete':
+            # Solo se borran heroes creados por este worker (ver _prepare_delete)
+            hero_id = self.created.pop() if self.created else None
+            return 'delete', reverse('hero-detail', args=[hero_id]) if hero_id else None, None
+        if operation == 'teams.list':
+            return 'get', reverse('team-list'), page
+        if operation == 'teams.retrieve':
+            return 'get', reverse('team-detail', args=[rng.choice(dataset.team_ids)]), None
+        if operation == 'teams.by-name':
+            return 'get', reverse('team-get-by-name'), {'nombre': rng.choice(dataset.team_names)}
+        raise ValueError(f"Operación desconocida '{operation}'")
+
+    def record(self, operation: str, response, elapsed: float) -> None:
+        self.latencies[operation].append(elapsed)
+        self.statuses[operation][response.status_code] += 1
+        if response.status_code >= 500:
+            self.errors[operation] += 1
+        elif operation == 'heroes.create' and response.status_code == 201:
+            self.created.append(response.json()['id'])
+
+    def record_exception(self, operation: str, elapsed: float) -> None:
+        self.latencies[operation].append(elapsed)
+        self.statuses[operation]['exception'] += 1
+        self.errors[operation] += 1
+
+    def reset(self) -> None:
+        """Descarta las muestras (fin del warmup)."""
+        for name in self.operations:
+            self.latencies[name].clear()
+            self.statuses[name].clear()
+        self.errors.clear()
+
+
+def _request_kwargs(method: str, data: Optional[dict]) -> dict:
+    if method in ('post', 'patch'):
+        return {'data': data, 'content_type': 'application/json'}
+    return {'data': data} if data else {}
+
+
+def _prepare_delete(worker: Worker, client_call: Callable) -> None:
+    """
+    Antes de un delete sin heroes propios se crea uno (fuera de la medición).
+    """
+    if not worker.created:
+        response = client_call('post', reverse('hero-list'), _request_kwargs('post', worker._new_hero()))
+        if response.status_code == 201:
+            worker.created.append(response.json()['id'])
+
+
+def _run_wsgi(workers: List[Worker], duration: float, warmup: float) -> float:
+    start_barrier = threading.Barrier(len(workers) + 1)
+    warmup_done = threading.Event()
+    stop = threading.Event()
+
+    def loop(worker: Worker):
+        client = Client(raise_request_exception=False)
+
+        def call(method, url, kwargs):
+            return getattr(client, method)(url, **kwargs)
+
+        start_barrier.wait()
+        measuring = False
+        try:
+            while not stop.is_set():
+                if not measuring and warmup_done.is_set():
+                    worker.reset()
+                    measuring = True
+                operation = worker.next_operation()
+                if operation == 'heroes.delete':
+                    _prepare_delete(worker, call)
+                method, url, data = worker.plan(operation)
+                if url is None:
+                    continue
+                begin = perf_counter()
+                try:
+                    response = call(method, url, _request_kwargs(method, data))
+                except Exception:
+                    worker.record_exception(operation, perf_counter() - begin)
+                else:
+                    worker.record(operation, response, perf_counter() - begin)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=loop, args=(worker,), daemon=True) for worker in workers]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    if warmup:
+        stop.wait(warmup)
+    warmup_done.set()
+    measured_from = perf_counter()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return perf_counter() - measured_from
+
+
+async def _run_asgi(workers: List[Worker], duration: float, warmup: float) -> float:
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    deadline = measure_from + duration
+
+    async def run(worker: Worker):
+        client = AsyncClient(raise_request_exception=False)
+        measuring = not warmup
+        while loop.time() < deadline:
+            if not measuring and loop.time() >= measure_from:
+                worker.reset()
+                measuring = True
+            operation = worker.next_operation()
+            if operation == 'heroes.delete' and not worker.created:
+                response = await client.post(reverse('hero-list'), **_request_kwargs('post', worker._new_hero()))
+                if response.status_code == 201:
+                    worker.created.append(response.json()['id'])
+            method, url, data = worker.plan(operation)
+            if url is None:
+                continue
+            begin = perf_counter()
+            try:
+                response = await getattr(client, method)(url, **_request_kwargs(method, data))
+            except Exception:
+                worker.record_exception(operation, perf_counter() - begin)
+            else:
+                worker.record(operation, response, perf_counter() - begin)
+
+    await asyncio.gather(*(run(worker) for worker in workers))
+    return loop.time() - measure_from
+
+
+def run_load(mode: str = 'wsgi', concurrency: int = 8, duration: float = 10.0, warmup: float = 1.0,
+             mix: Optional[Dict[str, int]] = None, seed: int = 42) -> dict:
+    """
+    Ejecuta la carga contra la base de datos configurada y retorna el reporte.
+    """
+    if mode not in ('wsgi', 'asgi'):
+        raise ValueError("mode debe ser 'wsgi' o 'asgi'")
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+
+    # Las cachés del proceso podrían tener datos de otra base de datos
+    cache.clear()
+    team_lookup_cache.clear()
+
+    dataset = Dataset()
+    run_id = uuid.uuid4().hex[:8]
+    workers = [Worker(index, seed, dataset, mix, run_id) for index in range(concurrency)]
+
+    if mode == 'wsgi':
+        elapsed = _run_wsgi(workers, duration, warmup)
+    else:
+        elapsed = asyncio.run(_run_asgi(workers, duration, warmup))
+
+    operations = {}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for name in mix:
+        latencies = [value for worker in workers for value in worker.latencies[name]]
+        statuses = Counter()
+        for worker in workers:
+            statuses.update(worker.statuses[name])
+        errors = sum(worker.errors[name] for worker in workers)
+        all_latencies.extend(latencies)
+        total_errors += errors
+        operations[name] = {
+            'requests': len(latencies),
+            'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            'errors': errors,
+            'status_codes': {str(code): count for code, count in sorted(statuses.items(), key=str)},
+            'latency_ms': latency_summary(latencies),
+        }
+
+    return {
+        'config': {
+            'mode': mode,
+            'concurrency': concurrency,
+            'duration_s': duration,
+            'warmup_s': warmup,
+            'seed': seed,
+            'mix': mix,
+            'database': str(connections['default'].settings_dict['NAME']),
+        },
+        'dataset': {'teams': dataset.team_count, 'heroes': dataset.hero_count},
+        'elapsed_s': round(elapsed, 3),
+        'requests': len(all_latencies),
+        'throughput_rps': round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        'errors': total_errors,
+        'latency_ms': latency_summary(all_latencies),
+        'operations': operations,
+    }
@@ -0,0 +1,47 @@
+"""
+python manage.py archive_heroes
+
+Mueve los heroes creados hace más de N días (HERO_ARCHIVE_AFTER_DAYS) de
+la tabla heroes a heroes_archive, en lotes de HERO_ARCHIVE_BATCH_SIZE
+(una transacción por lote, ver apps/heroes/archive.py). Con sharding
+archiva en cada shard. Se puede correr con la API funcionando, por
+ejemplo una vez por día desde cron.
+
+Ejemplos:
+    python manage.py archive_heroes
+    python manage.py archive_heroes --older-than-days 90 --batch-size 1000
+    python manage.py archive_heroes --dry-run
+"""
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.heroes.archive import archive_heroes
+
+
+class Command(BaseCommand):
+    help = 'Mueve los heroes viejos de la tabla heroes a heroes_archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=settings.HERO_ARCHIVE_AFTER_DAYS,
+                            help='Archivar los heroes creados hace más de N días')
+        parser.add_argument('--batch-size', type=int, default=settings.HERO_ARCHIVE_BATCH_SIZE,
+                            help='Heroes movidos por transacción')
+        parser.add_argument('--dry-run', action='store_true', help='Solo informar cuántos heroes se archivarían')
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--older-than-days debe ser >= 0 y --batch-size >= 1')
+
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        start = time.perf_counter()
+        totals = archive_heroes(cutoff, options['batch_size'], options['dry_run'])
+
+        verb = 'a archivar' if options['dry_run'] else 'archivados'
+        for alias, count in totals.items():
+            self.stdout.write(f'{alias}: {count} heroes {verb}')
+        self.stdout.write(
+            f'Total: {sum(totals.values())} heroes {verb} (creados antes de {cutoff:%Y-%m-%d %H:%M}) '
+            f'en {(time.perf_counter() - start) * 1000:.1f} ms'
+        )
@@ -0,0 +1,109 @@
+"""
+python manage.py bench_async_views
+
+Compara el throughput bajo ASGI de los ViewSets sync (HeroViewSet/TeamViewSet,
+que Django ejecuta con sync_to_async) contra los async (AsyncHeroViewSet/
+AsyncTeamViewSet, ASYNC_VIEWS=True) con muchas conexiones concurrentes.
+
+Cada variante corre `manage.py loadtest --mode asgi` en un proceso aparte
+(los routers leen ASYNC_VIEWS al importarse) sobre una copia de la misma
+base SQLite generada con --seed, así ambas parten de los mismos datos.
+
+Ejemplos:
+    python manage.py bench_async_views
+    python manage.py bench_async_views --concurrency 128 --duration 20 --output async.json
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+VARIANTS = (('sync', 'False'), ('async', 'True'))
+
+
+class Command(BaseCommand):
+    help = 'Throughput bajo ASGI de los ViewSets sync vs async (ASYNC_VIEWS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=64, help='Tareas concurrentes (conexiones)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos de medición por variante')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Segundos de calentamiento por variante')
+        parser.add_argument('--mix', default=None, help='Mezcla de operaciones (ver manage.py loadtest --mix)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del dataset y de la mezcla')
+        parser.add_argument('--teams', type=int, default=100, help='Teams del dataset')
+        parser.add_argument('--heroes', type=int, default=10000, help='Heroes del dataset')
+        parser.add_argument('--output', default=None, help='Archivo donde guardar el reporte JSON')
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='bench-async-')
+        try:
+            base = os.path.join(workdir, 'base.sqlite3')
+            self.stderr.write(f"Generando dataset ({options['teams']} teams, {options['heroes']} heroes)...")
+            self._manage(['migrate', '--verbosity', '0'], database=base)
+            self._manage(['seed', '--teams', str(options['teams']), '--heroes', str(options['heroes']),
+                          '--seed', str(options['seed'])], database=base)
+
+            reports = {}
+            for name, async_views in VARIANTS:
+                database = os.path.join(workdir, f'{name}.sqlite3')
+                shutil.copyfile(base, database)
+                output = os.path.join(workdir, f'{name}.json')
+                command = [
+                    'loadtest', '--mode', 'asgi', '--database', database, '--output', output,
+                    '--concurrency', str(options['concurrency']), '--duration', str(options['duration']),
+                    '--warmup', str(options['warmup']), '--seed', str(options['seed']),
+                ]
+                if options['mix']:
+                    command += ['--mix', options['mix']]
+
+                self.stderr.write(f"Variante {name} (ASYNC_VIEWS={async_views})...")
+                self._manage(command, database=database, ASYNC_VIEWS=async_views)
+                with open(output, encoding='utf-8') as f:
+                    reports[name] = json.load(f)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        report = {
+            'config': {key: options[key] for key in ('concurrency', 'duration', 'warmup', 'mix', 'seed',
+                                                     'teams', 'heroes')},
+            'variants': {
+                name: {
+                    'throughput_rps': result['throughput_rps'],
+                    'errors': result['errors'],
+                    'latency_ms': result['latency_ms'],
+                }
+                for name, result in reports.items()
+            },
+            'speedup': {
+                'throughput': self._ratio(reports['async']['throughput_rps'], reports['sync']['throughput_rps']),
+                'p50': self._ratio(reports['sync']['latency_ms']['p50'], reports['async']['latency_ms']['p50']),
+                'p99': self._ratio(reports['sync']['latency_ms']['p99'], reports['async']['latency_ms']['p99']),
+            },
+        }
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Reporte guardado en {options['output']}")
+        self.stdout.write(output)
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        return round(numerator / denominator, 3) if denominator else None
+
+    def _manage(self, arguments, database, **env):
+        """
+        Ejecuta manage.py en un proceso nuevo apuntando DB_NAME a `database`.
+        """
+        environment = {**os.environ, 'DB_NAME': database, **env}
+        completed = subprocess.run(
+            [sys.executable, os.path.join(str(settings.BASE_DIR), 'manage.py'), *arguments],
+            env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if completed.returncode != 0:
+            raise CommandError(f"manage.py {arguments[0]} falló:\n{completed.stderr}")
@@ -0,0 +1,115 @@
+"""
+python manage.py bench_group_commit
+
+Compara el throughput de altas y modificaciones concurrentes de heroes
+con y sin group commit (GROUP_COMMIT, ver apps/core/group_commit.py).
+
+Cada variante corre `manage.py loadtest` en un proceso aparte sobre una
+copia de la misma base SQLite generada con --seed, con una mezcla solo
+de escrituras (POST/PATCH /api/heroes/).
+
+Ejemplos:
+    python manage.py bench_group_commit
+    python manage.py bench_group_commit --sqlite-profile stock --concurrency 64 --output group_commit.json
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+VARIANTS = (('individual', 'False'), ('group_commit', 'True'))
+
+DEFAULT_MIX = 'heroes.create=60,heroes.update=40'
+
+
+class Command(BaseCommand):
+    help = 'Throughput de escrituras concurrentes de heroes con y sin group commit'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['wsgi', 'asgi'], default='wsgi', help='Modo de loadtest')
+        parser.add_argument('--concurrency', type=int, default=32, help='Threads o tareas concurrentes')
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos de medición por variante')
+        parser.add_argument('--warmup', type=float, default=1.0, help='Segundos de calentamiento por variante')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Mezcla de operaciones (ver manage.py loadtest --mix)')
+        parser.add_argument('--sqlite-profile', default=settings.SQLITE_PROFILE,
+                            choices=list(settings.SQLITE_PROFILES), help='Perfil de PRAGMAs de SQLite')
+        parser.add_argument('--window-ms', type=float, default=settings.GROUP_COMMIT['window_ms'],
+                            help='Ventana del escritor (GROUP_COMMIT_WINDOW_MS)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del dataset y de la mezcla')
+        parser.add_argument('--teams', type=int, default=100, help='Teams del dataset')
+        parser.add_argument('--heroes', type=int, default=10000, help='Heroes del dataset')
+        parser.add_argument('--output', default=None, help='Archivo donde guardar el reporte JSON')
+
+    def handle(self, *args, **options):
+        env = {'SQLITE_PROFILE': options['sqlite_profile'], 'GROUP_COMMIT_WINDOW_MS': str(options['window_ms'])}
+        workdir = tempfile.mkdtemp(prefix='bench-group-commit-')
+        try:
+            base = os.path.join(workdir, 'base.sqlite3')
+            self.stderr.write(f"Generando dataset ({options['teams']} teams, {options['heroes']} heroes)...")
+            self._manage(['migrate', '--verbosity', '0'], database=base, SQLITE_PROFILE='stock')
+            self._manage(['seed', '--teams', str(options['teams']), '--heroes', str(options['heroes']),
+                          '--seed', str(options['seed'])], database=base, SQLITE_PROFILE='stock')
+
+            reports = {}
+            for name, enabled in VARIANTS:
+                database = os.path.join(workdir, f'{name}.sqlite3')
+                shutil.copyfile(base, database)
+                output = os.path.join(workdir, f'{name}.json')
+                self.stderr.write(f"Variante {name} (GROUP_COMMIT={enabled})...")
+                self._manage([
+                    'loadtest', '--mode', options['mode'], '--database', database, '--output', output,
+                    '--concurrency', str(options['concurrency']), '--duration', str(options['duration']),
+                    '--warmup', str(options['warmup']), '--seed', str(options['seed']), '--mix', options['mix'],
+                ], database=database, GROUP_COMMIT=enabled, **env)
+                with open(output, encoding='utf-8') as f:
+                    reports[name] = json.load(f)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        report = {
+            'config': {key: options[key] for key in ('mode', 'concurrency', 'duration', 'warmup', 'mix',
+                                                     'sqlite_profile', 'window_ms', 'seed', 'teams', 'heroes')},
+            'variants': {
+                name: {
+                    'throughput_rps': result['throughput_rps'],
+                    'errors': result['errors'],
+                    'latency_ms': result['latency_ms'],
+                }
+                for name, result in reports.items()
+            },
+            'speedup': {
+                'throughput': self._ratio(reports['group_commit']['throughput_rps'],
+                                          reports['individual']['throughput_rps']),
+                'p50': self._ratio(reports['individual']['latency_ms']['p50'],
+                                   reports['group_commit']['latency_ms']['p50']),
+                'p99': self._ratio(reports['individual']['latency_ms']['p99'],
+                                   reports['group_commit']['latency_ms']['p99']),
+            },
+        }
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Reporte guardado en {options['output']}")
+        self.stdout.write(output)
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        return round(numerator / denominator, 3) if denominator else None
+
+    def _manage(self, arguments, database, **env):
+        """
+        Ejecuta manage.py en un proceso nuevo apuntando DB_NAME a `database`.
+        """
+        environment = {**os.environ, 'DB_NAME': database, **env}
+        completed = subprocess.run(
+            [sys.executable, os.path.join(str(settings.BASE_DIR), 'manage.py'), *arguments],
+            env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if completed.returncode != 0:
+            raise CommandError(f"manage.py {arguments[0]} falló:\n{completed.stderr}")
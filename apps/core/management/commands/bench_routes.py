@@ -0,0 +1,112 @@
+"""
+python manage.py bench_routes
+
+Microbenchmark de resolución de URLs (resolve() del URLconf completo,
+sin ejecutar la vista) para las rutas más pedidas de la API. Compara:
+- two-routers: el URLconf anterior, un DefaultRouter por app incluidos
+  uno detrás de otro bajo api/ y después de admin/
+- one-router: el router único (config/routers.py) con include()
+- compiled: el router único con compiled_path (el URLconf actual, ver
+  apps/core/url_dispatch.py)
+
+Muestra microsegundos por resolve() de cada ruta y escenario y la mejora
+de compiled contra two-routers.
+
+Ejemplos:
+    python manage.py bench_routes
+    python manage.py bench_routes --repeat 9 --output routes.json
+"""
+import json
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import include, path
+from django.urls.resolvers import RegexPattern, URLResolver
+from apps.core.api_docs import docs_urlpatterns
+from apps.core.benchmark import measure
+from apps.core.url_dispatch import compiled_path
+from apps.heroes.routers import get_heroes_router
+from apps.teams.routers import get_teams_router
+from config.routers import get_api_router
+from config.views import hola_mundo, metrics
+
+PATHS = [
+    '/api/heroes/',
+    '/api/heroes/42/',
+    '/api/heroes/by-name/',
+    '/api/heroes/7/by-team/',
+    '/api/teams/',
+    '/api/teams/7/',
+    '/api/metrics',
+]
+
+
+def api_views():
+    return [
+        path('api/hola-mundo/', hola_mundo, name='hola-mundo'),
+        path('api/metrics', metrics, name='metrics'),
+    ]
+
+
+def build_scenarios():
+    """
+    Retorna {escenario: URLResolver raíz}, armados como lo hace Django con ROOT_URLCONF.
+    """
+    api_router = get_api_router()
+    scenarios = {
+        'two-routers': [
+            path('admin/', admin.site.urls),
+            *api_views(),
+            path('api/', include(get_teams_router().urls)),
+            path('api/', include(get_heroes_router().urls)),
+            *docs_urlpatterns(),
+        ],
+        'one-router': [
+            path('admin/', admin.site.urls),
+            *api_views(),
+            path('api/', include(api_router.urls)),
+            *docs_urlpatterns(),
+        ],
+        'compiled': [
+            compiled_path('api/', [
+                path('hola-mundo/', hola_mundo, name='hola-mundo'),
+                path('metrics', metrics, name='metrics'),
+                *api_router.urls,
+            ]),
+            path('admin/', admin.site.urls),
+            *docs_urlpatterns(),
+        ],
+    }
+    return {name: URLResolver(RegexPattern(r'^/'), patterns) for name, patterns in scenarios.items()}
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark de resolución de URLs: dos routers, router único y tabla compilada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por caso (se toma la mejor)')
+        parser.add_argument('--output', default=None, help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat debe ser >= 1')
+
+        resolvers = build_scenarios()
+        results = {}
+        for url in PATHS:
+            results[url] = {}
+            for name, resolver in resolvers.items():
+                view_name = resolver.resolve(url).view_name
+                results[url][name] = measure(lambda: resolver.resolve(url), repeat=options['repeat']) * 1e6
+            results[url]['view_name'] = view_name
+
+        names = list(resolvers)
+        self.stdout.write(f"{'ruta':<26}" + ''.join(f'{name:>13}' for name in names) + f"{'mejora':>9}")
+        for url, result in results.items():
+            speedup = result['two-routers'] / result['compiled']
+            self.stdout.write(f'{url:<26}' + ''.join(f'{result[name]:>10.2f} us' for name in names)
+                              + f'{speedup:>8.1f}x')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'repeat': options['repeat'], 'us_per_resolve': results}, output, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
@@ -0,0 +1,150 @@
+"""
+python manage.py bench_schemas
+
+Microbenchmark de los schemas de Heroes y Teams: tiempo y pico de memoria
+de serializar (Read) y validar (Create/Update) 1, 100 y 10.000 filas.
+
+Los objetos se arman en memoria (sin base de datos) y los teams de
+team_id se precargan en team_lookup_cache, como en un request con la
+caché caliente.
+
+Compara contra benchmarks/baselines/schemas.json y termina con error si
+algún caso empeora más que --threshold. Con --update-baseline guarda los
+resultados actuales como nueva baseline.
+"""
+import json
+import platform
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.benchmark import calibrate, compare, load_baseline, measure, peak_allocation, save_baseline
+from apps.heroes.models import Hero
+from apps.heroes.schemas import HeroCreateSchema, HeroReadSchema, HeroUpdateSchema
+from apps.teams.cache import team_lookup_cache
+from apps.teams.models import Team
+from apps.teams.schemas import TeamCreateSchema, TeamReadSchema, TeamUpdateSchema
+
+SUITE = 'schemas'
+DEFAULT_SIZES = [1, 100, 10000]
+FIXED_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def build_teams(rows):
+    return [
+        Team(id=i + 1, nombre=f'Team {i}', descripcion='Un equipo de prueba ' * 3,
+             fecha_creacion=FIXED_DATE, fecha_actualizacion=FIXED_DATE)
+        for i in range(rows)
+    ]
+
+
+def build_heroes(rows, teams):
+    return [
+        Hero(id=i + 1, nombre=f'Hero {i}', descripcion='Un héroe de prueba ' * 5, poder_principal='Vuelo',
+             nivel=(i % 100) + 1, team=teams[i % len(teams)],
+             fecha_creacion=FIXED_DATE, fecha_actualizacion=FIXED_DATE)
+        for i in range(rows)
+    ]
+
+
+def serialize_case(schema, instances):
+    return lambda: schema(instances, many=True).data
+
+
+def validate_case(schema, payloads, partial=False):
+    def run():
+        serializer = schema(data=payloads, many=True, partial=partial)
+        if not serializer.is_valid():
+            raise CommandError(f'{schema.__name__}: datos inválidos {serializer.errors[:1]}')
+        return serializer.validated_data
+    return run
+
+
+def build_cases(rows):
+    """
+    Retorna {nombre: función} para un tamaño de lote.
+    """
+    teams = build_teams(max(1, min(rows // 10, 1000)))
+    heroes = build_heroes(rows, teams)
+    for team in teams:
+        team_lookup_cache.set(team.id, team)
+
+    hero_payloads = [
+        {'nombre': f'Hero {i}', 'descripcion': 'Un héroe de prueba', 'poder_principal': 'Vuelo',
+         'nivel': (i % 100) + 1, 'team_id': teams[i % len(teams)].id}
+        for i in range(rows)
+    ]
+    hero_updates = [{'nivel': (i % 100) + 1, 'team_id': teams[i % len(teams)].id} for i in range(rows)]
+    team_payloads = [{'nombre': f'Team {i}', 'descripcion': 'Un equipo de prueba'} for i in range(rows)]
+
+    return {
+        f'HeroReadSchema.serialize[{rows}]': serialize_case(HeroReadSchema, heroes),
+        f'HeroCreateSchema.validate[{rows}]': validate_case(HeroCreateSchema, hero_payloads),
+        f'HeroUpdateSchema.validate[{rows}]': validate_case(HeroUpdateSchema, hero_updates, partial=True),
+        f'TeamReadSchema.serialize[{rows}]': serialize_case(TeamReadSchema, build_teams(rows)),
+        f'TeamCreateSchema.validate[{rows}]': validate_case(TeamCreateSchema, team_payloads),
+        f'TeamUpdateSchema.validate[{rows}]': validate_case(TeamUpdateSchema, team_payloads, partial=True),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark de serialización/validación de los schemas con baseline y umbral de regresión'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                            help='Tamaños de lote separados por coma (default: 1,100,10000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por caso (se toma la mejor)')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Regresión máxima permitida (0.25 = 25%%)')
+        parser.add_argument('--baseline', default=None, help='Archivo de baseline (default: benchmarks/baselines/schemas.json)')
+        parser.add_argument('--update-baseline', action='store_true', help='Guardar los resultados como nueva baseline')
+        parser.add_argument('--output', default=None, help='Archivo donde guardar el reporte JSON')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        calibration = calibrate()
+        cases = {}
+        try:
+            for rows in sizes:
+                for name, func in build_cases(rows).items():
+                    seconds = measure(func, repeat=options['repeat'])
+                    cases[name] = {
+                        'rows': rows,
+                        'us_per_row': round(seconds / rows * 1e6, 3),
+                        'rows_per_second': round(rows / seconds),
+                        'normalized_time': round(seconds / calibration, 4),
+                        'peak_bytes_per_row': round(peak_allocation(func) / rows),
+                    }
+                    self.stderr.write(
+                        f"  {name:<40} {cases[name]['us_per_row']:>10.2f} us/fila "
+                        f"{cases[name]['peak_bytes_per_row']:>8} B/fila"
+                    )
+        finally:
+            team_lookup_cache.clear()
+
+        report = {
+            'suite': SUITE,
+            'python': platform.python_version(),
+            'calibration_s': round(calibration, 6),
+            'cases': cases,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+        if options['update_baseline']:
+            path = save_baseline(SUITE, report, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f'Baseline guardada en {path}'))
+            return
+
+        baseline = load_baseline(SUITE, options['baseline'])
+        if baseline is None:
+            self.stdout.write(self.style.WARNING('No hay baseline; usa --update-baseline para crearla'))
+            return
+
+        regressions = compare(cases, baseline['cases'], options['threshold'])
+        if regressions:
+            raise CommandError(
+                f"Regresiones mayores a {options['threshold']:.0%}:\n  " + '\n  '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Sin regresiones mayores a {options['threshold']:.0%} ({len(cases)} casos)"
+        ))
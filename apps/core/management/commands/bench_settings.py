@@ -0,0 +1,140 @@
+"""
+python manage.py bench_settings
+
+Costo por request del stack de Django con cada perfil de settings
+(SETTINGS_PROFILE, ver config/settings.py). Compara:
+- development: el stack completo con DEBUG=True (los defaults actuales)
+- development-nodebug: el mismo stack con DEBUG=False (separa cuánto
+  cuesta DEBUG de cuánto cuestan los middlewares)
+- production: el perfil lean (sin sesiones, CSRF, auth, mensajes ni
+  clickjacking, DRF sin autenticadores, DEBUG=False)
+
+Cada corrida es un proceso nuevo que llama al WSGIHandler de Django
+directamente (sin servidor ni red), así que mide solo el overhead del
+framework: middlewares, resolución, DRF y la vista. Las corridas de los
+escenarios se intercalan (--runs por escenario) y se reporta la mediana
+de sus medianas y p95, en microsegundos. Usa la base de datos configurada
+(DB_NAME...), que debe estar migrada. Los endpoints:
+- /api/hola-mundo/: sin base de datos, solo el stack
+- /api/heroes/?limit=10: primera página (sale de la caché de páginas)
+- /api/teams/?limit=10&offset=100: fuera de la caché de páginas, hace
+  queries en cada request (ahí pesa DEBUG, que registra cada query)
+
+Ejemplos:
+    python manage.py bench_settings
+    python manage.py bench_settings --runs 5 --requests 5000 --output settings.json
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SCENARIOS = {
+    'development': {'SETTINGS_PROFILE': 'development'},
+    'development-nodebug': {'SETTINGS_PROFILE': 'development', 'DEBUG': 'False'},
+    'production': {'SETTINGS_PROFILE': 'production'},
+}
+
+# Corre en el proceso hijo: N requests por endpoint contra el WSGIHandler
+CHILD = """
+import io, json, os, statistics, sys, time
+import django
+django.setup()
+from django.core.handlers.wsgi import WSGIHandler
+
+handler = WSGIHandler()
+paths = ['/api/hola-mundo/', '/api/heroes/?limit=10', '/api/teams/?limit=10&offset=100']
+
+
+def request(path):
+    path_info, _, query = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path_info, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost', 'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(b''), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': False, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    b''.join(response)
+    response.close()
+    if not statuses[0].startswith('200'):
+        raise SystemExit(f'{path}: {statuses[0]}')
+
+
+requests = int(os.environ['BENCH_REQUESTS'])
+results = {}
+for path in paths:
+    for _ in range(min(requests, 200)):
+        request(path)
+    times = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        request(path)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    results[path] = {
+        'median_us': statistics.median(times) * 1e6,
+        'p95_us': times[int(len(times) * 0.95) - 1] * 1e6,
+    }
+print(json.dumps(results))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Overhead por request del perfil production contra el de development'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Procesos por escenario (se reporta la mediana)')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests medidos por endpoint y proceso')
+        parser.add_argument('--output', default=None, help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1 or options['requests'] < 1:
+            raise CommandError('--runs y --requests deben ser >= 1')
+
+        runs = {name: [] for name in SCENARIOS}
+        for _ in range(options['runs']):
+            for name, env in SCENARIOS.items():
+                runs[name].append(self._run(env, options['requests']))
+        results = {
+            name: {
+                path: {metric: statistics.median(run[path][metric] for run in scenario_runs)
+                       for metric in ('median_us', 'p95_us')}
+                for path in scenario_runs[0]
+            }
+            for name, scenario_runs in runs.items()
+        }
+
+        names = list(SCENARIOS)
+        self.stdout.write(f"{'endpoint (mediana / p95 us)':<33}" + ''.join(f'{name:>22}' for name in names)
+                          + f"{'mejora':>9}")
+        for path in results['development']:
+            cells = ''.join(
+                f"{results[name][path]['median_us']:>12.1f} / {results[name][path]['p95_us']:>7.1f}" for name in names
+            )
+            speedup = results['development'][path]['median_us'] / results['production'][path]['median_us']
+            self.stdout.write(f'{path:<33}{cells}{speedup:>8.2f}x')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'runs': options['runs'], 'requests': options['requests'], 'results': results},
+                          output, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
+
+    @staticmethod
+    def _run(env, requests):
+        child_env = {key: value for key, value in os.environ.items() if key not in ('DEBUG', 'SETTINGS_PROFILE')}
+        child_env.update(env, BENCH_REQUESTS=str(requests), ALLOWED_HOSTS='localhost')
+        child_env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+        completed = subprocess.run(
+            [sys.executable, '-c', CHILD], cwd=str(settings.BASE_DIR), env=child_env,
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f'Falló el proceso de medición:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
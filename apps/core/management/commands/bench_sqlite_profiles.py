@@ -0,0 +1,127 @@
+"""
+python manage.py bench_sqlite_profiles
+
+Compara el throughput de lecturas y escrituras concurrentes sobre SQLite
+con cada perfil de PRAGMAs de settings.SQLITE_PROFILES (stock, production...).
+
+Cada perfil corre `manage.py loadtest` en un proceso aparte
+(SQLITE_PROFILE=<perfil>) sobre una copia de la misma base generada con
+--seed. La base se genera con el perfil stock: journal_mode queda
+guardado en el archivo y cada perfil debe partir del modo de fábrica.
+
+Ejemplos:
+    python manage.py bench_sqlite_profiles
+    python manage.py bench_sqlite_profiles --concurrency 32 --duration 20 --output sqlite.json
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Mezcla por defecto: lecturas con ~30% de escrituras concurrentes
+DEFAULT_MIX = 'heroes.list=25,heroes.retrieve=25,heroes.by-team=10,teams.retrieve=10,heroes.create=15,heroes.update=15'
+
+WRITE_OPERATIONS = ('.create', '.update', '.delete')
+
+
+class Command(BaseCommand):
+    help = 'Throughput de lecturas/escrituras concurrentes con cada perfil de PRAGMAs de SQLite'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default=None,
+                            help=f"Perfiles separados por coma (por defecto: {', '.join(settings.SQLITE_PROFILES)})")
+        parser.add_argument('--concurrency', type=int, default=16, help='Threads concurrentes')
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos de medición por perfil')
+        parser.add_argument('--warmup', type=float, default=1.0, help='Segundos de calentamiento por perfil')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Mezcla de operaciones (ver manage.py loadtest --mix)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del dataset y de la mezcla')
+        parser.add_argument('--teams', type=int, default=100, help='Teams del dataset')
+        parser.add_argument('--heroes', type=int, default=10000, help='Heroes del dataset')
+        parser.add_argument('--output', default=None, help='Archivo donde guardar el reporte JSON')
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'].split(',') if options['profiles'] else list(settings.SQLITE_PROFILES)
+        unknown = [name for name in profiles if name not in settings.SQLITE_PROFILES]
+        if unknown:
+            raise CommandError(f"Perfiles desconocidos: {', '.join(unknown)}")
+
+        workdir = tempfile.mkdtemp(prefix='bench-sqlite-')
+        try:
+            base = os.path.join(workdir, 'base.sqlite3')
+            self.stderr.write(f"Generando dataset ({options['teams']} teams, {options['heroes']} heroes)...")
+            self._manage(['migrate', '--verbosity', '0'], database=base, profile='stock')
+            self._manage(['seed', '--teams', str(options['teams']), '--heroes', str(options['heroes']),
+                          '--seed', str(options['seed'])], database=base, profile='stock')
+
+            reports = {}
+            for name in profiles:
+                database = os.path.join(workdir, f'{name}.sqlite3')
+                shutil.copyfile(base, database)
+                output = os.path.join(workdir, f'{name}.json')
+                self.stderr.write(f"Perfil {name}...")
+                self._manage([
+                    'loadtest', '--mode', 'wsgi', '--database', database, '--output', output,
+                    '--concurrency', str(options['concurrency']), '--duration', str(options['duration']),
+                    '--warmup', str(options['warmup']), '--seed', str(options['seed']), '--mix', options['mix'],
+                ], database=database, profile=name)
+                with open(output, encoding='utf-8') as f:
+                    reports[name] = json.load(f)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        variants = {name: self._summary(name, result) for name, result in reports.items()}
+        report = {
+            'config': {key: options[key] for key in ('concurrency', 'duration', 'warmup', 'mix', 'seed',
+                                                     'teams', 'heroes')},
+            'profiles': variants,
+        }
+        if 'stock' in variants:
+            stock = variants['stock']
+            report['speedup_vs_stock'] = {
+                name: {
+                    'reads': self._ratio(variant['reads_rps'], stock['reads_rps']),
+                    'writes': self._ratio(variant['writes_rps'], stock['writes_rps']),
+                    'p99': self._ratio(stock['latency_ms']['p99'], variant['latency_ms']['p99']),
+                }
+                for name, variant in variants.items() if name != 'stock'
+            }
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Reporte guardado en {options['output']}")
+        self.stdout.write(output)
+
+    @staticmethod
+    def _summary(name, result):
+        operations = result['operations']
+        writes = [op for op in operations if op.endswith(WRITE_OPERATIONS)]
+        return {
+            'pragmas': settings.SQLITE_PROFILES[name],
+            'throughput_rps': result['throughput_rps'],
+            'reads_rps': round(sum(operations[op]['throughput_rps'] for op in operations if op not in writes), 2),
+            'writes_rps': round(sum(operations[op]['throughput_rps'] for op in writes), 2),
+            'errors': result['errors'],
+            'latency_ms': result['latency_ms'],
+        }
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        return round(numerator / denominator, 3) if denominator else None
+
+    def _manage(self, arguments, database, profile):
+        """
+        Ejecuta manage.py en un proceso nuevo con DB_NAME=`database` y SQLITE_PROFILE=`profile`.
+        """
+        environment = {**os.environ, 'DB_NAME': database, 'SQLITE_PROFILE': profile}
+        completed = subprocess.run(
+            [sys.executable, os.path.join(str(settings.BASE_DIR), 'manage.py'), *arguments],
+            env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if completed.returncode != 0:
+            raise CommandError(f"manage.py {arguments[0]} falló:\n{completed.stderr}")
@@ -0,0 +1,116 @@
+"""
+python manage.py bench_startup
+
+Reporte del costo de arranque de un worker: django.setup() + importar el
+URLconf (con él, vistas, services, repositories y schemas), en un proceso
+nuevo por corrida. Compara tres escenarios:
+- docs-off: API_DOCS=False (producción sin documentación)
+- docs-lazy: API_DOCS=True, antes del primer request a /docs/ (lo que
+  paga cada worker al arrancar)
+- docs-loaded: API_DOCS=True y la documentación ya cargada
+  (api_docs.get_schema_view()): lo que pagaba cada worker al arrancar
+  cuando drf_yasg y los docs.py se importaban con el URLconf
+
+Las corridas de los escenarios se intercalan (el ruido de la máquina
+afecta a todos por igual). Para cada uno muestra la mediana y el mínimo
+de --runs corridas y la cantidad de módulos importados. Además mide por
+separado cuánto tarda cargar la documentación (lo que se ahorra cada
+worker que nunca la sirve) y qué paquetes importa.
+
+Ejemplos:
+    python manage.py bench_startup
+    python manage.py bench_startup --runs 15 --output startup.json
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SCENARIOS = {
+    'docs-off': {'API_DOCS': 'False'},
+    'docs-lazy': {'API_DOCS': 'True'},
+    'docs-loaded': {'API_DOCS': 'True', 'BENCH_LOAD_DOCS': 'True'},
+}
+
+# Corre en el proceso hijo: mide desde antes de importar Django
+CHILD = """
+import json, os, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+import config.urls
+docs_seconds = 0.0
+if os.environ.get('BENCH_LOAD_DOCS') == 'True':
+    docs_start = time.perf_counter()
+    from apps.core import api_docs
+    api_docs.get_schema_view()
+    docs_seconds = time.perf_counter() - docs_start
+seconds = time.perf_counter() - start
+print(json.dumps({'seconds': seconds, 'docs_seconds': docs_seconds, 'modules': sorted(sys.modules)}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Tiempo de arranque (setup + URLconf) con la documentación apagada, diferida y cargada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=7, help='Procesos por escenario (se reporta la mediana)')
+        parser.add_argument('--output', default=None, help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs debe ser >= 1')
+
+        runs = {name: [] for name in SCENARIOS}
+        for _ in range(options['runs']):
+            for name, env in SCENARIOS.items():
+                runs[name].append(self._run(env))
+
+        results = {}
+        modules = {}
+        for name, scenario_runs in runs.items():
+            modules[name] = set(scenario_runs[0]['modules'])
+            results[name] = {
+                'median_ms': statistics.median(run['seconds'] for run in scenario_runs) * 1000,
+                'min_ms': min(run['seconds'] for run in scenario_runs) * 1000,
+                'modules': len(modules[name]),
+            }
+        docs_ms = statistics.median(run['docs_seconds'] for run in runs['docs-loaded']) * 1000
+
+        self.stdout.write(f"{'escenario':<12} {'mediana ms':>11} {'mínimo ms':>10} {'módulos':>8}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['median_ms']:>11.1f} {result['min_ms']:>10.1f} {result['modules']:>8}"
+            )
+
+        self.stdout.write(
+            f"\nCargar la documentación (diferido hasta el primer /docs/): {docs_ms:.1f} ms y "
+            f"{results['docs-loaded']['modules'] - results['docs-lazy']['modules']} módulos por worker"
+        )
+
+        only_docs = Counter(module.split('.')[0] for module in modules['docs-loaded'] - modules['docs-lazy'])
+        self.stdout.write('Paquetes que solo importa la documentación (módulos):')
+        for package, count in only_docs.most_common():
+            self.stdout.write(f'  {package}: {count}')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'runs': options['runs'], 'results': results, 'docs_load_ms': docs_ms,
+                           'docs_only_packages': dict(only_docs)}, output, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
+
+    @staticmethod
+    def _run(env):
+        child_env = {**os.environ, **env}
+        child_env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+        completed = subprocess.run(
+            [sys.executable, '-c', CHILD], cwd=str(settings.BASE_DIR), env=child_env,
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f'Falló el proceso de medición:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
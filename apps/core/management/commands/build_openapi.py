@@ -0,0 +1,49 @@
+"""
+python manage.py build_openapi
+
+Genera el schema OpenAPI (swagger.json y swagger.yaml, más sus .gz) en
+OPENAPI_SCHEMA_DIR, para correr al desplegar. /swagger.json y
+/swagger.yaml sirven esos archivos en vez de generar el schema en cada
+request (ver apps/core/api_docs.py).
+
+Con --check no escribe nada: termina con error si los archivos no existen
+o no coinciden con el schema actual (útil en CI).
+
+Ejemplos:
+    python manage.py build_openapi
+    python manage.py build_openapi --output-dir /srv/api/openapi
+    python manage.py build_openapi --check
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.core import api_docs
+
+
+class Command(BaseCommand):
+    help = 'Genera el schema OpenAPI en disco para servirlo prearmado'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=None,
+                            help='Directorio de salida (por defecto OPENAPI_SCHEMA_DIR)')
+        parser.add_argument('--check', action='store_true',
+                            help='Solo verificar que los archivos estén al día')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stale = []
+            for fmt in api_docs.SCHEMA_FORMATS:
+                target = api_docs.schema_path(fmt, options['output_dir'])
+                if not target.exists() or target.read_bytes() != api_docs.generate_schema(fmt):
+                    stale.append(str(target))
+            if stale:
+                raise CommandError(f"Schema desactualizado (correr build_openapi): {', '.join(stale)}")
+            self.stdout.write('Schema al día')
+            return
+
+        for fmt in api_docs.SCHEMA_FORMATS:
+            start = time.perf_counter()
+            target, artifact = api_docs.write_schema(fmt, options['output_dir'])
+            self.stdout.write(
+                f'{target}: {len(artifact.body)} bytes ({len(artifact.gzipped)} con gzip) '
+                f'en {(time.perf_counter() - start) * 1000:.1f} ms'
+            )
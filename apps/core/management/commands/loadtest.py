@@ -0,0 +1,94 @@
+"""
+python manage.py loadtest
+
+Prueba de carga en proceso contra /api/heroes/ y /api/teams/
+(ver apps/core/loadtest.py). Por defecto crea una base SQLite temporal,
+la migra y la llena con --teams/--heroes filas generadas con --seed
+(apps/core/seed.py, el mismo generador de `manage.py seed`), así
+cada corrida es reproducible y no toca la base de datos configurada.
+
+Ejemplos:
+    python manage.py loadtest --duration 30 --concurrency 16
+    python manage.py loadtest --mode asgi --mix heroes.list=80,heroes.create=20
+    python manage.py loadtest --database /tmp/bench.sqlite3 --output report.json
+"""
+import json
+import os
+import tempfile
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from apps.core import seed
+from apps.core.loadtest import DEFAULT_MIX, parse_mix, run_load
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga en proceso (WSGI/ASGI) con reporte JSON de throughput y p50/p95/p99'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['wsgi', 'asgi'], default='wsgi',
+                            help='wsgi: threads con django.test.Client; asgi: tareas asyncio con AsyncClient')
+        parser.add_argument('--concurrency', type=int, default=8, help='Threads o tareas concurrentes')
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos de medición')
+        parser.add_argument('--warmup', type=float, default=1.0, help='Segundos de calentamiento (no se miden)')
+        parser.add_argument('--mix', default=None,
+                            help=f"Pesos por operación, p.ej. heroes.list=50,heroes.create=10. "
+                                 f"Operaciones: {', '.join(DEFAULT_MIX)}")
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del dataset y de la mezcla')
+        parser.add_argument('--teams', type=int, default=100, help='Teams a generar en una base nueva')
+        parser.add_argument('--heroes', type=int, default=10000, help='Heroes a generar en una base nueva')
+        parser.add_argument('--database', default=None,
+                            help='Archivo SQLite a usar; si no existe se crea, migra y llena')
+        parser.add_argument('--use-current-db', action='store_true',
+                            help='Usar la base de datos configurada tal cual (sin generar datos)')
+        parser.add_argument('--output', default=None, help='Archivo donde guardar el reporte JSON')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # django.test.Client usa el host "testserver"
+        if 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+
+        if not options['use_current_db']:
+            self._use_sqlite_database(options)
+
+        try:
+            report = run_load(
+                mode=options['mode'],
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                warmup=options['warmup'],
+                mix=mix,
+                seed=options['seed'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Reporte guardado en {options['output']}")
+        self.stdout.write(output)
+
+    def _use_sqlite_database(self, options):
+        """
+        Apunta la conexión default a un archivo SQLite y, si es nuevo, lo migra y llena.
+        """
+        path = options['database'] or os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'loadtest.sqlite3')
+        is_new = not os.path.exists(path)
+
+        connections.close_all()
+        settings_dict = connections['default'].settings_dict
+        settings_dict['ENGINE'] = 'django.db.backends.sqlite3'
+        settings_dict['NAME'] = path
+
+        if is_new:
+            self.stderr.write(f"Creando {path} ({options['teams']} teams, {options['heroes']} heroes)...")
+            call_command('migrate', verbosity=0, interactive=False)
+            seed.generate(options['teams'], options['heroes'], seed=options['seed'])
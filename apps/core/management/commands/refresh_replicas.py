@@ -0,0 +1,38 @@
+"""
+python manage.py refresh_replicas
+
+Copia la base `default` sobre las réplicas SQLite en modo copy
+(DB_<ALIAS>_MODE=copy, ver apps/core/db_router.py). Con --interval
+repite la copia cada N segundos hasta que se interrumpa.
+
+Ejemplos:
+    python manage.py refresh_replicas
+    python manage.py refresh_replicas --interval 5
+"""
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.db_router import refresh_replica
+
+
+class Command(BaseCommand):
+    help = 'Actualiza las réplicas SQLite en modo copy a partir de la base default'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None,
+                            help='Repetir cada N segundos (por defecto una sola vez)')
+
+    def handle(self, *args, **options):
+        if not settings.DB_REPLICAS:
+            raise CommandError('No hay réplicas configuradas (DB_REPLICAS)')
+
+        while True:
+            for alias in settings.DB_REPLICAS:
+                start = time.perf_counter()
+                if refresh_replica(alias):
+                    self.stdout.write(f'{alias}: actualizada en {(time.perf_counter() - start) * 1000:.1f} ms')
+                elif options['interval'] is None:
+                    self.stdout.write(f'{alias}: no es una réplica SQLite en modo copy, se omite')
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
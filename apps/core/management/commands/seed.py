@@ -0,0 +1,57 @@
+"""
+python manage.py seed
+
+Genera teams y heroes reproducibles para benchmarks (ver apps/core/seed.py).
+
+Ejemplos:
+    python manage.py seed --teams 10000 --heroes 5000000
+    python manage.py seed --clear --teams 100 --heroes 10000 --seed 7
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from apps.core import seed
+
+
+class Command(BaseCommand):
+    help = 'Genera teams y heroes determinísticos (semilla) con inserciones en lote'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=int, default=100, help='Cantidad de teams a generar')
+        parser.add_argument('--heroes', type=int, default=10000, help='Cantidad de heroes a generar')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador')
+        parser.add_argument('--batch-size', type=int, default=20000, help='Filas por executemany')
+        parser.add_argument('--team-skew', type=float, default=1.0,
+                            help='Exponente de los tamaños de team (0 = uniforme)')
+        parser.add_argument('--nivel-skew', type=float, default=1.1,
+                            help='Exponente Zipf del nivel (0 = uniforme)')
+        parser.add_argument('--clear', action='store_true', help='Borrar heroes y teams existentes antes de generar')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Alias de la base de datos')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if options['clear']:
+            seed.clear(using=using)
+            self.stderr.write('Heroes y teams existentes borrados')
+
+        def progress(inserted, total):
+            if options['verbosity'] > 1:
+                self.stderr.write(f'  {inserted}/{total} heroes')
+
+        try:
+            result = seed.generate(
+                teams=options['teams'],
+                heroes=options['heroes'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                team_skew=options['team_skew'],
+                nivel_skew=options['nivel_skew'],
+                using=using,
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.teams} teams y {result.heroes} heroes generados en {result.seconds:.2f}s '
+            f'({result.rows_per_second:,.0f} filas/s)'
+        ))
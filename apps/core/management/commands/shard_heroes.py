@@ -0,0 +1,108 @@
+"""
+python manage.py shard_heroes
+
+Reparte los heroes entre los shards de settings.HERO_SHARDS según el team
+de cada uno (ver apps/heroes/sharding.py) y reconstruye el índice
+hero_shards en `default`. Mueve las dos tablas: heroes y heroes_archive
+(el archivo vive en el mismo shard que los heroes de su team, ver
+apps/heroes/archive.py), y el índice queda con los IDs de ambas. Sirve para:
+- pasar a sharding una base existente (o generada con `manage.py seed`):
+  los heroes de `default` se mudan a su shard
+- cambiar la cantidad de shards: los heroes que ahora le tocan a otro
+  shard se mudan
+
+Los heroes conservan su ID y sus fechas. Correrlo con la API detenida:
+mientras dura, las lecturas por ID pueden no encontrar a un héroe que se
+está mudando.
+
+Ejemplos:
+    HERO_SHARDS=heroes_0,heroes_1 python manage.py migrate --database heroes_0
+    HERO_SHARDS=heroes_0,heroes_1 python manage.py migrate --database heroes_1
+    HERO_SHARDS=heroes_0,heroes_1 python manage.py shard_heroes
+    HERO_SHARDS=heroes_0,heroes_1 python manage.py shard_heroes --dry-run
+"""
+from collections import Counter, defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from apps.heroes import sharding
+from apps.heroes.models import ArchivedHero, Hero, HeroShard
+
+
+class Command(BaseCommand):
+    help = 'Reparte los heroes entre los shards de HERO_SHARDS y reconstruye el índice hero_shards'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Heroes leídos por lote')
+        parser.add_argument('--dry-run', action='store_true', help='Solo informar qué heroes se mudarían')
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError('No hay shards configurados (HERO_SHARDS)')
+
+        # `default` primero: es donde están los heroes antes de activar el sharding
+        sources = list(dict.fromkeys([DEFAULT_DB_ALIAS, *sharding.shard_aliases()]))
+        locations = {}
+        moves = Counter()
+        for model in (Hero, ArchivedHero):
+            for source in sources:
+                for batch in self._batches(model, source, options['batch_size']):
+                    by_target = defaultdict(list)
+                    for hero in batch:
+                        target = sharding.shard_for_team(hero.team_id)
+                        locations[hero.id] = target
+                        if target != source:
+                            by_target[target].append(hero)
+
+                    for target, heroes in by_target.items():
+                        moves[(model._meta.db_table, source, target)] += len(heroes)
+                        if not options['dry_run']:
+                            self._move(model, heroes, source, target)
+
+        for (table, source, target), count in sorted(moves.items()):
+            self.stdout.write(f'{table}: {source} -> {target}: {count} heroes')
+        totals = Counter(locations.values())
+        for alias in sharding.shard_aliases():
+            self.stdout.write(f'{alias}: {totals[alias]} heroes')
+
+        if options['dry_run']:
+            return
+        self._rebuild_index(locations)
+        self.stdout.write(f'Índice hero_shards reconstruido ({len(locations)} heroes)')
+
+    @staticmethod
+    def _batches(model, alias, batch_size):
+        """
+        Recorre los heroes (Hero o ArchivedHero) de un alias por ID (keyset:
+        se pueden borrar filas ya leídas sin perder el lugar).
+        """
+        last_id = 0
+        while True:
+            batch = list(model.objects.using(alias).filter(id__gt=last_id).order_by('id')[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+
+    @staticmethod
+    def _move(model, heroes, source, target):
+        # Primero la copia y después el borrado: si algo falla queda un duplicado, no un héroe perdido
+        with transaction.atomic(using=target):
+            for hero in heroes:
+                # raw=True: mismo ID y mismas fechas (sin auto_now/auto_now_add)
+                hero.save_base(using=target, raw=True, force_insert=True)
+        model.objects.using(source).filter(id__in=[hero.id for hero in heroes]).delete()
+
+    @staticmethod
+    def _rebuild_index(locations):
+        connection = connections[DEFAULT_DB_ALIAS]
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            HeroShard.objects.using(DEFAULT_DB_ALIAS).all().delete()
+            HeroShard.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+                [HeroShard(id=hero_id, shard=alias) for hero_id, alias in locations.items()],
+                batch_size=1000,
+            )
+            # Los IDs nuevos siguen después del mayor (en SQLite AUTOINCREMENT ya lo hace)
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [HeroShard]):
+                    cursor.execute(sql)
@@ -0,0 +1,241 @@
+"""
+Métricas de la API en formato de texto de Prometheus
+
+MetricsMiddleware (apps/core/middleware.py) registra, por cada acción
+de los ViewSets
+(HeroViewSet.list, TeamViewSet.retrieve, ...):
+- api_requests_total{view, action, method, status}
+- api_request_duration_seconds (histograma)
+- api_db_queries_total / api_db_duration_seconds_total
+  (medidos con un hook de queries, ver apps/core/query_hooks.py)
+- api_response_bytes_total
+
+Además publica los contadores de las cachés LRU registradas con
+metrics.register_cache() (por ejemplo team_lookup_cache) y el uso de los
+pools de conexiones registrados con register_pool() (api_db_pool_*, ver
+apps/core/db_pool.py) y el control de admisión registrado con
+register_admission() (api_admission_*, ver apps/core/admission.py).
+
+El endpoint GET /api/metrics devuelve todo en formato Prometheus.
+
+Costo en el camino caliente: un perf_counter por request y por query,
+un bisect para el bucket del histograma y un lock corto al final.
+"""
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+# Límites superiores (segundos) de los buckets del histograma de latencia
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RouteStats:
+    """
+    Acumuladores de una ruta (view, action).
+    """
+    __slots__ = ('statuses', 'buckets', 'count', 'duration', 'queries', 'db_duration', 'response_bytes')
+
+    def __init__(self):
+        self.statuses: Dict[Tuple[str, int], int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # el último es +Inf
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_duration = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        self._caches = {}
+        self._pools = {}
+        self._admission = None
+
+    def observe(self, view: str, action: str, method: str, status: int, duration: float,
+                queries: int, db_duration: float, response_bytes: int) -> None:
+        bucket = bisect_left(LATENCY_BUCKETS, duration)
+        with self._lock:
+            stats = self._routes.get((view, action))
+            if stats is None:
+                stats = self._routes[(view, action)] = RouteStats()
+            key = (method, status)
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            stats.buckets[bucket] += 1
+            stats.count += 1
+            stats.duration += duration
+            stats.queries += queries
+            stats.db_duration += db_duration
+            stats.response_bytes += response_bytes
+
+    def register_cache(self, name: str, cache) -> None:
+        """
+        Publica los contadores de una caché con stats() (por ejemplo LRUCache).
+        """
+        self._caches[name] = cache
+
+    def register_pool(self, alias: str, pool) -> None:
+        """
+        Publica el uso de un pool de conexiones con stats() (ConnectionPool).
+        Si el alias ya tenía un pool (otros parámetros de conexión) se reemplaza.
+        """
+        self._pools[alias] = pool
+
+    def register_admission(self, controller) -> None:
+        """
+        Publica el control de admisión (AdmissionController). Reemplaza al anterior.
+        """
+        self._admission = controller
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """
+        Exporta todas las métricas en formato de texto de Prometheus.
+        """
+        with self._lock:
+            routes = [
+                (view, action, dict(stats.statuses), list(stats.buckets), stats.count, stats.duration,
+                 stats.queries, stats.db_duration, stats.response_bytes)
+                for (view, action), stats in sorted(self._routes.items())
+            ]
+
+        lines: List[str] = []
+
+        lines.append('# HELP api_requests_total Requests atendidos por acción y status')
+        lines.append('# TYPE api_requests_total counter')
+        for view, action, statuses, *_ in routes:
+            for (method, status), value in sorted(statuses.items()):
+                lines.append(
+                    f'api_requests_total{{view="{view}",action="{action}",method="{method}",status="{status}"}} {value}'
+                )
+
+        lines.append('# HELP api_request_duration_seconds Latencia de los requests por acción')
+        lines.append('# TYPE api_request_duration_seconds histogram')
+        for view, action, _, buckets, count, duration, *_ in routes:
+            labels = f'view="{view}",action="{action}"'
+            cumulative = 0
+            for upper_bound, value in zip(LATENCY_BUCKETS, buckets):
+                cumulative += value
+                lines.append(f'api_request_duration_seconds_bucket{{{labels},le="{upper_bound}"}} {cumulative}')
+            lines.append(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'api_request_duration_seconds_sum{{{labels}}} {duration:.6f}')
+            lines.append(f'api_request_duration_seconds_count{{{labels}}} {count}')
+
+        counters = (
+            ('api_db_queries_total', 'Queries SQL ejecutadas por acción', 6, '{}'),
+            ('api_db_duration_seconds_total', 'Tiempo en la base de datos por acción', 7, '{:.6f}'),
+            ('api_response_bytes_total', 'Bytes de respuesta por acción', 8, '{}'),
+        )
+        for name, help_text, index, fmt in counters:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for route in routes:
+                lines.append(f'{name}{{view="{route[0]}",action="{route[1]}"}} {fmt.format(route[index])}')
+
+        if self._caches:
+            cache_stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+            for metric, key, kind in (
+                ('api_cache_hits_total', 'hits', 'counter'),
+                ('api_cache_misses_total', 'misses', 'counter'),
+                ('api_cache_evictions_total', 'evictions', 'counter'),
+                ('api_cache_size', 'size', 'gauge'),
+            ):
+                lines.append(f'# TYPE {metric} {kind}')
+                for name, stats in cache_stats.items():
+                    lines.append(f'{metric}{{cache="{name}"}} {stats[key]}')
+
+        if self._pools:
+            pool_stats = {alias: pool.stats() for alias, pool in sorted(self._pools.items())}
+            for metric, key, kind, fmt in (
+                ('api_db_pool_in_use', 'in_use', 'gauge', '{}'),
+                ('api_db_pool_idle', 'idle', 'gauge', '{}'),
+                ('api_db_pool_max_size', 'max_size', 'gauge', '{}'),
+                ('api_db_pool_checkouts_total', 'checkouts', 'counter', '{}'),
+                ('api_db_pool_checkout_wait_seconds_total', 'checkout_wait_seconds', 'counter', '{:.6f}'),
+                ('api_db_pool_max_checkout_wait_seconds', 'max_checkout_wait_seconds', 'gauge', '{:.6f}'),
+                ('api_db_pool_timeouts_total', 'timeouts', 'counter', '{}'),
+                ('api_db_pool_created_total', 'created', 'counter', '{}'),
+                ('api_db_pool_closed_total', 'closed', 'counter', '{}'),
+                ('api_db_pool_health_check_failures_total', 'health_check_failures', 'counter', '{}'),
+            ):
+                lines.append(f'# TYPE {metric} {kind}')
+                for alias, stats in pool_stats.items():
+                    lines.append(f'{metric}{{alias="{alias}"}} {fmt.format(stats[key])}')
+
+        if self._admission is not None:
+            admission_stats = self._admission.stats()
+            for metric, key, kind, fmt in (
+                ('api_admission_in_flight', 'in_flight', 'gauge', '{}'),
+                ('api_admission_max_concurrency', 'max_concurrency', 'gauge', '{}'),
+                ('api_admission_queue_depth', 'queue_depth', 'gauge', '{}'),
+                ('api_admission_max_queue_depth', 'max_queue_depth', 'gauge', '{}'),
+                ('api_admission_clients', 'clients', 'gauge', '{}'),
+                ('api_admission_admitted_total', 'admitted', 'counter', '{}'),
+                ('api_admission_queued_total', 'queued', 'counter', '{}'),
+                ('api_admission_queue_wait_seconds_total', 'queue_wait_seconds', 'counter', '{:.6f}'),
+            ):
+                lines.append(f'# TYPE {metric} {kind}')
+                for endpoint_class, stats in admission_stats.items():
+                    lines.append(f'{metric}{{endpoint_class="{endpoint_class}"}} {fmt.format(stats[key])}')
+            lines.append('# HELP api_admission_rejections_total Requests rechazados (429/503) por clase y motivo')
+            lines.append('# TYPE api_admission_rejections_total counter')
+            for endpoint_class, stats in admission_stats.items():
+                for reason, value in stats['rejections'].items():
+                    lines.append(
+                        f'api_admission_rejections_total{{endpoint_class="{endpoint_class}",reason="{reason}"}} {value}'
+                    )
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class QueryTimer:
+    """
+    execute_wrapper que cuenta las queries del request y su duración.
+    """
+    __slots__ = ('queries', 'duration')
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.queries += 1
+
+
+def route_labels(request) -> Tuple[str, str]:
+    """
+    Retorna (view, action) del request: para los ViewSets de DRF el nombre
+    de la clase y la acción (HeroViewSet, list); para el resto, el nombre
+    de la vista. Un ViewSet puede fijar su etiqueta con `metrics_name`
+    (las versiones async reportan la misma serie que las sync).
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved', 'unresolved'
+
+    func = match.func
+    view_class = getattr(func, 'cls', None)
+    actions = getattr(func, 'actions', None)
+    if view_class is not None:
+        view = getattr(view_class, 'metrics_name', view_class.__name__)
+        if actions:
+            return view, actions.get(request.method.lower(), request.method.lower())
+        return view, request.method.lower()
+    return match.view_name or func.__name__, request.method.lower()
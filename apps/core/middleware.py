@@ -0,0 +1,190 @@
+"""
+Middlewares de la API
+
+Todos soportan sync y async: con vistas async bajo ASGI (ASYNC_VIEWS)
+un middleware solo-sync obligaría a Django a ejecutar la vista en un
+thread (async_to_sync), perdiendo la concurrencia.
+"""
+import math
+import time
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .db_router import replica_aliases, routing_scope
+from .identity_map import identity_map_scope
+from .metrics import QueryTimer, registry, route_labels
+from .query_hooks import query_hook
+from .query_log import QueryLog, get_config as get_query_log_config, report_n_plus_one
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Base para middlewares que funcionan en ambos modos.
+    Las subclases implementan __call__ (sync) y acall (async).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Mide cada request (latencia, queries, tiempo en BD, bytes y status)
+    y lo registra en apps/core/metrics.py.
+
+    Debe ir primero en MIDDLEWARE para medir también al resto de middlewares.
+    """
+
+    def call(self, request):
+        timer = QueryTimer()
+        start = perf_counter()
+        with query_hook(timer):
+            response = self.get_response(request)
+        self._observe(request, response, perf_counter() - start, timer)
+        return response
+
+    async def acall(self, request):
+        timer = QueryTimer()
+        start = perf_counter()
+        with query_hook(timer):
+            response = await self.get_response(request)
+        self._observe(request, response, perf_counter() - start, timer)
+        return response
+
+    @staticmethod
+    def _observe(request, response, duration, timer):
+        view, action = route_labels(request)
+        response_bytes = 0 if response.streaming else len(response.content)
+        registry.observe(
+            view, action, request.method, response.status_code, duration,
+            timer.queries, timer.duration, response_bytes
+        )
+
+
+class QueryLogMiddleware(SyncAndAsyncMiddleware):
+    """
+    Log de queries lentas y detección de N+1 por request
+    (ver apps/core/query_log.py). Se desactiva con QUERY_LOG['enabled'].
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.config = get_query_log_config()
+
+    def call(self, request):
+        if not self.config['enabled']:
+            return self.get_response(request)
+
+        query_log = QueryLog(self.config)
+        with query_hook(query_log):
+            response = self.get_response(request)
+        self._report(request, query_log)
+        return response
+
+    async def acall(self, request):
+        if not self.config['enabled']:
+            return await self.get_response(request)
+
+        query_log = QueryLog(self.config)
+        with query_hook(query_log):
+            response = await self.get_response(request)
+        self._report(request, query_log)
+        return response
+
+    def _report(self, request, query_log):
+        view, action = route_labels(request)
+        report_n_plus_one(query_log, request.method, request.path, view, action, self.config)
+
+
+class IdentityMapMiddleware(SyncAndAsyncMiddleware):
+    """
+    Abre un Identity Map por request (ver apps/core/identity_map.py).
+
+    Con IDENTITY_MAP_DEBUG_HEADER activo agrega la cabecera
+    X-Identity-Map-Saved-Queries con las queries que se evitaron.
+    """
+
+    def call(self, request):
+        with identity_map_scope() as identity_map:
+            response = self.get_response(request)
+        return self._add_header(response, identity_map)
+
+    async def acall(self, request):
+        with identity_map_scope() as identity_map:
+            response = await self.get_response(request)
+        return self._add_header(response, identity_map)
+
+    @staticmethod
+    def _add_header(response, identity_map):
+        if settings.IDENTITY_MAP_DEBUG_HEADER:
+            response.headers['X-Identity-Map-Saved-Queries'] = str(identity_map.hits)
+        return response
+
+
+class ReadYourWritesMiddleware(SyncAndAsyncMiddleware):
+    """
+    Read-your-writes con réplicas de lectura (ver apps/core/db_router.py).
+
+    Abre el estado de ruteo del request con el plazo de la cookie
+    DB_READ_YOUR_WRITES_COOKIE (los POST/PUT/PATCH/DELETE leen siempre
+    de `default`) y, si el request escribió, renueva la
+    cookie: los requests siguientes del cliente leen de `default` durante
+    DB_READ_YOUR_WRITES_SECONDS. Sin DB_REPLICAS no hace nada.
+    """
+
+    def call(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        with routing_scope(self._primary_until(request)) as state:
+            response = self.get_response(request)
+        return self._set_cookie(response, state)
+
+    async def acall(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        with routing_scope(self._primary_until(request)) as state:
+            response = await self.get_response(request)
+        return self._set_cookie(response, state)
+
+    @staticmethod
+    def _primary_until(request) -> float:
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            # Las validaciones de una escritura (nombre duplicado, team
+            # existente...) no pueden leer una réplica atrasada
+            return math.inf
+        try:
+            value = float(request.COOKIES.get(settings.DB_READ_YOUR_WRITES_COOKIE, 0))
+        except ValueError:
+            return 0.0
+        # Nunca más que la ventana configurada, aunque el cliente edite la cookie
+        return min(value, time.time() + settings.DB_READ_YOUR_WRITES_SECONDS)
+
+    @staticmethod
+    def _set_cookie(response, state):
+        if state.wrote:
+            response.set_cookie(
+                settings.DB_READ_YOUR_WRITES_COOKIE,
+                f'{state.primary_until:.3f}',
+                max_age=math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
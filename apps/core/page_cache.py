@@ -0,0 +1,324 @@
+"""
+Caché de páginas completas para los listados (stale-while-revalidate)
+
+Guarda la respuesta completa de una página (data + ETag/Last-Modified)
+por endpoint y parámetros de consulta. Cada entrada recuerda las
+"generaciones" de las tablas de las que depende; los Repositories
+incrementan la generación de su tabla en cada escritura.
+
+Al leer una entrada:
+- Generaciones iguales → entrada fresca, se sirve sin tocar la base de datos
+- Generaciones distintas y edad <= max_stale → se sirve la entrada vieja y
+  UN solo hilo en segundo plano recalcula la página (lock con cache.add)
+- Sin entrada, o demasiado vieja → se calcula en el request y se guarda
+
+Configuración por endpoint en settings.PAGE_CACHE:
+- timeout: segundos que la entrada vive en el backend de caché
+- max_stale: segundos máximos que se puede servir una página obsoleta (0 = nunca)
+- max_offset: solo se cachean páginas con offset menor (las primeras páginas)
+
+Los Services usan lookup(): devuelve primero los validadores (los de la
+entrada cacheada o, sin entrada, los de las queries de versión, sin traer
+filas) y la página se calcula y se guarda recién con build(). Así un 304 o
+un HEAD con la caché fría no hace el COUNT, ni la página, ni el serializer.
+
+Las vistas async usan alookup()/aget_or_compute(): el cálculo es una
+corrutina y el refresco en segundo plano es una tarea del event loop en
+lugar de un hilo.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from .cache import DeferredRepresentation, Representation
+from .conditional import Validators
+from .db_router import cache_fill_allowed, routing_scope
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_CACHE_CONFIG = {
+    'timeout': 300,
+    'max_stale': 5,
+    'max_offset': 100,
+    'refresh_timeout': 30,
+}
+
+
+# ==================== GENERACIONES POR TABLA ====================
+def _generation_key(table: str) -> str:
+    return f'generation:{table}'
+
+
+def table_generations(tables: Sequence[str], alias: str = 'default') -> Tuple[int, ...]:
+    """
+    Retorna la generación actual de cada tabla (un único get_many).
+
+    Si una generación no existe (primer uso o expulsada del backend) se
+    inicializa con time.time_ns(): siempre mayor que cualquier valor previo,
+    así una entrada vieja nunca vuelve a parecer fresca.
+    """
+    cache = caches[alias]
+    keys = [_generation_key(table) for table in tables]
+    found = cache.get_many(keys)
+
+    generations = []
+    for key in keys:
+        generation = found.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), None)
+            generation = cache.get(key)
+        generations.append(generation)
+    return tuple(generations)
+
+
+def bump_generation(*tables: str, alias: str = 'default') -> None:
+    """
+    Incrementa la generación de las tablas (llamar después de cada escritura).
+    """
+    cache = caches[alias]
+    for table in tables:
+        key = _generation_key(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # No existía: se crea (si otro proceso la creó antes, se incrementa)
+            if not cache.add(key, time.time_ns(), None):
+                cache.incr(key)
+
+
+# ==================== CACHÉ DE PÁGINAS ====================
+class PageCache:
+    """
+    Caché de páginas de un endpoint de listado.
+
+    Uso típico (en un Service):
+        return page_cache.lookup(
+            {'offset': offset, 'limit': limit},
+            lambda: ...,            # validadores (queries de versión)
+            lambda validators: ...  # construye la Representation de la página
+        )
+    """
+
+    def __init__(self, endpoint: str, tables: Sequence[str], alias: str = 'default'):
+        self.endpoint = endpoint
+        self.tables = tuple(tables)
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        config = dict(DEFAULT_PAGE_CACHE_CONFIG)
+        config.update(settings.PAGE_CACHE.get(self.endpoint, {}))
+        return config
+
+    def _key(self, params: Dict[str, Any]) -> str:
+        return f'page:{self.endpoint}:{urlencode(sorted(params.items()))}'
+
+    def _cacheable(self, params: Dict[str, Any], config: Dict[str, Any]) -> bool:
+        return settings.PAGE_CACHE_ENABLED and params.get('offset', 0) < config['max_offset']
+
+    def _cached(self, key: str, config: Dict[str, Any], refresh: Callable[[], None]) -> Optional[Representation]:
+        """
+        Entrada que se puede servir: fresca, o vieja dentro de max_stale
+        (llama a refresh() para recalcularla en segundo plano). None si no hay.
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        generations, built_at, data, validators = entry
+        if generations == table_generations(self.tables, self.alias):
+            return Representation(data, validators)
+        if time.time() - built_at <= config['max_stale']:
+            refresh()
+            return Representation(data, validators)
+        return None
+
+    def lookup(self, params: Dict[str, Any], validate: Callable[[], Validators],
+               compute: Callable[[Validators], Representation]) -> DeferredRepresentation:
+        """
+        Validadores de la página y su cálculo diferido.
+
+        Args:
+            params: Parámetros que identifican la página (ya validados/normalizados)
+            validate: Calcula los validadores (queries de versión, sin filas)
+            compute: Construye la página con esos validadores (queries + serializer)
+
+        Returns:
+            DeferredRepresentation: validadores + build(), que calcula y guarda
+            la página (o devuelve la cacheada)
+        """
+        config = self.config
+        if not self._cacheable(params, config):
+            validators = validate()
+            return DeferredRepresentation(validators, lambda: compute(validators))
+
+        key = self._key(params)
+
+        def rebuild() -> Representation:
+            return compute(validate())
+
+        cached = self._cached(key, config, lambda: self._refresh_in_background(key, rebuild, config))
+        if cached is not None:
+            return DeferredRepresentation.ready(cached)
+
+        # Generaciones antes que los validadores: si hay una escritura en
+        # medio, la entrada queda obsoleta en lugar de guardar un ETag viejo
+        generations = table_generations(self.tables, self.alias)
+        validators = validate()
+
+        def build() -> Representation:
+            representation = compute(validators)
+            self._store(key, generations, representation, config)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
+    async def alookup(self, params: Dict[str, Any], validate: Callable[[], Awaitable[Validators]],
+                      compute: Callable[[Validators], Awaitable[Representation]]) -> DeferredRepresentation:
+        """
+        Versión async de lookup(): validate(), compute() y build() son corrutinas.
+        """
+        config = self.config
+        if not self._cacheable(params, config):
+            validators = await validate()
+            return DeferredRepresentation(validators, lambda: compute(validators))
+
+        key = self._key(params)
+
+        async def rebuild() -> Representation:
+            return await compute(await validate())
+
+        cached = self._cached(key, config, lambda: self._arefresh_in_background(key, rebuild, config))
+        if cached is not None:
+            return DeferredRepresentation.aready(cached)
+
+        generations = table_generations(self.tables, self.alias)
+        validators = await validate()
+
+        async def build() -> Representation:
+            representation = await compute(validators)
+            self._store(key, generations, representation, config)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
+    def get_or_compute(self, params: Dict[str, Any], compute: Callable[[], Representation]) -> Representation:
+        """
+        Retorna la página cacheada o la calcula con compute().
+
+        Args:
+            params: Parámetros que identifican la página (ya validados/normalizados)
+            compute: Función que construye la página (queries + serializer)
+
+        Returns:
+            Representation: (data de la página, validadores ETag/Last-Modified)
+        """
+        config = self.config
+        if not self._cacheable(params, config):
+            return compute()
+
+        key = self._key(params)
+        cached = self._cached(key, config, lambda: self._refresh_in_background(key, compute, config))
+        if cached is not None:
+            return cached
+
+        return self._compute_and_store(key, compute, config)
+
+    async def aget_or_compute(self, params: Dict[str, Any],
+                              compute: Callable[[], Awaitable[Representation]]) -> Representation:
+        """
+        Versión async de get_or_compute(): compute() es una corrutina.
+
+        El backend de caché se consulta en forma sync (LocMemCache no hace
+        I/O); solo el cálculo de la página va a la base de datos.
+        """
+        config = self.config
+        if not self._cacheable(params, config):
+            return await compute()
+
+        key = self._key(params)
+        cached = self._cached(key, config, lambda: self._arefresh_in_background(key, compute, config))
+        if cached is not None:
+            return cached
+
+        generations = table_generations(self.tables, self.alias)
+        representation = await compute()
+        self._store(key, generations, representation, config)
+        return representation
+
+    def _compute_and_store(self, key: str, compute: Callable[[], Representation],
+                           config: Dict[str, Any]) -> Representation:
+        # Las generaciones se leen ANTES de calcular: si hay una escritura
+        # mientras tanto, la entrada queda marcada como obsoleta
+        generations = table_generations(self.tables, self.alias)
+        representation = compute()
+        self._store(key, generations, representation, config)
+        return representation
+
+    def _store(self, key: str, generations: Tuple[int, ...], representation: Representation,
+               config: Dict[str, Any]) -> None:
+        # Una página leída de una réplica atrasada no se guarda (ver db_router)
+        if not cache_fill_allowed():
+            return
+        self.cache.set(
+            key,
+            (generations, time.time(), dict(representation.data), representation.validators),
+            config['timeout']
+        )
+
+    def _refresh_in_background(self, key: str, compute: Callable[[], Representation],
+                               config: Dict[str, Any]) -> None:
+        # Un único refresco por página (entre hilos y entre procesos si el backend es compartido)
+        lock_key = f'{key}:refreshing'
+        if not self.cache.add(lock_key, 1, config['refresh_timeout']):
+            return
+
+        def refresh():
+            try:
+                # Estado de ruteo propio: registra si leyó de una réplica copy
+                with routing_scope():
+                    self._compute_and_store(key, compute, config)
+            except Exception:
+                logger.exception("No se pudo refrescar la página cacheada %s", key)
+            finally:
+                self.cache.delete(lock_key)
+                # Cerrar las conexiones que abrió este hilo
+                connections.close_all()
+
+        threading.Thread(target=refresh, name=f'page-cache-refresh:{self.endpoint}', daemon=True).start()
+
+    # Referencias a las tareas de refresco en curso (el event loop solo guarda
+    # referencias débiles y una tarea sin referencias puede desaparecer)
+    _background_tasks: Set[asyncio.Task] = set()
+
+    def _arefresh_in_background(self, key: str, compute: Callable[[], Awaitable[Representation]],
+                                config: Dict[str, Any]) -> None:
+        lock_key = f'{key}:refreshing'
+        if not self.cache.add(lock_key, 1, config['refresh_timeout']):
+            return
+
+        async def refresh():
+            try:
+                with routing_scope():
+                    generations = table_generations(self.tables, self.alias)
+                    self._store(key, generations, await compute(), config)
+            except Exception:
+                logger.exception("No se pudo refrescar la página cacheada %s", key)
+            finally:
+                self.cache.delete(lock_key)
+
+        # Contexto vacío, igual que un hilo nuevo: la tarea no hereda el
+        # Identity Map ni los hooks de queries del request (la tarea copia el
+        # contexto en el que se crea; create_task(context=...) es de 3.11+)
+        task = contextvars.Context().run(asyncio.get_running_loop().create_task, refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
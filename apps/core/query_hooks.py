@@ -0,0 +1,57 @@
+"""
+Hooks de queries por contexto
+
+connection.execute_wrapper() instala un wrapper en la conexión del thread
+actual. Con vistas async eso no alcanza: el ORM async ejecuta las queries
+en otro thread (sync_to_async) con otra conexión.
+
+Este módulo instala un único execute_wrapper permanente en cada conexión
+(al crearse, vía la señal connection_created) que delega en los hooks del
+contexto actual (ContextVar). Los ContextVar se copian a los threads de
+sync_to_async, así que un hook abierto en un middleware async ve también
+las queries que el ORM ejecuta en esos threads, en cualquier alias.
+
+Uso:
+    with query_hook(timer):
+        response = get_response(request)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Callable, Tuple
+
+_hooks: ContextVar[Tuple[Callable, ...]] = ContextVar('query_hooks', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    hooks = _hooks.get()
+    if not hooks:
+        return execute(sql, params, many, context)
+
+    # Igual que Django con execute_wrappers: el primer hook queda más afuera
+    for hook in reversed(hooks):
+        execute = partial(hook, execute)
+    return execute(sql, params, many, context)
+
+
+def install(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: agrega _dispatch a la conexión una sola vez.
+
+    Se inserta al principio de la lista: connection.execute_wrapper() quita
+    el último elemento al salir y no debe llevarse este.
+    """
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+@contextmanager
+def query_hook(hook: Callable):
+    """
+    Activa `hook` (firma de execute_wrapper) para las queries del contexto actual.
+    """
+    token = _hooks.set(_hooks.get() + (hook,))
+    try:
+        yield hook
+    finally:
+        _hooks.reset(token)
@@ -0,0 +1,231 @@
+"""
+Log de queries lentas y detección de N+1
+
+QueryLog es un execute_wrapper que normaliza cada SQL en un fingerprint
+(literales, placeholders y listas IN reemplazados) y, dentro de un request:
+- registra en el logger apps.core.query_log las queries que superan
+  QUERY_LOG['slow_ms'], con el método del repositorio que las originó
+  (por ejemplo HeroRepository.get_hero_by_id);
+- marca como N+1 los fingerprints que se repiten QUERY_LOG['n_plus_one_threshold']
+  veces o más (el caso típico: Hero.__str__ cargando team en un loop) y
+  guarda una muestra en un archivo JSONL rotativo para analizarla offline.
+
+QueryLogMiddleware lo activa por request (ver apps/core/middleware.py).
+Con vistas async las queries corren en los threads del ORM async: el
+método del repositorio no aparece en la pila y se reporta como '-'.
+"""
+import json
+import logging
+import os
+import random
+import re
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+APPS_DIR = os.path.join(str(settings.BASE_DIR), 'apps') + os.sep
+CORE_DIR = os.path.join(APPS_DIR, 'core') + os.sep
+
+DEFAULT_QUERY_LOG_CONFIG = {
+    'enabled': False,
+    'slow_ms': 100,
+    'n_plus_one_threshold': 5,
+    'sample_rate': 1.0,
+    'samples_file': os.path.join(str(settings.BASE_DIR), 'logs', 'query_samples.jsonl'),
+    'max_bytes': 5 * 1024 * 1024,
+    'backup_count': 3,
+}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+
+def get_config() -> dict:
+    return {**DEFAULT_QUERY_LOG_CONFIG, **getattr(settings, 'QUERY_LOG', {})}
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    Normaliza un SQL: literales y placeholders pasan a ?, las listas IN
+    a IN (...) y los espacios se colapsan.
+    """
+    normalized = _LITERALS.sub('?', sql.replace('%s', '?'))
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _SPACES.sub(' ', normalized).strip()
+
+
+def code_name(frame) -> str:
+    """
+    Nombre calificado de la función de un frame (Clase.metodo).
+
+    code.co_qualname es de Python 3.11+: antes se arma con co_name y la
+    clase de self/cls o, en los @staticmethod (los métodos de los
+    repositorios), la clase del módulo que define esa función.
+    """
+    qualname = getattr(frame.f_code, 'co_qualname', None)
+    return qualname if qualname is not None else owner_name(frame)
+
+
+def owner_name(frame) -> str:
+    """
+    Clase.metodo de un frame sin co_qualname (ver code_name()).
+    """
+    code = frame.f_code
+    owner = frame.f_locals.get('self', frame.f_locals.get('cls'))
+    if owner is not None:
+        owner_class = owner if isinstance(owner, type) else type(owner)
+        return f'{owner_class.__name__}.{code.co_name}'
+    for value in list(frame.f_globals.values()):
+        if isinstance(value, type):
+            function = vars(value).get(code.co_name)
+            if getattr(getattr(function, '__func__', function), '__code__', None) is code:
+                return f'{value.__name__}.{code.co_name}'
+    return code.co_name
+
+
+def query_origin() -> Tuple[str, Optional[str]]:
+    """
+    Retorna (site, repository_method) de la query actual:
+    - site: el frame más interno de apps/ (sin apps/core), p.ej.
+      apps/heroes/models.py:90 in Hero.__str__
+    - repository_method: el método de repositorio más interno en la pila,
+      p.ej. HeroRepository.get_all_heroes (None si no hay ninguno)
+    """
+    site = None
+    repository_method = None
+    frame = sys._getframe(1)
+    while frame is not None and repository_method is None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPS_DIR) and not filename.startswith(CORE_DIR):
+            if site is None:
+                site = (
+                    f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} '
+                    f'in {code_name(frame)}'
+                )
+            if os.path.basename(filename) == 'repository.py':
+                repository_method = code_name(frame)
+        frame = frame.f_back
+    return site or '<fuera de apps/>', repository_method
+
+
+class FingerprintStats:
+    """
+    Acumuladores de un fingerprint dentro de un request.
+    """
+    __slots__ = ('sql', 'count', 'duration', 'site', 'repository_method')
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.duration = 0.0
+        self.site = None
+        self.repository_method = None
+
+
+class QueryLog:
+    """
+    execute_wrapper que agrupa las queries de un request por fingerprint.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or get_config()
+        self.slow_seconds = config['slow_ms'] / 1000
+        self.n_plus_one_threshold = config['n_plus_one_threshold']
+        self.fingerprints: Dict[str, FingerprintStats] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            key = fingerprint(sql)
+            stats = self.fingerprints.get(key)
+            if stats is None:
+                stats = self.fingerprints[key] = FingerprintStats(sql)
+            stats.count += 1
+            stats.duration += duration
+
+            # La pila solo se recorre para queries lentas o repetidas
+            if duration >= self.slow_seconds:
+                site, repository_method = query_origin()
+                logger.warning(
+                    'Query lenta (%.1f ms) en %s [%s]: %s',
+                    duration * 1000, repository_method or '-', site, key
+                )
+            if stats.count == 2:
+                stats.site, stats.repository_method = query_origin()
+
+    def n_plus_one(self) -> List[Tuple[str, FingerprintStats]]:
+        """
+        Fingerprints repetidos al menos n_plus_one_threshold veces.
+        """
+        return [
+            (key, stats) for key, stats in self.fingerprints.items()
+            if stats.count >= self.n_plus_one_threshold
+        ]
+
+
+_samples_logger = None
+
+
+def _get_samples_logger(config: dict) -> logging.Logger:
+    """
+    Logger con RotatingFileHandler sobre QUERY_LOG['samples_file'] (una línea JSON por muestra).
+    """
+    global _samples_logger
+    if _samples_logger is None:
+        os.makedirs(os.path.dirname(config['samples_file']), exist_ok=True)
+        handler = RotatingFileHandler(
+            config['samples_file'],
+            maxBytes=config['max_bytes'],
+            backupCount=config['backup_count'],
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        samples_logger = logging.getLogger('apps.core.query_log.samples')
+        samples_logger.setLevel(logging.INFO)
+        samples_logger.propagate = False
+        samples_logger.addHandler(handler)
+        _samples_logger = samples_logger
+    return _samples_logger
+
+
+def report_n_plus_one(query_log: QueryLog, method: str, path: str, view: str, action: str,
+                      config: Optional[dict] = None) -> None:
+    """
+    Registra los N+1 de un request y guarda una muestra en el JSONL.
+    """
+    suspects = query_log.n_plus_one()
+    if not suspects:
+        return
+
+    config = config or get_config()
+    for key, stats in suspects:
+        logger.warning(
+            'Posible N+1 en %s %s: %d queries iguales desde %s [%s]: %s',
+            method, path, stats.count, stats.repository_method or '-', stats.site, key
+        )
+        if random.random() >= config['sample_rate']:
+            continue
+        _get_samples_logger(config).info(json.dumps({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'method': method,
+            'path': path,
+            'view': view,
+            'action': action,
+            'fingerprint': key,
+            'count': stats.count,
+            'duration_ms': round(stats.duration * 1000, 3),
+            'site': stats.site,
+            'repository_method': stats.repository_method,
+            'sql': stats.sql,
+        }, ensure_ascii=False))
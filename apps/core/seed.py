@@ -0,0 +1,248 @@
+"""
+Generador determinístico de datos para benchmarks
+
+Genera teams y heroes reproducibles (misma semilla -> mismos datos) con
+distribuciones parecidas a las de producción:
+- tamaño de los teams sesgado (pocos teams grandes, muchos chicos),
+  con pesos 1/rango^team_skew;
+- nivel con distribución Zipf sobre 1..100 (los niveles bajos son los
+  más frecuentes), exponente nivel_skew;
+- descripcion de largo variable (log-normal, ~10% vacías).
+
+Inserta con executemany en lotes dentro de una sola transacción. En SQLite
+además borra los índices secundarios de heroes/teams antes de insertar y
+los vuelve a crear al final (un solo ordenamiento en vez de actualizar el
+índice fila por fila), y baja synchronous a OFF mientras dura la carga.
+
+Lo usan `python manage.py seed` y `python manage.py loadtest`.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from time import perf_counter
+from typing import Callable, List, NamedTuple, Optional
+from django.db import connections, transaction
+from apps.heroes.models import Hero
+from apps.teams.models import Team
+from .page_cache import bump_generation
+
+TEAM_ADJECTIVES = [
+    'Justice', 'Cosmic', 'Shadow', 'Iron', 'Crimson', 'Galactic', 'Silent', 'Storm',
+    'Golden', 'Midnight', 'Atomic', 'Savage', 'Mystic', 'Quantum', 'Solar', 'Frozen',
+]
+TEAM_NOUNS = [
+    'League', 'Avengers', 'Guardians', 'Legion', 'Squad', 'Society', 'Patrol', 'Force',
+    'Alliance', 'Titans', 'Knights', 'Sentinels', 'Order', 'Corps', 'Watch', 'Syndicate',
+]
+HERO_PREFIXES = [
+    'Captain', 'Doctor', 'Super', 'Black', 'Green', 'Silver', 'Night', 'Star', 'Dark',
+    'Red', 'Blue', 'Wonder', 'Iron', 'Thunder', 'Phantom', 'Mega',
+]
+HERO_SUFFIXES = [
+    'Man', 'Woman', 'Hawk', 'Widow', 'Lantern', 'Arrow', 'Bolt', 'Falcon', 'Storm',
+    'Knight', 'Panther', 'Fury', 'Spectre', 'Wing', 'Blade', 'Flash',
+]
+POWERS = [
+    'Super fuerza', 'Vuelo', 'Velocidad', 'Telepatía', 'Invisibilidad', 'Telequinesis',
+    'Regeneración', 'Control del clima', 'Rayos láser', 'Magia', 'Tecnología', 'Artes marciales',
+]
+WORDS = (
+    'héroe equipo ciudad poder misión rescate villano noche justicia escudo energía '
+    'guardián leyenda batalla origen secreto entrenamiento laboratorio galaxia portal '
+    'armadura velocidad memoria alianza amenaza refugio planeta sombra tormenta'
+).split()
+
+DESCRIPTION_POOL_SIZE = 1 << 16
+TIMESTAMP_POOL_SIZE = 4096
+
+
+class SeedResult(NamedTuple):
+    teams: int
+    heroes: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.teams + self.heroes) / self.seconds if self.seconds else 0.0
+
+
+def _rank_cum_weights(size: int, exponent: float) -> List[float]:
+    """
+    Pesos acumulados 1/rango^exponente para random.choices(cum_weights=...).
+    """
+    return list(accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def _description_pool(rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < DESCRIPTION_POOL_SIZE:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+def _timestamp_pool(rng: random.Random, connection) -> list:
+    """
+    Fechas de los últimos 365 días ya adaptadas al formato de la base de datos.
+    """
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    adapt = connection.ops.adapt_datetimefield_value
+    return [
+        adapt(base + timedelta(seconds=rng.randrange(365 * 24 * 3600), microseconds=rng.randrange(10 ** 6)))
+        for _ in range(TIMESTAMP_POOL_SIZE)
+    ]
+
+
+@contextmanager
+def deferred_indexes(connection, tables):
+    """
+    En SQLite borra los índices secundarios de `tables` y los recrea al salir.
+    En otros motores no hace nada.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        placeholders = ', '.join(['%s'] * len(tables))
+        cursor.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({placeholders})",
+            list(tables)
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+
+@contextmanager
+def _fast_sqlite_writes(connection):
+    """
+    PRAGMA synchronous = OFF mientras dura la carga (solo SQLite y fuera de
+    una transacción: SQLite no permite cambiarlo dentro de una).
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        previous = cursor.fetchone()[0]
+        cursor.execute('PRAGMA synchronous = OFF')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA synchronous = {int(previous)}')
+
+
+def generate(teams: int, heroes: int, seed: int = 42, batch_size: int = 20000,
+             team_skew: float = 1.0, nivel_skew: float = 1.1, using: str = 'default',
+             progress: Optional[Callable[[int, int], None]] = None) -> SeedResult:
+    """
+    Inserta `teams` teams y `heroes` heroes generados con `seed`.
+
+    progress(insertados, total) se llama después de cada lote de heroes.
+    """
+    if teams < 1 and heroes > 0:
+        raise ValueError('Se necesita al menos un team para generar heroes')
+
+    rng = random.Random(seed)
+    connection = connections[using]
+    team_table = connection.ops.quote_name(Team._meta.db_table)
+    hero_table = connection.ops.quote_name(Hero._meta.db_table)
+    descriptions = _description_pool(rng)
+    timestamps = _timestamp_pool(rng, connection)
+    start = perf_counter()
+
+    with _fast_sqlite_writes(connection), transaction.atomic(using=using), \
+            deferred_indexes(connection, [Team._meta.db_table, Hero._meta.db_table]):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {team_table}')
+            last_team_id = cursor.fetchone()[0]
+
+            team_rows = []
+            for i in range(teams):
+                offset = rng.randrange(DESCRIPTION_POOL_SIZE - 200)
+                created = rng.choice(timestamps)
+                team_rows.append((
+                    f'{rng.choice(TEAM_ADJECTIVES)} {rng.choice(TEAM_NOUNS)} {last_team_id + i + 1}',
+                    descriptions[offset:offset + rng.randint(20, 200)],
+                    created,
+                    created,
+                ))
+            for batch_start in range(0, len(team_rows), batch_size):
+                cursor.executemany(
+                    f'INSERT INTO {team_table} (nombre, descripcion, fecha_creacion, fecha_actualizacion) '
+                    f'VALUES (%s, %s, %s, %s)',
+                    team_rows[batch_start:batch_start + batch_size]
+                )
+
+            cursor.execute(f'SELECT id FROM {team_table} WHERE id > %s ORDER BY id', [last_team_id])
+            team_ids = [row[0] for row in cursor.fetchall()]
+            # Tamaños sesgados: el orden de los pesos se mezcla para no correlacionarlo con el ID
+            rng.shuffle(team_ids)
+            team_weights = _rank_cum_weights(len(team_ids), team_skew)
+            levels = range(1, 101)
+            level_weights = _rank_cum_weights(100, nivel_skew)
+
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {hero_table}')
+            next_hero = cursor.fetchone()[0] + 1
+
+            inserted = 0
+            while inserted < heroes:
+                size = min(batch_size, heroes - inserted)
+                batch_teams = rng.choices(team_ids, cum_weights=team_weights, k=size)
+                batch_levels = rng.choices(levels, cum_weights=level_weights, k=size)
+                rows = []
+                for team_id, nivel in zip(batch_teams, batch_levels):
+                    length = min(int(rng.lognormvariate(4.5, 0.6)), 1000)
+                    offset = rng.randrange(DESCRIPTION_POOL_SIZE - 1000)
+                    created = timestamps[rng.randrange(TIMESTAMP_POOL_SIZE)]
+                    rows.append((
+                        f'{rng.choice(HERO_PREFIXES)} {rng.choice(HERO_SUFFIXES)} {next_hero}',
+                        descriptions[offset:offset + length] if rng.random() >= 0.1 else None,
+                        rng.choice(POWERS),
+                        nivel,
+                        team_id,
+                        created,
+                        created,
+                    ))
+                    next_hero += 1
+                cursor.executemany(
+                    f'INSERT INTO {hero_table} '
+                    f'(nombre, descripcion, poder_principal, nivel, team_id, fecha_creacion, fecha_actualizacion) '
+                    f'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+                    rows
+                )
+                inserted += size
+                if progress:
+                    progress(inserted, heroes)
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    # Las páginas cacheadas (si la caché es compartida) quedan obsoletas
+    bump_generation(Team._meta.db_table, Hero._meta.db_table)
+    return SeedResult(teams=teams, heroes=heroes, seconds=perf_counter() - start)
+
+
+def clear(using: str = 'default') -> None:
+    """
+    Borra todos los heroes y teams.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {connection.ops.quote_name(Hero._meta.db_table)}')
+        cursor.execute(f'DELETE FROM {connection.ops.quote_name(Team._meta.db_table)}')
+    bump_generation(Team._meta.db_table, Hero._meta.db_table)
@@ -0,0 +1,95 @@
+"""
+Perfil de PRAGMAs de SQLite aplicado a cada conexión nueva
+
+Con los valores de fábrica (journal DELETE, synchronous=FULL, caché de
+~2 MB y sin mmap) cada escritura bloquea a los lectores y hace fsync en
+cada commit. El perfil 'production' de settings.SQLITE_PROFILES:
+- journal_mode=WAL: los lectores no esperan al escritor (y viceversa)
+- synchronous=NORMAL: en WAL solo hay fsync en los checkpoints; un corte
+  de luz puede perder las últimas transacciones, nunca corromper la base
+- cache_size (negativo = KiB), mmap_size (bytes) y temp_store=MEMORY
+- busy_timeout (ms): cuánto espera un escritor a otro antes de fallar
+  con "database is locked"
+
+apply_profile() recibe la señal connection_created: con el pool de
+conexiones también corre al prestar una conexión ya abierta (son PRAGMAs
+locales, no llegan a disco salvo el primer cambio a WAL). Se ejecutan
+sobre la conexión DB-API, así que no pasan por los hooks de queries ni
+cuentan en las métricas.
+
+active_pragmas() lee los valores efectivos (check_db_connection.py,
+manage.py bench_sqlite_profiles).
+"""
+import logging
+from typing import Dict, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Orden de aplicación: busy_timeout antes de journal_mode, que necesita
+# un lock exclusivo la primera vez
+PRAGMAS = ('busy_timeout', 'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')
+
+# SQLite devuelve estos PRAGMAs como número
+_NAMED_VALUES = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+}
+
+
+def get_profile(name: Optional[str] = None) -> Dict[str, object]:
+    """
+    Retorna los PRAGMAs del perfil `name` (por defecto settings.SQLITE_PROFILE).
+    """
+    name = name or getattr(settings, 'SQLITE_PROFILE', 'stock')
+    profiles = getattr(settings, 'SQLITE_PROFILES', {})
+    if name not in profiles:
+        raise ValueError(f"Perfil de SQLite desconocido: '{name}' (disponibles: {', '.join(profiles) or '-'})")
+
+    profile = profiles[name]
+    unknown = set(profile) - set(PRAGMAS)
+    if unknown:
+        raise ValueError(f"PRAGMAs no soportados en el perfil '{name}': {', '.join(sorted(unknown))}")
+    return profile
+
+
+def apply_pragmas(raw_connection, pragmas: Dict[str, object]) -> None:
+    """
+    Ejecuta los PRAGMAs sobre una conexión sqlite3. Si uno falla (por
+    ejemplo WAL sobre una base de solo lectura) se registra y se sigue.
+    """
+    for name in PRAGMAS:
+        if name not in pragmas:
+            continue
+        try:
+            raw_connection.execute(f'PRAGMA {name} = {pragmas[name]}').fetchall()
+        except Exception as e:
+            logger.warning('No se pudo aplicar PRAGMA %s = %s: %s', name, pragmas[name], e)
+
+
+def apply_profile(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: aplica settings.SQLITE_PROFILE a las conexiones SQLite.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_profile()
+    if 'mode=ro' in str(connection.settings_dict['NAME']):
+        # Réplica de solo lectura: el journal_mode lo fija quien escribe
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    if pragmas:
+        apply_pragmas(connection.connection, pragmas)
+
+
+def active_pragmas(connection) -> Dict[str, object]:
+    """
+    Valores efectivos de los PRAGMAs del perfil en una conexión de Django (SQLite).
+    """
+    connection.ensure_connection()
+    values = {}
+    for name in PRAGMAS:
+        value = connection.connection.execute(f'PRAGMA {name}').fetchone()[0]
+        if name == 'journal_mode':
+            value = value.upper()
+        values[name] = _NAMED_VALUES.get(name, {}).get(value, value)
+    return values
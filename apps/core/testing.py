@@ -0,0 +1,112 @@
+"""
+Utilidades para tests
+
+QueryBudgetMixin agrega assertMaxQueries(), que falla si un bloque ejecuta
+más queries que las permitidas. El mensaje de error muestra el SQL
+ejecutado agrupado por el punto del código de apps/ que lo originó
+(por ejemplo apps/heroes/repository.py:120 in get_all_heroes), para
+encontrar rápido un select_related perdido o un N+1 nuevo.
+
+Las queries se capturan con query_hook (apps/core/query_hooks.py), así
+también se cuentan las del ORM async, que corren en otros threads.
+
+TestRunner (settings.TEST_RUNNER) corre la suite con el control de
+admisión desactivado también en el perfil production: los tests hacen
+ráfagas de requests desde la misma IP. Los tests de apps/core/admission.py
+lo activan con override_settings(ADMISSION=...).
+"""
+import os
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from .query_hooks import query_hook
+
+APPS_DIR = os.path.join(str(settings.BASE_DIR), 'apps') + os.sep
+CORE_DIR = os.path.join(APPS_DIR, 'core') + os.sep
+
+
+def call_site() -> str:
+    """
+    Retorna el frame más interno de apps/ (sin contar apps/core ni los tests)
+    que llevó a ejecutar la query actual.
+    """
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if not filename.startswith(APPS_DIR) or filename.startswith(CORE_DIR):
+            continue
+        if os.path.basename(filename).startswith('tests'):
+            continue
+        return f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.lineno} in {frame.name}'
+    return '<fuera de apps/>'
+
+
+class QueryRecorder:
+    """
+    execute_wrapper que guarda cada SQL junto con su call site.
+    """
+
+    def __init__(self, using: str = None):
+        self.using = using
+        self.queries: List[Tuple[str, str]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.using is None or context['connection'].alias == self.using:
+            self.queries.append((call_site(), sql))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def grouped(self) -> Dict[str, List[str]]:
+        """
+        SQL agrupado por call site (en orden de aparición).
+        """
+        groups: Dict[str, List[str]] = OrderedDict()
+        for site, sql in self.queries:
+            groups.setdefault(site, []).append(sql)
+        return groups
+
+    def report(self) -> str:
+        lines = []
+        for site, statements in self.grouped().items():
+            lines.append(f'  {site} ({len(statements)} queries)')
+            for sql in statements:
+                lines.append(f'      {sql}')
+        return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para TestCase con presupuestos de queries.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, max_queries: int, label: str = '', using: str = 'default'):
+        recorder = QueryRecorder(using)
+        with query_hook(recorder):
+            yield recorder
+
+        if len(recorder) > max_queries:
+            self.fail(
+                f'{label or "Bloque"}: {len(recorder)} queries ejecutadas, '
+                f'presupuesto {max_queries}\n{recorder.report()}'
+            )
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner con ADMISSION['enabled'] en False.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._admission = override_settings(ADMISSION={**settings.ADMISSION, 'enabled': False})
+        self._admission.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._admission.disable()
+        super().teardown_test_environment(**kwargs)
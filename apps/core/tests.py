@@ -0,0 +1,1030 @@
+"""
+Tests de métricas, del log de queries y de las utilidades de apps/core
+"""
+import asyncio
+import contextvars
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import Resolver404, get_resolver, include, path, re_path, reverse
+from django.urls.resolvers import RegexPattern, URLResolver
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from apps.heroes.models import Hero
+from apps.heroes.services import HeroService
+from apps.teams.models import Team
+from config.routers import api_router, get_api_router
+from config.views import hola_mundo, metrics
+from . import admission, api_docs, concurrency, group_commit, query_log, seed
+from .benchmark import compare
+from .cache import Representation, RepresentationCache
+from .concurrency import arun_concurrently, run_concurrently
+from .db_backends.sqlite3.base import DatabaseWrapper as PooledSQLiteWrapper
+from .db_pool import ConnectionPool, PoolTimeout
+from .db_router import ReadReplicaRouter, cache_fill_allowed, copy_sqlite_database, routing_scope
+from .loadtest import parse_mix, percentile
+from .metrics import registry
+from .middleware import ReadYourWritesMiddleware
+from .page_cache import PageCache, bump_generation
+from .query_log import QueryLog, fingerprint, report_n_plus_one
+from .sqlite_profile import active_pragmas, get_profile
+from .url_dispatch import CompiledRouteResolver, compiled_path
+
+# URLconf con los ViewSets sync (run_concurrently) para ParallelReadsTests
+urlpatterns = [path('api/', include(get_api_router(async_views=False).urls))]
+
+
+class MetricsTests(TestCase):
+    """
+    /api/metrics publica las métricas por acción de los ViewSets
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        registry.reset()
+
+    def test_records_viewset_actions(self):
+        team = Team.objects.create(nombre="Justice League", descripcion="Los más poderosos")
+        self.client.get(reverse('team-detail', args=[team.id]))
+        self.client.get(reverse('team-detail', args=[team.id + 1000]))
+
+        body = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('api_requests_total{view="TeamViewSet",action="retrieve",method="GET",status="200"} 1', body)
+        self.assertIn('api_requests_total{view="TeamViewSet",action="retrieve",method="GET",status="404"} 1', body)
+        self.assertIn('api_request_duration_seconds_count{view="TeamViewSet",action="retrieve"} 2', body)
+        self.assertIn('api_db_queries_total{view="TeamViewSet",action="retrieve"} 2', body)
+        self.assertIn('api_cache_hits_total{cache="team_lookup"}', body)
+
+    @override_settings(ROOT_URLCONF='apps.teams.tests')
+    def test_async_viewsets_share_the_label(self):
+        team = Team.objects.create(nombre="Justice League", descripcion="Los más poderosos")
+        self.client.get(f'/api/teams/{team.id}/')
+
+        body = registry.render()
+
+        self.assertIn('api_requests_total{view="TeamViewSet",action="retrieve",method="GET",status="200"} 1', body)
+        self.assertNotIn('AsyncTeamViewSet', body)
+
+    def test_content_type(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+
+class QueryLogTests(TestCase):
+    """
+    Fingerprints de SQL y detección de N+1
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        teams = Team.objects.bulk_create([
+            Team(nombre=f"Team {i}", descripcion="Descripción") for i in range(6)
+        ])
+        Hero.objects.bulk_create([
+            Hero(nombre=f"Hero {i}", nivel=10, team=team) for i, team in enumerate(teams)
+        ])
+
+    def test_fingerprint_normalizes_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM heroes WHERE id IN (%s, %s, %s) AND nombre = 'Bruce'  LIMIT 21"),
+            fingerprint("SELECT * FROM heroes WHERE id IN (%s) AND nombre = 'Clark' LIMIT 5"),
+        )
+
+    def test_detects_n_plus_one_and_samples_it(self):
+        log = QueryLog({**query_log.get_config(), 'n_plus_one_threshold': 5})
+        with connection.execute_wrapper(log):
+            [str(hero) for hero in Hero.objects.all()]
+
+        suspects = log.n_plus_one()
+        self.assertEqual(len(suspects), 1)
+        key, stats = suspects[0]
+        self.assertEqual(stats.count, 6)
+        self.assertIn('FROM "teams"', key)
+        self.assertIn('in Hero.__str__', stats.site)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {**query_log.get_config(), 'samples_file': os.path.join(tmp, 'samples.jsonl'), 'sample_rate': 1.0}
+            query_log._samples_logger = None
+            try:
+                with self.assertLogs('apps.core.query_log', 'WARNING'):
+                    report_n_plus_one(log, 'GET', '/api/heroes/', 'HeroViewSet', 'list', config)
+                with open(config['samples_file'], encoding='utf-8') as samples:
+                    sample = json.loads(samples.readline())
+            finally:
+                for handler in query_log._samples_logger.handlers:
+                    handler.close()
+                query_log._samples_logger.handlers.clear()
+                query_log._samples_logger = None
+
+        self.assertEqual(sample['count'], 6)
+        self.assertEqual(sample['fingerprint'], key)
+
+    def test_owner_name_without_co_qualname(self):
+        """En Python < 3.11 el nombre se arma igual que co_qualname"""
+        for frame in (FrameOwner().method(), FrameOwner.class_method(), FrameOwner.static_method()):
+            with self.subTest(name=frame.f_code.co_name):
+                self.assertEqual(query_log.owner_name(frame), frame.f_code.co_qualname)
+
+
+class FrameOwner:
+    def method(self):
+        return sys._getframe()
+
+    @classmethod
+    def class_method(cls):
+        return sys._getframe()
+
+    @staticmethod
+    def static_method():
+        return sys._getframe()
+
+
+class LoadtestTests(SimpleTestCase):
+    """
+    Utilidades del comando loadtest
+    """
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('heroes.list=3, heroes.create'), {'heroes.list': 3, 'heroes.create': 1})
+        with self.assertRaises(ValueError):
+            parse_mix('heroes.unknown=1')
+        with self.assertRaises(ValueError):
+            parse_mix('heroes.list=0')
+
+    def test_percentile_nearest_rank(self):
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.05)
+        self.assertEqual(percentile(values, 99), 0.099)
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class SeedTests(TestCase):
+    """
+    Generador de datos de manage.py seed
+    """
+
+    def _snapshot(self):
+        return list(Hero.objects.order_by('id').values_list('nivel', 'descripcion', 'poder_principal'))
+
+    def test_same_seed_generates_same_data(self):
+        result = seed.generate(teams=5, heroes=300, seed=7, batch_size=100)
+        self.assertEqual((result.teams, result.heroes), (5, 300))
+        self.assertEqual(Hero.objects.count(), 300)
+        first = self._snapshot()
+
+        seed.clear()
+        seed.generate(teams=5, heroes=300, seed=7, batch_size=100)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_indexes_are_restored(self):
+        with connection.cursor() as cursor:
+            indexes = set(connection.introspection.get_constraints(cursor, 'heroes'))
+        seed.generate(teams=2, heroes=10)
+        with connection.cursor() as cursor:
+            self.assertEqual(set(connection.introspection.get_constraints(cursor, 'heroes')), indexes)
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    """
+    Detección de regresiones contra la baseline de los benchmarks
+    """
+
+    def test_flags_only_regressions_above_threshold(self):
+        baseline = {
+            'A[1]': {'normalized_time': 1.0, 'peak_bytes_per_row': 100},
+            'B[1]': {'normalized_time': 1.0, 'peak_bytes_per_row': 100},
+        }
+        results = {
+            'A[1]': {'normalized_time': 1.2, 'peak_bytes_per_row': 90},
+            'B[1]': {'normalized_time': 0.9, 'peak_bytes_per_row': 140},
+            'C[1]': {'normalized_time': 9.0, 'peak_bytes_per_row': 900},
+        }
+        regressions = compare(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('B[1] peak_bytes_per_row'))
+
+
+@override_settings(PARALLEL_READS={'enabled': True, 'max_workers': 4})
+class ConcurrencyTests(SimpleTestCase):
+    """
+    run_concurrently/arun_concurrently: orden fijo de resultados y errores
+    """
+
+    def test_results_keep_declared_order(self):
+        def slow():
+            time.sleep(0.05)
+            return 'slow'
+
+        self.assertEqual(run_concurrently(slow, lambda: 'fast'), ['slow', 'fast'])
+
+    def test_first_declared_error_wins(self):
+        def slow_error():
+            time.sleep(0.05)
+            raise KeyError('primera')
+
+        def fast_error():
+            raise ValueError('segunda')
+
+        with self.assertRaises(KeyError):
+            run_concurrently(slow_error, fast_error)
+
+    def test_async_first_declared_error_wins(self):
+        async def slow_error():
+            await asyncio.sleep(0.05)
+            raise KeyError('primera')
+
+        async def fast():
+            return 'fast'
+
+        async def fast_error():
+            raise ValueError('segunda')
+
+        with self.assertRaises(KeyError):
+            asyncio.run(arun_concurrently(slow_error, fast, fast_error))
+        self.assertEqual(asyncio.run(arun_concurrently(fast, fast)), ['fast', 'fast'])
+
+
+@override_settings(PARALLEL_READS={'enabled': True, 'max_workers': 4})
+class ParallelReadsTests(TransactionTestCase):
+    """
+    Con datos confirmados las lecturas usan el pool (una conexión por thread)
+    y la respuesta es la misma que en secuencia
+    """
+    # Con DB_REPLICAS las lecturas van a las réplicas (mirrors de default en tests)
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.team = Team.objects.create(nombre="Justice League", descripcion="Los más poderosos")
+        Hero.objects.bulk_create([Hero(nombre=f"Hero {i}", nivel=10, team=self.team) for i in range(15)])
+
+    @override_settings(ROOT_URLCONF='apps.core.tests')
+    def test_heroes_by_team(self):
+        with mock.patch.object(concurrency, '_run_in_worker', wraps=concurrency._run_in_worker) as worker:
+            response = APIClient().get(reverse('hero-get-by-team', args=[self.team.id]), {'limit': 10})
+        # team + COUNT + página pasan por el pool de threads
+        self.assertGreaterEqual(worker.call_count, 3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 15)
+        self.assertEqual(len(response.data['heroes']), 10)
+        self.assertEqual(response.data['team_info']['id'], self.team.id)
+
+        response = APIClient().get(reverse('hero-get-by-team', args=[self.team.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_create_hero_validations_keep_order(self):
+        data = {'nombre': 'Hero 1', 'team_id': self.team.id}
+        response = APIClient().post(reverse('hero-list'), data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nombre', response.data)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """
+    ConnectionPool: reutilización, límite, health check, recycle y métricas
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'pool.sqlite3')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def connect(self):
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(max_size=2)
+        raw = pool.acquire(self.connect)
+        pool.release(raw)
+        self.assertIs(pool.acquire(self.connect), raw)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['checkouts'], 2)
+        self.assertEqual(pool.stats()['in_use'], 1)
+
+    def test_min_size_opens_on_first_checkout(self):
+        pool = ConnectionPool(min_size=2, max_size=3)
+        pool.acquire(self.connect)
+        self.assertEqual(pool.stats()['created'], 2)
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_full_pool_times_out(self):
+        pool = ConnectionPool(max_size=1, checkout_timeout=0.05)
+        pool.acquire(self.connect)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(self.connect)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        self.assertGreaterEqual(pool.stats()['max_checkout_wait_seconds'], 0)
+
+    def test_health_check_discards_broken_connection(self):
+        pool = ConnectionPool(max_size=1)
+        raw = pool.acquire(self.connect)
+        pool.release(raw)
+        raw.close()  # por ejemplo, el servidor cortó la conexión
+
+        replacement = pool.acquire(self.connect)
+        self.assertIsNot(replacement, raw)
+        replacement.execute('SELECT 1')
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+        self.assertEqual(pool.stats()['closed'], 1)
+
+    def test_recycle_closes_old_connections(self):
+        pool = ConnectionPool(max_size=1, recycle=0)
+        raw = pool.acquire(self.connect)
+        time.sleep(0.01)
+        pool.release(raw)
+        self.assertEqual(pool.stats()['closed'], 1)
+        self.assertIsNot(pool.acquire(self.connect), raw)
+
+    def test_django_wrapper_returns_connections_to_pool(self):
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': self.path,
+            'POOL': {'max_size': 1, 'checkout_timeout': 0.05},
+        }
+        first, second = PooledSQLiteWrapper(settings_dict, 'pool-a'), PooledSQLiteWrapper(settings_dict, 'pool-a')
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        first.ensure_connection()
+        raw = first.connection
+        with self.assertRaises(PoolTimeout):
+            second.ensure_connection()
+
+        first.close()
+        with second.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIs(second.connection, raw)
+        second.close()
+
+        registry_body = registry.render()
+        self.assertIn('api_db_pool_checkouts_total{alias="pool-a"} 2', registry_body)
+        self.assertIn('api_db_pool_timeouts_total{alias="pool-a"} 1', registry_body)
+        self.assertIn('api_db_pool_in_use{alias="pool-a"} 0', registry_body)
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    """
+    Los PRAGMAs de settings.SQLITE_PROFILE se aplican a cada conexión nueva
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def open_connection(self, name):
+        wrapper = SQLiteWrapper({**connection.settings_dict, 'NAME': os.path.join(self.tmpdir, name)}, name)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    @override_settings(SQLITE_PROFILE='production')
+    def test_production_profile(self):
+        pragmas = active_pragmas(self.open_connection('production.sqlite3'))
+        self.assertEqual(pragmas['journal_mode'], 'WAL')
+        self.assertEqual(pragmas['synchronous'], 'NORMAL')
+        self.assertEqual(pragmas['temp_store'], 'MEMORY')
+        self.assertEqual(pragmas['cache_size'], get_profile('production')['cache_size'])
+        self.assertEqual(pragmas['busy_timeout'], get_profile('production')['busy_timeout'])
+
+    @override_settings(SQLITE_PROFILE='stock')
+    def test_stock_profile_keeps_defaults(self):
+        pragmas = active_pragmas(self.open_connection('stock.sqlite3'))
+        self.assertEqual(pragmas['journal_mode'], 'DELETE')
+        self.assertEqual(pragmas['synchronous'], 'FULL')
+
+    def test_unknown_profile_or_pragma(self):
+        with self.assertRaises(ValueError):
+            get_profile('turbo')
+        with override_settings(SQLITE_PROFILES={'bad': {'locking_mode': 'EXCLUSIVE'}}):
+            with self.assertRaises(ValueError):
+                get_profile('bad')
+
+
+@override_settings(DB_REPLICAS=['replica'], DB_READ_YOUR_WRITES_SECONDS=5)
+class ReadReplicaRouterTests(SimpleTestCase):
+    """
+    Lecturas de heroes/teams a las réplicas, escrituras y read-your-writes a default
+    """
+
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_reads_go_to_replicas(self):
+        self.assertEqual(self.router.db_for_read(Hero), 'replica')
+        self.assertEqual(self.router.db_for_read(Team), 'replica')
+        self.assertIsNone(self.router.db_for_read(MigrationRecorder.Migration))
+        with override_settings(DB_REPLICAS=[]):
+            self.assertIsNone(self.router.db_for_read(Hero))
+
+    def test_reads_inside_transaction_use_primary(self):
+        with mock.patch.object(connections['default'], 'in_atomic_block', True):
+            self.assertEqual(self.router.db_for_read(Hero), 'default')
+
+    def test_read_your_writes(self):
+        with routing_scope() as state:
+            self.assertEqual(self.router.db_for_read(Hero), 'replica')
+            self.assertEqual(self.router.db_for_write(Hero), 'default')
+            self.assertTrue(state.wrote)
+            self.assertEqual(self.router.db_for_read(Team), 'default')
+
+        with routing_scope(primary_until=time.time() - 1):
+            self.assertEqual(self.router.db_for_read(Hero), 'replica')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'heroes'))
+        self.assertIsNone(self.router.allow_migrate('default', 'heroes'))
+
+    def test_middleware_sets_and_honours_cookie(self):
+        def write_view(request):
+            self.router.db_for_write(Hero)
+            return HttpResponse()
+
+        def read_view(request):
+            return HttpResponse(self.router.db_for_read(Hero))
+
+        factory = RequestFactory()
+        response = ReadYourWritesMiddleware(write_view)(factory.post('/api/heroes/'))
+        cookie = response.cookies['db_primary_until']
+        self.assertEqual(cookie['max-age'], 5)
+
+        request = factory.get('/api/heroes/')
+        request.COOKIES['db_primary_until'] = cookie.value
+        self.assertEqual(ReadYourWritesMiddleware(read_view)(request).content, b'default')
+        # Sin cookie vuelve a la réplica y no se setea nada
+        response = ReadYourWritesMiddleware(read_view)(factory.get('/api/heroes/'))
+        self.assertEqual(response.content, b'replica')
+        self.assertNotIn('db_primary_until', response.cookies)
+
+    def test_writes_read_from_primary(self):
+        def view(request):
+            return HttpResponse(self.router.db_for_read(Team))
+
+        response = ReadYourWritesMiddleware(view)(RequestFactory().post('/api/teams/'))
+        self.assertEqual(response.content, b'default')
+        self.assertNotIn('db_primary_until', response.cookies)
+
+    def test_copy_replica_reads_are_not_cached_after_a_write(self):
+        """
+        Lo leído de una réplica copy justo después de una escritura (de
+        cualquier cliente) no se guarda en las cachés compartidas
+        """
+        cache.clear()
+        representations = RepresentationCache('replica-test')
+        page = Representation({'nombre': 'viejo'}, ('"etag"', None))
+
+        with mock.patch.dict(settings.DATABASES, {'replica': {'REPLICA_MODE': 'copy'}}):
+            with routing_scope():
+                self.router.db_for_read(Hero)
+                self.assertTrue(cache_fill_allowed())
+
+            self.router.db_for_write(Hero)
+            with routing_scope() as state:
+                self.assertEqual(self.router.db_for_read(Hero), 'replica')
+                self.assertTrue(state.lagging_read)
+                self.assertFalse(cache_fill_allowed())
+                _, token = representations.lookup(1)
+                representations.store(1, token, page)
+            self.assertIsNone(representations.lookup(1)[0])
+
+        # Las réplicas readonly leen el mismo archivo: no hay atraso
+        with mock.patch.dict(settings.DATABASES, {'replica': {'REPLICA_MODE': 'readonly'}}):
+            with routing_scope():
+                self.router.db_for_read(Hero)
+                self.assertTrue(cache_fill_allowed())
+
+    def test_copy_sqlite_database(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        source, target = os.path.join(tmpdir, 'primary.sqlite3'), os.path.join(tmpdir, 'copy', 'replica.sqlite3')
+        with sqlite3.connect(source) as primary:
+            primary.execute('CREATE TABLE t (x INTEGER)')
+            primary.execute('INSERT INTO t VALUES (1), (2)')
+        primary.close()
+
+        copy_sqlite_database(source, target)
+        replica = sqlite3.connect(target)
+        self.addCleanup(replica.close)
+        self.assertEqual(replica.execute('SELECT COUNT(*) FROM t').fetchone()[0], 2)
+
+
+@override_settings(GROUP_COMMIT={'enabled': True, 'window_ms': 50, 'max_batch': 64})
+class GroupCommitTests(TransactionTestCase):
+    """
+    Las escrituras concurrentes se confirman en lotes y cada request recibe
+    su resultado o su error de validación
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        # Un escritor nuevo por test (toma la configuración de override_settings)
+        patcher = mock.patch.object(group_commit, '_writer', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.team = Team.objects.create(nombre="Justice League", descripcion="Los más poderosos")
+
+    def create_concurrently(self, names):
+        results = {}
+
+        def create(index, nombre):
+            try:
+                results[index] = HeroService().create_hero(nombre=nombre, team_id=self.team.id)
+            except Exception as exc:
+                results[index] = exc
+
+        threads = [threading.Thread(target=create, args=(i, name)) for i, name in enumerate(names)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [results[i] for i in range(len(names))]
+
+    def test_concurrent_creates_share_commits(self):
+        results = self.create_concurrently([f"Hero {i}" for i in range(20)])
+
+        self.assertTrue(all(isinstance(result, Hero) for result in results))
+        self.assertEqual(Hero.objects.count(), 20)
+        stats = group_commit.get_writer().stats()
+        self.assertEqual(stats['writes'], 20)
+        self.assertLess(stats['batches'], 20)
+
+    def test_each_write_gets_its_own_validation_error(self):
+        results = self.create_concurrently(["Flash", "Flash", "Batman"])
+
+        errors = [result for result in results if isinstance(result, ValidationError)]
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Ya existe un héroe con el nombre 'Flash'", str(errors[0].detail))
+        self.assertEqual(sorted(Hero.objects.values_list('nombre', flat=True)), ['Batman', 'Flash'])
+
+    def test_api_and_cache_invalidation(self):
+        client = APIClient()
+        response = client.post(reverse('hero-list'), {'nombre': 'Flash', 'team_id': self.team.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = reverse('hero-detail', args=[response.data['id']])
+        self.assertEqual(client.get(url).data['nivel'], 1)
+
+        response = client.patch(url, {'nivel': 90}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['nivel'], 90)
+
+        # La representación cacheada se invalidó al confirmarse el lote
+        self.assertEqual(client.get(url).data['nivel'], 90)
+
+    def test_after_commit_runs_immediately_outside_writer(self):
+        calls = []
+        group_commit.after_commit(lambda: calls.append('ok'))
+        self.assertEqual(calls, ['ok'])
+
+
+class ApiDocsTests(SimpleTestCase):
+    """
+    drf_yasg y los docs.py se cargan recién con el primer request de documentación
+    """
+
+    def test_url_conf_does_not_import_the_documentation(self):
+        code = (
+            'import sys, django; django.setup(); import config.urls; '
+            'print(" ".join(m for m in sys.modules if m.startswith("drf_yasg.") or m.endswith(".docs")))'
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings', 'API_DOCS': 'True'}
+        completed = subprocess.run([sys.executable, '-c', code], cwd=str(settings.BASE_DIR), env=env,
+                                   capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), '')
+
+    @skipUnless(settings.API_DOCS_ENABLED, 'API_DOCS=False: sin rutas de documentación')
+    def test_schema_includes_the_lazy_decorators(self):
+        # Sin archivo prearmado: /swagger.json genera el schema
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        with override_settings(OPENAPI_SCHEMA_DIR=directory), self.assertLogs('apps.core.api_docs', 'WARNING'):
+            response = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+        self.assertEqual(response.status_code, 200)
+
+        operation = json.loads(response.content)['paths']['/heroes/']['get']
+        self.assertEqual(operation['summary'], 'Listar todos los héroes')
+        self.assertIn('include_archived', [parameter['name'] for parameter in operation['parameters']])
+
+    @override_settings(API_DOCS_ENABLED=False)
+    def test_disabled_docs_cost_nothing(self):
+        def view_method(self, request):
+            pass
+
+        self.assertIs(api_docs.LazyDocs('apps.heroes.docs').list_heroes_docs(view_method), view_method)
+        self.assertNotIn(view_method, [pending[2] for pending in api_docs._pending])
+        self.assertEqual(api_docs.docs_urlpatterns(), [])
+
+
+class ProductionProfileTests(SimpleTestCase):
+    """
+    SETTINGS_PROFILE=production: la API funciona sin el stack de templates
+    """
+
+    CHILD = """
+import json, django
+django.setup()
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+call_command('check', fail_level='WARNING')
+call_command('migrate', verbosity=0)
+client = Client()
+created = client.post('/api/teams/', {'nombre': 'Prod', 'descripcion': 'Lean'}, content_type='application/json')
+print(json.dumps({
+    'debug': settings.DEBUG,
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE,
+    'created': created.status_code,
+    'list': client.get('/api/teams/').json()['total'],
+    'admin': client.get('/admin/').status_code,
+}))
+"""
+
+    def run_profile(self, **env):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings', 'SETTINGS_PROFILE': 'production',
+               'ALLOWED_HOSTS': 'testserver', 'DB_NAME': os.path.join(directory, 'db.sqlite3'), **env}
+        env.pop('DEBUG', None)
+        completed = subprocess.run([sys.executable, '-c', self.CHILD], cwd=str(settings.BASE_DIR), env=env,
+                                   capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def test_lean_api(self):
+        result = self.run_profile(API_DOCS='False')
+
+        self.assertFalse(result['debug'])
+        for app in ('django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages', 'drf_yasg'):
+            self.assertNotIn(app, result['apps'])
+        for middleware in settings.PRODUCTION_EXCLUDED_MIDDLEWARE:
+            self.assertNotIn(middleware, result['middleware'])
+        self.assertEqual((result['created'], result['list'], result['admin']), (201, 1, 404))
+
+    def test_unknown_profile_fails(self):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings', 'SETTINGS_PROFILE': 'prod'}
+        completed = subprocess.run([sys.executable, '-c', 'import django; django.setup()'],
+                                   cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True)
+
+        self.assertNotEqual(completed.returncode, 0)
+        self.assertIn('SETTINGS_PROFILE', completed.stderr)
+
+
+@skipUnless(settings.API_DOCS_ENABLED, 'API_DOCS=False: sin rutas de documentación')
+class PrebuiltSchemaTests(SimpleTestCase):
+    """
+    /swagger.json sirve el schema de build_openapi (memorizado, con ETag y gzip)
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        override = override_settings(OPENAPI_SCHEMA_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        api_docs._artifacts.clear()
+        self.addCleanup(api_docs._artifacts.clear)
+        self.url = reverse('schema-json', kwargs={'format': '.json'})
+
+    def build(self):
+        call_command('build_openapi', stdout=io.StringIO())
+
+    def test_build_writes_the_schema_and_its_gzip(self):
+        self.build()
+
+        for name in ('swagger.json', 'swagger.yaml'):
+            path = os.path.join(self.directory, name)
+            with open(path, 'rb') as body, open(path + '.gz', 'rb') as gzipped:
+                self.assertEqual(gzip.decompress(gzipped.read()), body.read())
+        with open(os.path.join(self.directory, 'swagger.json'), 'rb') as body:
+            self.assertIn('/heroes/', json.loads(body.read())['paths'])
+
+    def test_serves_the_prebuilt_file_without_generating(self):
+        with open(os.path.join(self.directory, 'swagger.json'), 'wb') as body:
+            body.write(b'{"swagger": "prearmado"}')
+
+        with mock.patch.object(api_docs, 'generate_schema') as generate:
+            response = self.client.get(self.url)
+
+        generate.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"swagger": "prearmado"}')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_rereads_the_file_when_it_changes(self):
+        path = os.path.join(self.directory, 'swagger.json')
+        with open(path, 'wb') as body:
+            body.write(b'{"version": 1}')
+        first = self.client.get(self.url)
+
+        with open(path, 'wb') as body:
+            body.write(b'{"version": 2}')
+        os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        second = self.client.get(self.url)
+
+        self.assertEqual(second.content, b'{"version": 2}')
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_etag_returns_304(self):
+        self.build()
+        response = self.client.get(self.url)
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['ETag'], response['ETag'])
+
+    def test_gzip_when_accepted(self):
+        self.build()
+        plain = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response['ETag'], plain['ETag'])
+
+    def test_generates_once_when_the_file_is_missing(self):
+        with mock.patch.object(api_docs, 'generate_schema', wraps=api_docs.generate_schema) as generate:
+            with self.assertLogs('apps.core.api_docs', 'WARNING'):
+                first = self.client.get(self.url)
+            second = self.client.get(self.url)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertIn('/heroes/', json.loads(first.content)['paths'])
+
+    def test_check_detects_a_stale_schema(self):
+        self.build()
+        call_command('build_openapi', '--check', stdout=io.StringIO())
+
+        with open(os.path.join(self.directory, 'swagger.yaml'), 'ab') as body:
+            body.write(b'\n# viejo\n')
+        with self.assertRaises(CommandError):
+            call_command('build_openapi', '--check', stdout=io.StringIO())
+
+
+def api_patterns():
+    return [
+        path('hola-mundo/', hola_mundo, name='hola-mundo'),
+        path('metrics', metrics, name='metrics'),
+        *api_router.urls,
+    ]
+
+
+def dummy_view(request, **kwargs):
+    return HttpResponse()
+
+
+class CompiledRoutesTests(SimpleTestCase):
+    """
+    El router único con la tabla compilada resuelve igual que include()
+    """
+
+    PATHS = [
+        '/api/', '/api/.json', '/api/hola-mundo/', '/api/metrics',
+        '/api/heroes/', '/api/heroes.json', '/api/heroes/5/', '/api/heroes/5.json', '/api/heroes/by-name/',
+        '/api/heroes/5/by-team/', '/api/teams/', '/api/teams/abc/', '/api/teams/by-name.json',
+    ]
+
+    def test_resolves_like_include(self):
+        compiled = URLResolver(RegexPattern(r'^/'), [compiled_path('api/', api_patterns())])
+        included = URLResolver(RegexPattern(r'^/'), [path('api/', include(api_patterns()))])
+
+        for url in self.PATHS:
+            expected, match = included.resolve(url), compiled.resolve(url)
+            self.assertEqual(
+                (match.func, match.args, match.kwargs, match.view_name, match.route),
+                (expected.func, expected.args, expected.kwargs, expected.view_name, expected.route),
+                url,
+            )
+        for url in ('/api/villanos/', '/api/heroes/5/6/', '/api/metricsx'):
+            with self.assertRaises(Resolver404):
+                compiled.resolve(url)
+
+    def test_common_routes_are_dict_lookups(self):
+        resolver = next(pattern for pattern in get_resolver().url_patterns
+                        if isinstance(pattern, CompiledRouteResolver))
+
+        self.assertLessEqual({'heroes/', 'heroes/by-name/', 'teams/', 'teams/by-name/', 'metrics'},
+                             set(resolver.route_table.exact))
+        self.assertEqual(resolver.resolve('api/heroes/').url_name, 'hero-list')
+
+    def test_earlier_patterns_win(self):
+        resolver = compiled_path('', [
+            re_path(r'^(?P<slug>[\w-]+)/$', dummy_view, name='slug'),
+            path('heroes/', dummy_view, name='heroes'),
+        ])
+
+        self.assertNotIn('heroes/', resolver.route_table.exact)
+        self.assertEqual(resolver.resolve('heroes/').url_name, 'slug')
+
+    def test_single_api_root(self):
+        response = APIClient().get(reverse('api-root'))
+
+        self.assertEqual(reverse('api-root'), '/api/')
+        self.assertEqual(set(response.json()), {'teams', 'heroes'})
+
+
+class PageCacheTests(SimpleTestCase):
+    """
+    Refresco en segundo plano de una página obsoleta (vistas async)
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_async_refresh_runs_in_an_empty_context(self):
+        page_cache = PageCache('test-list', tables=('test_table',))
+        marker = contextvars.ContextVar('marker', default=None)
+        seen = []
+
+        async def compute():
+            seen.append(marker.get())
+            return Representation({'page': len(seen)}, ('"etag"', None))
+
+        async def scenario():
+            await page_cache.aget_or_compute({'offset': 0}, compute)
+            bump_generation('test_table')
+            marker.set('request')
+            stale = await page_cache.aget_or_compute({'offset': 0}, compute)
+            await asyncio.gather(*PageCache._background_tasks)
+            return stale, await page_cache.aget_or_compute({'offset': 0}, compute)
+
+        stale, fresh = asyncio.run(scenario())
+
+        self.assertEqual((stale.data, fresh.data), ({'page': 1}, {'page': 2}))
+        # El refresco no hereda el contexto del request
+        self.assertEqual(seen, [None, None])
+
+
+def admission_settings(**limits):
+    reads = {'rate': 1000, 'burst': 1000, 'max_concurrency': 10, 'max_queue': 10, 'queue_timeout': 0.5, **limits}
+    return {
+        'enabled': True,
+        'export_min_limit': 50,
+        'max_clients': 100,
+        'retry_after': 3,
+        'classes': {
+            'reads': reads,
+            'writes': {'rate': 1000, 'burst': 1000, 'max_concurrency': 10, 'max_queue': 10, 'queue_timeout': 0.5},
+            'exports': {'rate': 0.5, 'burst': 1, 'max_concurrency': 10, 'max_queue': 10, 'queue_timeout': 0.5},
+        },
+    }
+
+
+class AdmissionControlTests(TestCase):
+    """
+    Rate limit por cliente (429) y límite de concurrencia por clase de endpoint (503)
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def limiter(self, endpoint_class):
+        return admission.get_controller().limiters[endpoint_class]
+
+    @override_settings(ADMISSION=admission_settings(rate=0.5, burst=2))
+    def test_rate_limit_per_client(self):
+        statuses = [self.client.get('/api/teams/').status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 429])
+        response = self.client.get('/api/teams/')
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertIn('Demasiados requests', response.data['detail'])
+        # Otro cliente (otra IP u otro token) tiene su propio bucket
+        self.assertEqual(self.client.get('/api/teams/', REMOTE_ADDR='10.0.0.2').status_code, 200)
+        self.assertEqual(self.client.get('/api/teams/', HTTP_AUTHORIZATION='Token abc').status_code, 200)
+        # Las escrituras son otra clase de endpoint
+        self.assertEqual(self.client.delete('/api/teams/999999/').status_code, 404)
+
+    @override_settings(ADMISSION=admission_settings())
+    def test_large_pages_are_exports(self):
+        self.assertEqual(self.client.get('/api/heroes/?limit=100').status_code, 200)
+        self.assertEqual(self.client.get('/api/heroes/?limit=100').status_code, 429)
+        self.assertEqual(self.client.get('/api/heroes/?include_archived=true').status_code, 429)
+
+        self.assertEqual(self.client.get('/api/heroes/?limit=10').status_code, 200)
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=0))
+    def test_sheds_load_when_the_class_is_full(self):
+        self.assertIs(self.limiter('reads').try_acquire(), True)
+
+        response = self.client.get('/api/teams/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+        self.limiter('reads').release()
+        self.assertEqual(self.client.get('/api/teams/').status_code, 200)
+        self.assertEqual(self.limiter('reads').stats()['rejections']['queue_full'], 1)
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=1, queue_timeout=0.05))
+    def test_queued_request_times_out(self):
+        self.limiter('reads').try_acquire()
+
+        response = self.client.get('/api/teams/')
+
+        self.assertEqual(response.status_code, 503)
+        stats = self.limiter('reads').stats()
+        self.assertEqual((stats['queued'], stats['queue_depth'], stats['rejections']['queue_timeout']), (1, 0, 1))
+        self.assertGreater(stats['queue_wait_seconds'], 0.04)
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=1, queue_timeout=2))
+    def test_queued_request_gets_the_released_slot(self):
+        limiter = self.limiter('reads')
+        limiter.try_acquire()
+        timer = threading.Timer(0.05, limiter.release)
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(self.client.get('/api/teams/').status_code, 200)
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=0))
+    def test_slot_is_released_on_errors(self):
+        self.assertEqual(self.client.get('/api/teams/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/teams/999999/').status_code, 404)
+
+        self.assertEqual(self.limiter('reads').stats()['in_flight'], 0)
+
+    @override_settings(ADMISSION=admission_settings(rate=0.5, burst=1))
+    def test_metrics(self):
+        self.client.get('/api/teams/')
+        self.client.get('/api/teams/')
+
+        body = registry.render()
+        self.assertIn('api_admission_rejections_total{endpoint_class="reads",reason="rate_limited"} 1', body)
+        self.assertIn('api_admission_admitted_total{endpoint_class="reads"} 1', body)
+        self.assertIn('api_admission_queue_depth{endpoint_class="reads"} 0', body)
+
+    def test_disabled_under_tests(self):
+        # apps.core.testing.TestRunner lo desactiva también en el perfil production
+        self.assertIsNone(admission.get_controller())
+
+    @override_settings(ADMISSION=admission_settings(rate=0.5, burst=1))
+    def test_each_override_starts_with_new_buckets(self):
+        self.assertEqual(self.client.get('/api/teams/').status_code, 200)
+        with override_settings(ADMISSION=admission_settings(rate=0.5, burst=1)):
+            self.assertEqual(self.client.get('/api/teams/').status_code, 200)
+        self.assertEqual(self.client.get('/api/teams/').status_code, 200)
+
+
+@override_settings(ROOT_URLCONF='apps.teams.tests')
+class AsyncAdmissionControlTests(AdmissionControlTests):
+    """
+    Lo mismo con los ViewSets async (ASYNC_VIEWS)
+    """
+
+    @override_settings(ADMISSION=admission_settings(rate=0.5, burst=1))
+    async def test_async_client_rate_limit(self):
+        with mock.patch.object(admission, 'aadmit', wraps=admission.aadmit) as aadmit:
+            first = await self.async_client.get('/api/teams/')
+            second = await self.async_client.get('/api/teams/')
+
+        self.assertEqual((first.status_code, second.status_code), (200, 429))
+        self.assertEqual(second['Retry-After'], '2')
+        self.assertEqual(aadmit.call_count, 2)
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=1, queue_timeout=2))
+    async def test_async_client_waits_in_the_queue(self):
+        limiter = self.limiter('reads')
+        limiter.try_acquire()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, limiter.release)
+
+        response = await self.async_client.get('/api/teams/')
+
+        self.assertEqual(response.status_code, 200)
+        stats = limiter.stats()
+        self.assertEqual((stats['queued'], stats['in_flight']), (1, 0))
+
+    @override_settings(ADMISSION=admission_settings(max_concurrency=1, max_queue=0))
+    async def test_async_client_sheds_load(self):
+        self.limiter('reads').try_acquire()
+
+        response = await self.async_client.get('/api/teams/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+
@@ -0,0 +1,164 @@
+"""
+Resolución de URLs con tabla de rutas compilada
+
+URLResolver de Django prueba los patrones uno por uno (un regex por
+patrón) hasta que alguno coincide: /api/heroes/5/ pasaba por todas las
+rutas de teams antes de llegar a las de heroes.
+
+CompiledRouteResolver arma, en el primer request, una tabla con los
+mismos patrones:
+- exact: path literal → patrón ('heroes/', 'teams/by-name/', 'metrics').
+  Las rutas más usadas (listados y acciones sin parámetros) se resuelven
+  con un lookup en un dict
+- buckets: primer segmento del path → patrones que empiezan con ese
+  literal ('heroes' → las rutas de heroes, incluidas las de formato
+  heroes.json). El resto de las rutas prueba solo los patrones de su
+  prefijo
+- wildcard: patrones sin prefijo literal (empiezan con un parámetro o un
+  regex). Se prueban siempre, en su lugar en el orden original
+
+El orden de las urlpatterns se respeta: una ruta gana solo si ningún
+patrón anterior podía coincidir con ese path. Si nada coincide se delega
+en URLResolver.resolve (el 404 trae la lista completa de rutas probadas).
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from django.urls import Resolver404, URLPattern, URLResolver
+from django.urls.resolvers import RegexPattern, ResolverMatch, RoutePattern
+from django.utils.functional import cached_property
+
+# Literal inicial de un patrón y lo que le sigue (fin de segmento, formato o fin del path)
+_REGEX_PREFIX = re.compile(r'\^([\w-]*)(/|\\\.|\$)')
+_ROUTE_PREFIX = re.compile(r'([\w-]*)(/|\.|$)')
+# Patrón que solo coincide con un path literal
+_REGEX_LITERAL = re.compile(r'\^([\w/-]*)\$')
+_ROUTE_LITERAL = re.compile(r'[\w/.-]*')
+# Primer segmento de un path: hasta '/' o '.' (heroes/5/ → heroes, heroes.json → heroes)
+_PATH_KEY = re.compile(r'[^/.]*')
+
+
+def route_key(pattern) -> Optional[str]:
+    """
+    Primer segmento literal de un patrón, o None si no tiene (wildcard).
+    """
+    route_pattern = pattern.pattern
+    if isinstance(route_pattern, RegexPattern):
+        match = _REGEX_PREFIX.match(route_pattern._regex)
+    elif isinstance(route_pattern, RoutePattern):
+        match = _ROUTE_PREFIX.match(route_pattern._route)
+        # Un include sin '/' final ('metrics') también coincide con 'metricsX'
+        if match and not match.group(2) and not route_pattern._is_endpoint:
+            match = None
+    else:
+        match = None
+    return match.group(1) if match else None
+
+
+def literal_path(pattern) -> Optional[str]:
+    """
+    Path con el que coincide un patrón sin parámetros, o None.
+    """
+    if not isinstance(pattern, URLPattern):
+        return None
+    route_pattern = pattern.pattern
+    if isinstance(route_pattern, RegexPattern):
+        match = _REGEX_LITERAL.fullmatch(route_pattern._regex)
+        return match.group(1) if match else None
+    if isinstance(route_pattern, RoutePattern) and _ROUTE_LITERAL.fullmatch(route_pattern._route):
+        return route_pattern._route
+    return None
+
+
+def path_key(path: str) -> str:
+    return _PATH_KEY.match(path).group()
+
+
+class RouteTable(NamedTuple):
+    exact: Dict[str, object]
+    buckets: Dict[str, Tuple[object, ...]]
+    wildcard: Tuple[object, ...]
+
+    def candidates(self, path: str) -> Tuple[object, ...]:
+        return self.buckets.get(path_key(path), self.wildcard)
+
+
+def compile_routes(url_patterns: List) -> RouteTable:
+    keys = [route_key(pattern) for pattern in url_patterns]
+    wildcard = tuple(pattern for pattern, key in zip(url_patterns, keys) if key is None)
+    buckets = {
+        key: tuple(pattern for pattern, pattern_key in zip(url_patterns, keys) if pattern_key in (key, None))
+        for key in set(keys) - {None}
+    }
+    table = RouteTable({}, buckets, wildcard)
+
+    for pattern in url_patterns:
+        path = literal_path(pattern)
+        if path is None or path in table.exact:
+            continue
+        # Solo si ningún patrón anterior del mismo prefijo coincide con ese path
+        earlier = table.candidates(path)
+        earlier = earlier[:earlier.index(pattern)]
+        if not any(_matches(candidate, path) for candidate in earlier):
+            table.exact[path] = pattern
+    return table
+
+
+def _matches(pattern, path: str) -> bool:
+    try:
+        return bool(pattern.resolve(path))
+    except Resolver404:
+        return False
+
+
+class CompiledRouteResolver(URLResolver):
+    """
+    URLResolver que busca el patrón en una tabla de rutas compilada (ver el
+    docstring del módulo). Mismas rutas, nombres y reverse() que include().
+    """
+
+    @cached_property
+    def route_table(self) -> RouteTable:
+        return compile_routes(self.url_patterns)
+
+    def resolve(self, path):
+        path = str(path)
+        match = self.pattern.match(path)
+        if match:
+            new_path, args, kwargs = match
+            table = self.route_table
+            exact = table.exact.get(new_path)
+            for pattern in (exact,) if exact is not None else table.candidates(new_path):
+                try:
+                    sub_match = pattern.resolve(new_path)
+                except Resolver404:
+                    continue
+                if sub_match:
+                    return self._resolver_match(pattern, sub_match, args, kwargs)
+        return super().resolve(path)
+
+    def _resolver_match(self, pattern, sub_match, args, kwargs) -> ResolverMatch:
+        # Igual que URLResolver.resolve al encontrar la ruta
+        sub_match_dict = {**kwargs, **self.default_kwargs, **sub_match.kwargs}
+        sub_match_args = sub_match.args if sub_match_dict else args + sub_match.args
+        current_route = '' if isinstance(pattern, URLPattern) else str(pattern.pattern)
+        tried = []
+        self._extend_tried(tried, pattern, sub_match.tried)
+        return ResolverMatch(
+            sub_match.func,
+            sub_match_args,
+            sub_match_dict,
+            sub_match.url_name,
+            [self.app_name] + sub_match.app_names,
+            [self.namespace] + sub_match.namespaces,
+            self._join_route(current_route, sub_match.route),
+            tried,
+            captured_kwargs=sub_match.captured_kwargs,
+            extra_kwargs={**self.default_kwargs, **sub_match.extra_kwargs},
+        )
+
+
+def compiled_path(route: str, patterns: List, name: Optional[str] = None) -> CompiledRouteResolver:
+    """
+    Equivalente a path(route, include(patterns)) con CompiledRouteResolver.
+    """
+    return CompiledRouteResolver(RoutePattern(route, name=name, is_endpoint=False), patterns)
@@ -0,0 +1,108 @@
+"""
+Archivo de heroes viejos (tabla fría heroes_archive)
+
+La mayoría de las lecturas son de heroes recientes. Los heroes con
+fecha_creacion anterior a un corte pasan de heroes a heroes_archive
+(modelo ArchivedHero): la tabla caliente y sus índices quedan chicos y
+las páginas de los listados tocan menos filas.
+
+Cada lote es una transacción en la base de los heroes (default o cada
+shard de HERO_SHARDS):
+- INSERT INTO heroes_archive ... SELECT ... FROM heroes WHERE id IN (...):
+  la copia la hace la base, sin pasar las filas por Python (mismo ID y
+  mismas fechas)
+- DELETE de esos heroes de la tabla heroes
+
+Los lotes se recorren por ID (keyset) y son cortos para no tener tomado
+el lock de escritura de SQLite mucho tiempo: la API puede seguir
+atendiendo mientras corre. Como el corte es por fecha_creacion, todo lo
+archivado es más viejo que lo que queda en heroes (HeroRepository se
+apoya en eso para paginar con include_archived).
+
+Lo usa `manage.py archive_heroes`.
+"""
+from datetime import datetime
+from typing import Dict, Iterator, List
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from apps.core.page_cache import bump_generation
+from . import sharding
+from .models import ArchivedHero, Hero
+
+
+def hero_aliases() -> List[str]:
+    """
+    Bases donde están los heroes: los shards, o solo default.
+    """
+    return sharding.shard_aliases() or [DEFAULT_DB_ALIAS]
+
+
+def pending_ids(alias: str, cutoff: datetime, batch_size: int) -> Iterator[List[int]]:
+    """
+    IDs de los heroes creados antes de `cutoff`, en lotes de `batch_size`
+    (keyset por ID: las filas ya archivadas no corren el lugar).
+    """
+    last_id = 0
+    while True:
+        queryset = Hero.objects.using(alias).filter(fecha_creacion__lt=cutoff, id__gt=last_id)
+        batch = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def archive_batch(alias: str, hero_ids: List[int], archived_at: datetime) -> int:
+    """
+    Mueve un lote de heroes a heroes_archive en una sola transacción.
+
+    Returns:
+        int: Cantidad de heroes archivados
+    """
+    connection = connections[alias]
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in Hero._meta.concrete_fields)
+    archived_column = qn(ArchivedHero._meta.get_field('fecha_archivado').column)
+    placeholders = ', '.join(['%s'] * len(hero_ids))
+    sql = (
+        f'INSERT INTO {qn(ArchivedHero._meta.db_table)} ({columns}, {archived_column}) '
+        f'SELECT {columns}, %s FROM {qn(Hero._meta.db_table)} '
+        f'WHERE {qn(Hero._meta.pk.column)} IN ({placeholders})'
+    )
+    params = [connection.ops.adapt_datetimefield_value(archived_at), *hero_ids]
+
+    with transaction.atomic(using=alias):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            archived = cursor.rowcount
+        Hero.objects.using(alias).filter(id__in=hero_ids).delete()
+    return archived
+
+
+def archive_heroes(cutoff: datetime, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Archiva los heroes creados antes de `cutoff` en cada base de heroes.
+
+    Args:
+        cutoff: Fecha de corte (fecha_creacion < cutoff)
+        batch_size: Heroes por transacción
+        dry_run: Solo contar, sin mover nada
+
+    Returns:
+        Dict[str, int]: Heroes archivados (o a archivar, con dry_run) por alias
+    """
+    archived_at = timezone.now()
+    totals = {}
+    for alias in hero_aliases():
+        if dry_run:
+            totals[alias] = Hero.objects.using(alias).filter(fecha_creacion__lt=cutoff).count()
+            continue
+        totals[alias] = sum(
+            archive_batch(alias, hero_ids, archived_at)
+            for hero_ids in pending_ids(alias, cutoff, batch_size)
+        )
+
+    if any(totals.values()) and not dry_run:
+        # Cambian los listados y sus versiones
+        bump_generation('heroes')
+    return totals
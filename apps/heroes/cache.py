@@ -0,0 +1,30 @@
+"""
+Cachés de Heroes
+
+- hero_cache: representación serializada (HeroReadSchema) por ID de héroe.
+  Se invalida en HeroRepository.update_hero/delete_hero y, como el payload
+  incluye el team anidado (team.nombre), también cuando se modifica o
+  elimina un team (TeamRepository.update_team/delete_team).
+- heroes_page_cache / heroes_by_team_page_cache: páginas completas de los
+  listados. Dependen de las tablas heroes y teams (cada héroe lleva su team).
+- hero_shard_cache: con sharding (apps/heroes/sharding.py), el shard de
+  cada héroe (LRU + TTL en memoria del proceso) delante del índice
+  hero_shards. Si otro proceso movió el héroe, la entrada vieja se
+  descarta al no encontrarlo en ese shard.
+  Sus contadores se publican en /api/metrics (cache="hero_shard").
+"""
+from django.conf import settings
+from apps.core.cache import LRUCache, RepresentationCache
+from apps.core.metrics import registry
+from apps.core.page_cache import PageCache
+
+hero_cache = RepresentationCache('heroes')
+
+heroes_page_cache = PageCache('heroes-list', tables=('heroes', 'teams'))
+heroes_by_team_page_cache = PageCache('heroes-by-team', tables=('heroes', 'teams'))
+
+hero_shard_cache = LRUCache(
+    maxsize=settings.HERO_SHARD_CACHE_SIZE,
+    ttl=settings.HERO_SHARD_CACHE_TTL
+)
+registry.register_cache('hero_shard', hero_shard_cache)
@@ -92,6 +92,11 @@ list_heroes_docs = swagger_auto_schema(
     **Paginación:**
     - offset: Índice de inicio (default: 0)
     - limit: Cantidad de resultados (default: 10, max: 100)
+
+    **Archivados:**
+    Los héroes viejos se mueven a un archivo (`manage.py archive_heroes`) y no
+    aparecen en el listado. Con include_archived=true la lista sigue con ellos
+    después de los activos (y total los cuenta).
     """,
     manual_parameters=[
         openapi.Parameter(
@@ -110,6 +115,14 @@ list_heroes_docs = swagger_auto_schema(
             required=False,
             default=10
         ),
+        openapi.Parameter(
+            'include_archived',
+            openapi.IN_QUERY,
+            description="Incluir los héroes archivados, después de los activos (default: false)",
+            type=openapi.TYPE_BOOLEAN,
+            required=False,
+            default=False
+        ),
     ],
     responses={
         200: openapi.Response(
@@ -140,6 +153,9 @@ list_heroes_docs = swagger_auto_schema(
                 }
             }
         ),
+        304: openapi.Response(
+            description="No modificado (If-None-Match coincide con el ETag)"
+        ),
         400: openapi.Response(
             description="Parámetros de paginación inválidos"
         )
@@ -157,12 +173,17 @@ retrieve_hero_docs = swagger_auto_schema(
     **Incluye:**
     - Todos los campos del héroe
     - Información completa del equipo al que pertenece
+
+    También encuentra a los héroes archivados.
     """,
     responses={
         200: openapi.Response(
             description="Héroe encontrado exitosamente",
             schema=HeroReadSchema
         ),
+        304: openapi.Response(
+            description="No modificado (If-None-Match / If-Modified-Since coinciden con ETag / Last-Modified)"
+        ),
         404: openapi.Response(
             description="Héroe no encontrado",
             examples={
@@ -310,6 +331,7 @@ get_by_team_docs = swagger_auto_schema(
     - Lista de héroes del equipo
     - Información del equipo (team_info)
     - Paginación (offset, limit, has_next, has_previous)
+    - Con include_archived=true, también los héroes archivados del equipo
     """,
     manual_parameters=[
         openapi.Parameter(
@@ -328,6 +350,14 @@ get_by_team_docs = swagger_auto_schema(
             required=False,
             default=10
         ),
+        openapi.Parameter(
+            'include_archived',
+            openapi.IN_QUERY,
+            description="Incluir los héroes archivados, después de los activos (default: false)",
+            type=openapi.TYPE_BOOLEAN,
+            required=False,
+            default=False
+        ),
     ],
     responses={
         200: openapi.Response(
@@ -377,6 +407,9 @@ get_by_team_docs = swagger_auto_schema(
                 }
             }
         ),
+        304: openapi.Response(
+            description="No modificado (If-None-Match coincide con el ETag)"
+        ),
         400: openapi.Response(
             description="Parámetros de paginación inválidos"
         ),
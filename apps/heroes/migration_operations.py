@@ -0,0 +1,66 @@
+"""
+Operaciones de migración para el sharding de heroes
+
+En `default` la tabla heroes tiene su FOREIGN KEY a teams. En los shards
+(settings.HERO_SHARDS, ver apps/heroes/sharding.py) no hay tabla teams: ahí
+la columna team_id queda sin constraint; el CASCADE lo hace Django y el
+Service valida que el team exista.
+
+DropForeignKeyOnShards no cambia el estado de las migraciones (el modelo
+sigue con db_constraint=True): solo altera la tabla cuando la migración
+corre sobre un shard (`migrate --database <shard>`). En `default`, o sin
+sharding, no hace nada.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.migrations.operations.base import Operation
+
+
+class DropForeignKeyOnShards(Operation):
+    """
+    Quita la FOREIGN KEY de un campo en los shards de heroes.
+    """
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(self, model_name: str, name: str):
+        self.model_name = model_name
+        self.name = name
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'model_name': self.model_name, 'name': self.name}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._alter(app_label, schema_editor, to_state, from_constraint=True, to_constraint=False)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._alter(app_label, schema_editor, from_state, from_constraint=False, to_constraint=True)
+
+    def _alter(self, app_label, schema_editor, state, from_constraint: bool, to_constraint: bool):
+        alias = schema_editor.connection.alias
+        if alias == DEFAULT_DB_ALIAS or alias not in getattr(settings, 'HERO_SHARDS', []):
+            return
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(alias, model):
+            return
+
+        field = model._meta.get_field(self.name)
+        old_field, new_field = field.clone(), field.clone()
+        for altered, constraint in ((old_field, from_constraint), (new_field, to_constraint)):
+            altered.db_constraint = constraint
+            altered.set_attributes_from_name(self.name)
+            altered.model = model
+            # clone() deja la relación sin resolver ('teams.team')
+            altered.remote_field.model = field.remote_field.model
+            altered.remote_field.field_name = field.remote_field.field_name
+        schema_editor.alter_field(model, old_field, new_field)
+
+    def describe(self):
+        return f'Quita la FOREIGN KEY de {self.model_name}.{self.name} en los shards de heroes'
+
+    @property
+    def migration_name_fragment(self):
+        return f'{self.model_name}_{self.name}_shards_without_fk'
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:14
+
+from django.db import migrations, models
+import apps.heroes.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_team_fecha_actualizacion'),
+        ('heroes', '0002_hero_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeroShard',
+            fields=[
+                ('id', models.AutoField(editable=False, primary_key=True, serialize=False, verbose_name='ID del héroe')),
+                ('shard', models.CharField(help_text='Alias de la base de datos donde está el héroe', max_length=64, verbose_name='Shard')),
+            ],
+            options={
+                'verbose_name': 'Shard de héroe',
+                'verbose_name_plural': 'Shards de héroes',
+                'db_table': 'hero_shards',
+            },
+        ),
+        # Solo en los shards (que no tienen la tabla teams); en default se mantiene la FOREIGN KEY
+        apps.heroes.migration_operations.DropForeignKeyOnShards(
+            model_name='hero',
+            name='team',
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_team_fecha_actualizacion'),
+        ('heroes', '0003_hero_shards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHero',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, verbose_name='Nombre del héroe')),
+                ('descripcion', models.TextField(blank=True, null=True, verbose_name='Descripción')),
+                ('poder_principal', models.CharField(blank=True, max_length=255, null=True, verbose_name='Poder principal')),
+                ('nivel', models.IntegerField(default=1, verbose_name='Nivel de poder')),
+                ('fecha_creacion', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('fecha_archivado', models.DateTimeField(help_text='Fecha y hora en que el héroe pasó a heroes_archive', verbose_name='Fecha de archivado')),
+                ('team', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_heroes', to='teams.team', verbose_name='Equipo')),
+            ],
+            options={
+                'verbose_name': 'Héroe archivado',
+                'verbose_name_plural': 'Héroes archivados',
+                'db_table': 'heroes_archive',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['team', 'fecha_creacion'], name='idx_archived_hero_team'), models.Index(fields=['fecha_creacion'], name='idx_archived_hero_created'), models.Index(fields=['nombre'], name='idx_archived_hero_nombre')],
+            },
+        ),
+    ]
@@ -4,6 +4,10 @@ Modelos de base de datos para Heroes
 Este modelo representa a los héroes que pertenecen a un equipo (Team).
 Relación: Un Team puede tener MUCHOS Heroes, pero un Hero solo puede
 pertenecer a UN Team (relación Many-to-One).
+
+ArchivedHero es la tabla "fría" (heroes_archive) adonde
+`manage.py archive_heroes` mueve los heroes viejos: misma forma que Hero,
+mismo ID, en la misma base que la tabla heroes.
 """
 from django.db import models
 from apps.teams.models import Team
@@ -17,6 +21,10 @@ class Hero(models.Model):
     - ForeignKey: Muchos heroes pueden pertenecer a un team
     - on_delete=models.CASCADE: Si se elimina el team, se eliminan sus heroes
     - related_name='heroes': Permite acceder a los heroes desde un team con team.heroes.all()
+    - FOREIGN KEY en `default`. Con sharding (apps/heroes/sharding.py) los
+      heroes viven en otra base que sus teams: en los shards la tabla se crea
+      sin la FOREIGN KEY (migración 0003, DropForeignKeyOnShards), el CASCADE
+      lo hace Django y el Service valida que el team exista
     """
     id = models.AutoField(
         primary_key=True,
@@ -67,6 +75,12 @@ class Hero(models.Model):
         help_text="Fecha y hora en que se creó el héroe"
     )
 
+    fecha_actualizacion = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Fecha de actualización",
+        help_text="Fecha y hora de la última modificación del héroe (se usa para ETag/Last-Modified)"
+    )
+
     class Meta:
         db_table = 'heroes'
         verbose_name = 'Héroe'
@@ -74,8 +88,10 @@ class Hero(models.Model):
         ordering = ['-fecha_creacion']  # Ordenar por fecha de creación descendente
 
         # Índice para mejorar búsquedas por team
+        # Índice en fecha_actualizacion para que MAX() no recorra toda la tabla
         indexes = [
             models.Index(fields=['team'], name='idx_hero_team'),
+            models.Index(fields=['fecha_actualizacion'], name='idx_hero_updated'),
         ]
 
     def __str__(self):
@@ -83,3 +99,96 @@ class Hero(models.Model):
 
     def __repr__(self):
         return f"<Hero(id={self.id}, nombre='{self.nombre}', team_id={self.team_id})>"
+
+
+class ArchivedHero(models.Model):
+    """
+    Héroe archivado (tabla fría heroes_archive)
+
+    Mismos campos que Hero. El ID y fecha_creacion se copian tal cual al
+    archivar (no son automáticos); fecha_actualizacion sigue siendo
+    auto_now porque un héroe archivado se puede modificar en su lugar.
+    Todos los archivados son más viejos que cualquier héroe de la tabla
+    heroes: el listado con archivados es heroes + heroes_archive.
+    """
+    id = models.IntegerField(
+        primary_key=True,
+        verbose_name="ID"
+    )
+
+    nombre = models.CharField(max_length=255, verbose_name="Nombre del héroe")
+
+    descripcion = models.TextField(verbose_name="Descripción", blank=True, null=True)
+
+    poder_principal = models.CharField(max_length=255, verbose_name="Poder principal", blank=True, null=True)
+
+    nivel = models.IntegerField(verbose_name="Nivel de poder", default=1)
+
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name='archived_heroes',
+        db_constraint=False,
+        verbose_name="Equipo"
+    )
+
+    fecha_creacion = models.DateTimeField(verbose_name="Fecha de creación")
+
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    fecha_archivado = models.DateTimeField(
+        verbose_name="Fecha de archivado",
+        help_text="Fecha y hora en que el héroe pasó a heroes_archive"
+    )
+
+    class Meta:
+        db_table = 'heroes_archive'
+        verbose_name = 'Héroe archivado'
+        verbose_name_plural = 'Héroes archivados'
+        ordering = ['-fecha_creacion']
+
+        # Las mismas búsquedas que en heroes: por team y por nombre, ordenadas por fecha_creacion
+        indexes = [
+            models.Index(fields=['team', 'fecha_creacion'], name='idx_archived_hero_team'),
+            models.Index(fields=['fecha_creacion'], name='idx_archived_hero_created'),
+            models.Index(fields=['nombre'], name='idx_archived_hero_nombre'),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} (archivado, Team: {self.team.nombre}, Nivel: {self.nivel})"
+
+    def __repr__(self):
+        return f"<ArchivedHero(id={self.id}, nombre='{self.nombre}', team_id={self.team_id})>"
+
+
+class HeroShard(models.Model):
+    """
+    Índice de sharding: en qué base (alias de settings.HERO_SHARDS) está
+    cada héroe. Vive siempre en `default`.
+
+    Su ID autoincremental es también el ID del héroe: al crear un héroe
+    primero se inserta acá (así los IDs no se repiten entre shards) y
+    después el héroe con ese ID en su shard.
+    """
+    id = models.AutoField(
+        primary_key=True,
+        editable=False,
+        verbose_name="ID del héroe"
+    )
+
+    shard = models.CharField(
+        max_length=64,
+        verbose_name="Shard",
+        help_text="Alias de la base de datos donde está el héroe"
+    )
+
+    class Meta:
+        db_table = 'hero_shards'
+        verbose_name = 'Shard de héroe'
+        verbose_name_plural = 'Shards de héroes'
+
+    def __str__(self):
+        return f"Héroe {self.id} -> {self.shard}"
+
+    def __repr__(self):
+        return f"<HeroShard(id={self.id}, shard='{self.shard}')>"
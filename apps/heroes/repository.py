@@ -12,11 +12,73 @@ Responsabilidades:
 IMPORTANTE sobre relaciones:
 - Usamos select_related('team') para traer el team en la misma query
 - Esto evita el problema de N+1 queries (muy importante en ORMs)
+
+Identity Map (apps/core/identity_map.py):
+- Las lecturas por ID consultan primero el Identity Map del request
+- Cada héroe leído (y su team) se registra: la misma fila no se vuelve a
+  consultar en el mismo request (Service y Repository comparten el objeto)
+
+Métodos async (prefijo a, para las vistas async bajo ASGI):
+- Mismas queries con el ORM async de Django (aget, acount, aaggregate,
+  asave, adelete, aexists e iteración con async for)
+- Mismo uso del Identity Map y mismas invalidaciones de caché
+
+Sharding (apps/heroes/sharding.py): con settings.HERO_SHARDS cada método
+delega en ShardedHeroRepository, que elige el shard del héroe (por
+team_id o por el índice hero_shards). Los métodos async lo llaman con
+sync_to_async.
+
+Archivo (ArchivedHero, `manage.py archive_heroes`): los heroes viejos
+pasan a la tabla heroes_archive.
+- Las lecturas por ID y por nombre la consultan solo si el héroe no está
+  en heroes; update/delete funcionan igual sobre un héroe archivado
+- El nombre único se valida contra las dos tablas (una sola query UNION)
+- Los listados la incluyen con include_archived: como todos los
+  archivados son más viejos, la página sigue en heroes_archive donde
+  termina heroes (sin mezclar ni ordenar las dos tablas)
+- Las versiones async con include_archived llaman a las sync con
+  sync_to_async (es el camino frío)
 """
-from typing import Optional, List, Tuple
-from .models import Hero
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple, Type, Union
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from . import sharding
+from .cache import hero_cache, hero_shard_cache
+from apps.core import identity_map
+from apps.core.group_commit import after_commit
+from apps.core.page_cache import bump_generation
+from .models import ArchivedHero, Hero
 from apps.teams.models import Team
 
+# Un héroe de la tabla heroes o de heroes_archive (mismos campos)
+AnyHero = Union[Hero, ArchivedHero]
+
+
+def in_any_table(exclude_id: Optional[int] = None, **filters):
+    """
+    SELECT de heroes UNION heroes_archive con los mismos filtros (para
+    exists(): una sola query contra las dos tablas), sin el héroe exclude_id.
+    """
+    querysets = []
+    for model in (Hero, ArchivedHero):
+        queryset = model.objects.filter(**filters)
+        if exclude_id is not None:
+            queryset = queryset.exclude(id=exclude_id)
+        querysets.append(queryset.values('id'))
+    return querysets[0].union(querysets[1])
+
+
+def combine_versions(versions: List[Tuple[int, Optional[datetime]]]) -> Tuple[int, Optional[datetime]]:
+    """
+    Suma los COUNT y toma el MAX(fecha_actualizacion) de varias versiones
+    (varias tablas o varios shards).
+    """
+    dates = [last_modified for _, last_modified in versions if last_modified is not None]
+    return sum(total for total, _ in versions), max(dates) if dates else None
+
 
 class HeroRepository:
     """
@@ -25,6 +87,16 @@ class HeroRepository:
     Todos los métodos son @staticmethod porque no necesitan estado.
     """
 
+    @staticmethod
+    def writes_span_databases() -> bool:
+        """
+        True con sharding: crear o mudar un héroe escribe el índice
+        hero_shards en `default` y el héroe en su shard, cada uno con su
+        propio commit. Esas escrituras no pasan por group commit: si el lote
+        se deshiciera, el shard quedaría con un héroe sin entrada en el índice.
+        """
+        return sharding.is_enabled()
+
     @staticmethod
     def create_hero(
         nombre: str,
@@ -45,7 +117,15 @@ class HeroRepository:
 
         Returns:
             Hero: Objeto Hero creado con su ID asignado
+
+        Es un único INSERT: en SQLite >= 3.35 (y PostgreSQL) Django obtiene
+        el ID con INSERT ... RETURNING, las fechas se asignan en Python
+        (auto_now_add/auto_now) y el team ya viene cargado, así que no hace
+        falta volver a leer la fila (refresh_from_db).
         """
+        if sharding.is_enabled():
+            return ShardedHeroRepository.create_hero(nombre, team, descripcion, poder_principal, nivel)
+
         hero = Hero.objects.create(
             nombre=nombre,
             team=team,
@@ -53,12 +133,15 @@ class HeroRepository:
             poder_principal=poder_principal,
             nivel=nivel
         )
-        # Recargar para obtener el team completo
-        hero.refresh_from_db()
+        identity_map.register(hero)
+
+        # Las páginas cacheadas de heroes quedan obsoletas (con group commit,
+        # al confirmarse el lote)
+        after_commit(lambda: bump_generation('heroes'))
         return hero
 
     @staticmethod
-    def get_hero_by_id(hero_id: int) -> Optional[Hero]:
+    def get_hero_by_id(hero_id: int) -> Optional[AnyHero]:
         """
         Obtiene un héroe por su ID.
 
@@ -69,16 +152,29 @@ class HeroRepository:
             hero_id: ID del héroe a buscar
 
         Returns:
-            Hero si existe, None si no se encuentra
+            Hero (o ArchivedHero si está archivado) si existe, None si no se encuentra
         """
+        hero = identity_map.lookup(Hero, hero_id) or identity_map.lookup(ArchivedHero, hero_id)
+        if hero is not None:
+            return hero
+
+        if sharding.is_enabled():
+            return ShardedHeroRepository.get_hero_by_id(hero_id)
+
         try:
             # select_related('team') hace un JOIN y trae el team en la misma query
-            return Hero.objects.select_related('team').get(id=hero_id)
+            hero = Hero.objects.select_related('team').get(id=hero_id)
         except Hero.DoesNotExist:
-            return None
+            # No está en la tabla caliente: puede estar archivado
+            hero = ArchivedHero.objects.select_related('team').filter(id=hero_id).first()
+            if hero is None:
+                return None
+
+        identity_map.register(hero.team)
+        return identity_map.register(hero)
 
     @staticmethod
-    def get_hero_by_name(nombre: str) -> Optional[Hero]:
+    def get_hero_by_name(nombre: str) -> Optional[AnyHero]:
         """
         Obtiene un héroe por su nombre (búsqueda exacta).
 
@@ -86,15 +182,24 @@ class HeroRepository:
             nombre: Nombre exacto del héroe
 
         Returns:
-            Hero si existe, None si no se encuentra
+            Hero (o ArchivedHero si está archivado) si existe, None si no se encuentra
         """
+        if sharding.is_enabled():
+            return ShardedHeroRepository.get_hero_by_name(nombre)
+
         try:
-            return Hero.objects.select_related('team').get(nombre=nombre)
+            hero = Hero.objects.select_related('team').get(nombre=nombre)
         except Hero.DoesNotExist:
-            return None
+            hero = ArchivedHero.objects.select_related('team').filter(nombre=nombre).first()
+            if hero is None:
+                return None
+
+        identity_map.register(hero.team)
+        return identity_map.register(hero)
 
     @staticmethod
-    def get_all_heroes(offset: int = 0, limit: int = 10) -> Tuple[List[Hero], int]:
+    def get_all_heroes(offset: int = 0, limit: int = 10,
+                       include_archived: bool = False) -> Tuple[List[AnyHero], int]:
         """
         Obtiene todos los héroes con paginación.
 
@@ -104,17 +209,23 @@ class HeroRepository:
         Args:
             offset: Índice de inicio (default: 0)
             limit: Cantidad de resultados (default: 10)
+            include_archived: Incluir los heroes archivados (default: False)
 
         Returns:
             Tuple[List[Hero], int]: (Lista de heroes, Total de heroes)
         """
+        if include_archived or sharding.is_enabled():
+            return (HeroRepository.list_heroes(offset, limit, include_archived),
+                    HeroRepository.count_heroes(include_archived))
+
         queryset = Hero.objects.select_related('team').all().order_by('-fecha_creacion')
         total = queryset.count()
         heroes = list(queryset[offset:offset + limit])
         return heroes, total
 
     @staticmethod
-    def get_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10) -> Tuple[List[Hero], int]:
+    def get_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10,
+                           include_archived: bool = False) -> Tuple[List[AnyHero], int]:
         """
         Obtiene todos los héroes de un equipo específico con paginación.
 
@@ -124,15 +235,50 @@ class HeroRepository:
             team_id: ID del equipo
             offset: Índice de inicio (default: 0)
             limit: Cantidad de resultados (default: 10)
+            include_archived: Incluir los heroes archivados (default: False)
 
         Returns:
             Tuple[List[Hero], int]: (Lista de heroes del team, Total de heroes del team)
         """
+        if include_archived or sharding.is_enabled():
+            return (HeroRepository.list_heroes_by_team(team_id, offset, limit, include_archived),
+                    HeroRepository.count_heroes_by_team(team_id, include_archived))
+
         queryset = Hero.objects.select_related('team').filter(team_id=team_id).order_by('-fecha_creacion')
         total = queryset.count()
         heroes = list(queryset[offset:offset + limit])
         return heroes, total
 
+    @staticmethod
+    def get_heroes_version(team_id: Optional[int] = None,
+                           include_archived: bool = False) -> Tuple[int, Optional[datetime]]:
+        """
+        Obtiene la "versión" del listado de héroes: COUNT + MAX(fecha_actualizacion).
+
+        Es una sola query agregada (sin JOIN ni serialización) que cambia
+        cada vez que se crea, modifica o elimina un héroe. Se usa para
+        calcular ETag/Last-Modified de los listados.
+
+        Args:
+            team_id: Si se indica, solo considera los héroes de ese equipo
+            include_archived: Sumar también heroes_archive (una query más)
+
+        Returns:
+            Tuple[int, Optional[datetime]]: (Total de heroes, Última modificación)
+        """
+        models = (Hero, ArchivedHero) if include_archived else (Hero,)
+        if sharding.is_enabled():
+            return combine_versions([ShardedHeroRepository.get_heroes_version(team_id, model) for model in models])
+
+        versions = []
+        for model in models:
+            queryset = model.objects.all()
+            if team_id is not None:
+                queryset = queryset.filter(team_id=team_id)
+            version = queryset.aggregate(total=Count('id'), last_modified=Max('fecha_actualizacion'))
+            versions.append((version['total'], version['last_modified']))
+        return combine_versions(versions)
+
     @staticmethod
     def update_hero(
         hero_id: int,
@@ -141,11 +287,16 @@ class HeroRepository:
         poder_principal: Optional[str] = None,
         nivel: Optional[int] = None,
         team: Optional[Team] = None
-    ) -> Optional[Hero]:
+    ) -> Optional[AnyHero]:
         """
         Actualiza un héroe existente.
 
         Solo actualiza los campos que NO sean None.
+        fecha_actualizacion se actualiza automáticamente (auto_now) en save().
+
+        Escribe solo las columnas modificadas (save(update_fields=...)) y no
+        vuelve a leer la fila: el objeto ya tiene los valores guardados y el
+        team asignado.
 
         Args:
             hero_id: ID del héroe a actualizar
@@ -158,27 +309,56 @@ class HeroRepository:
         Returns:
             Hero actualizado si existe, None si no se encuentra
         """
-        try:
-            hero = Hero.objects.select_related('team').get(id=hero_id)
+        # Normalmente ya está en el Identity Map (el Service lo leyó para validar)
+        hero = HeroRepository.get_hero_by_id(hero_id)
+        if hero is None:
+            return None
 
-            # Actualizar solo los campos que se proporcionaron
-            if nombre is not None:
-                hero.nombre = nombre
-            if descripcion is not None:
-                hero.descripcion = descripcion
-            if poder_principal is not None:
-                hero.poder_principal = poder_principal
-            if nivel is not None:
-                hero.nivel = nivel
-            if team is not None:
-                hero.team = team
+        # Actualizar solo los campos que se proporcionaron
+        update_fields = HeroRepository._apply_changes(hero, nombre, descripcion, poder_principal, nivel, team)
+        if sharding.is_enabled():
+            ShardedHeroRepository.save_hero(hero, update_fields)
+        else:
+            hero.save(update_fields=update_fields)
 
-            hero.save()
-            hero.refresh_from_db()
-            return hero
+        # La representación y las páginas cacheadas ya no son válidas
+        # (con group commit, al confirmarse el lote)
+        def invalidate():
+            hero_cache.invalidate(hero_id)
+            bump_generation('heroes')
 
-        except Hero.DoesNotExist:
-            return None
+        after_commit(invalidate)
+        return hero
+
+    @staticmethod
+    def _apply_changes(
+        hero: Hero,
+        nombre: Optional[str],
+        descripcion: Optional[str],
+        poder_principal: Optional[str],
+        nivel: Optional[int],
+        team: Optional[Team]
+    ) -> List[str]:
+        """
+        Asigna los campos que NO sean None y retorna los update_fields del save().
+        """
+        update_fields = ['fecha_actualizacion']
+        if nombre is not None:
+            hero.nombre = nombre
+            update_fields.append('nombre')
+        if descripcion is not None:
+            hero.descripcion = descripcion
+            update_fields.append('descripcion')
+        if poder_principal is not None:
+            hero.poder_principal = poder_principal
+            update_fields.append('poder_principal')
+        if nivel is not None:
+            hero.nivel = nivel
+            update_fields.append('nivel')
+        if team is not None:
+            hero.team = team
+            update_fields.append('team')
+        return update_fields
 
     @staticmethod
     def delete_hero(hero_id: int) -> bool:
@@ -191,12 +371,23 @@ class HeroRepository:
         Returns:
             bool: True si se eliminó, False si no existía
         """
-        try:
-            hero = Hero.objects.get(id=hero_id)
-            hero.delete()
-            return True
-        except Hero.DoesNotExist:
-            return False
+        if sharding.is_enabled():
+            return ShardedHeroRepository.delete_hero(hero_id)
+
+        hero = identity_map.lookup(Hero, hero_id) or identity_map.lookup(ArchivedHero, hero_id)
+        if hero is None:
+            try:
+                hero = Hero.objects.get(id=hero_id)
+            except Hero.DoesNotExist:
+                hero = ArchivedHero.objects.filter(id=hero_id).first()
+                if hero is None:
+                    return False
+
+        hero.delete()
+        identity_map.forget(type(hero), hero_id)
+        hero_cache.invalidate(hero_id)
+        bump_generation('heroes')
+        return True
 
     @staticmethod
     def exists_by_id(hero_id: int) -> bool:
@@ -209,23 +400,31 @@ class HeroRepository:
         Returns:
             bool: True si existe, False si no
         """
-        return Hero.objects.filter(id=hero_id).exists()
+        if sharding.is_enabled():
+            return ShardedHeroRepository.exists_by_id(hero_id)
+
+        if identity_map.lookup(Hero, hero_id) is not None:
+            return True
+        return in_any_table(id=hero_id).exists()
 
     @staticmethod
-    def exists_by_name(nombre: str) -> bool:
+    def exists_by_name(nombre: str, exclude_id: Optional[int] = None) -> bool:
         """
         Verifica si existe un héroe con el nombre dado.
 
         Args:
             nombre: Nombre del héroe
+            exclude_id: ID de un héroe a ignorar (el que se está modificando)
 
         Returns:
-            bool: True si existe, False si no
+            bool: True si existe, False si no (en heroes o en heroes_archive)
         """
-        return Hero.objects.filter(nombre=nombre).exists()
+        if sharding.is_enabled():
+            return ShardedHeroRepository.exists_by_name(nombre, exclude_id)
+        return in_any_table(exclude_id, nombre=nombre).exists()
 
     @staticmethod
-    def count_heroes_by_team(team_id: int) -> int:
+    def count_heroes_by_team(team_id: int, include_archived: bool = False) -> int:
         """
         Cuenta cuántos héroes tiene un equipo.
 
@@ -233,8 +432,546 @@ class HeroRepository:
 
         Args:
             team_id: ID del equipo
+            include_archived: Contar también los archivados
 
         Returns:
             int: Cantidad de heroes en el equipo
         """
-        return Hero.objects.filter(team_id=team_id).count()
+        total = HeroRepository._count(Hero, team_id)
+        if include_archived:
+            total += HeroRepository._count(ArchivedHero, team_id)
+        return total
+
+    @staticmethod
+    def count_heroes(include_archived: bool = False) -> int:
+        """
+        Cuenta todos los héroes (el COUNT de get_all_heroes, por separado
+        para que el Service lo ejecute en paralelo con la página).
+
+        Args:
+            include_archived: Contar también los archivados
+
+        Returns:
+            int: Total de heroes
+        """
+        total = HeroRepository._count(Hero)
+        if include_archived:
+            total += HeroRepository._count(ArchivedHero)
+        return total
+
+    @staticmethod
+    def list_heroes(offset: int = 0, limit: int = 10, include_archived: bool = False) -> List[AnyHero]:
+        """
+        Obtiene una página de héroes (sin el COUNT), con select_related('team').
+
+        Args:
+            offset: Índice de inicio (default: 0)
+            limit: Cantidad de resultados (default: 10)
+            include_archived: Seguir con heroes_archive cuando se acaba heroes
+
+        Returns:
+            List[Hero]: Heroes de la página
+        """
+        heroes = HeroRepository._page(Hero, offset, limit)
+        if include_archived:
+            heroes += HeroRepository._archived_continuation(heroes, offset, limit)
+        return heroes
+
+    @staticmethod
+    def list_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10,
+                            include_archived: bool = False) -> List[AnyHero]:
+        """
+        Obtiene una página de los héroes de un equipo (sin el COUNT).
+
+        Args:
+            team_id: ID del equipo
+            offset: Índice de inicio (default: 0)
+            limit: Cantidad de resultados (default: 10)
+            include_archived: Seguir con heroes_archive cuando se acaban los del team en heroes
+
+        Returns:
+            List[Hero]: Heroes de la página
+        """
+        heroes = HeroRepository._page(Hero, offset, limit, team_id)
+        if include_archived:
+            heroes += HeroRepository._archived_continuation(heroes, offset, limit, team_id)
+        return heroes
+
+    @staticmethod
+    def _page(model: Type[AnyHero], offset: int, limit: int, team_id: Optional[int] = None) -> List[AnyHero]:
+        """
+        Página de una tabla (heroes o heroes_archive), de la más nueva a la más vieja.
+        """
+        if sharding.is_enabled():
+            if team_id is None:
+                return ShardedHeroRepository.list_heroes(offset, limit, model)
+            return ShardedHeroRepository.list_heroes_by_team(team_id, offset, limit, model)
+
+        queryset = model.objects.select_related('team')
+        if team_id is not None:
+            queryset = queryset.filter(team_id=team_id)
+        return list(queryset.order_by('-fecha_creacion')[offset:offset + limit])
+
+    @staticmethod
+    def _count(model: Type[AnyHero], team_id: Optional[int] = None) -> int:
+        if sharding.is_enabled():
+            if team_id is None:
+                return ShardedHeroRepository.count_heroes(model)
+            return ShardedHeroRepository.count_heroes_by_team(team_id, model)
+
+        queryset = model.objects.all()
+        if team_id is not None:
+            queryset = queryset.filter(team_id=team_id)
+        return queryset.count()
+
+    @staticmethod
+    def _archived_continuation(heroes: List[Hero], offset: int, limit: int,
+                               team_id: Optional[int] = None) -> List[ArchivedHero]:
+        """
+        Archivados que completan una página de heroes que quedó corta.
+
+        El listado con archivados es heroes seguido de heroes_archive. Si la
+        página de heroes trajo filas (o offset es 0), ahí terminó la tabla
+        caliente; si vino vacía hace falta su COUNT para saber cuántas filas
+        del archivo saltear.
+        """
+        if len(heroes) >= limit:
+            return []
+        hot_total = offset + len(heroes) if heroes or offset == 0 else HeroRepository._count(Hero, team_id)
+        return HeroRepository._page(ArchivedHero, max(offset - hot_total, 0), limit - len(heroes), team_id)
+
+    # ==================== ASYNC (ORM async) ====================
+    @staticmethod
+    async def acreate_hero(
+        nombre: str,
+        team: Team,
+        descripcion: Optional[str] = None,
+        poder_principal: Optional[str] = None,
+        nivel: int = 1
+    ) -> Hero:
+        """
+        Versión async de create_hero().
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.create_hero)(nombre, team, descripcion, poder_principal, nivel)
+
+        hero = await Hero.objects.acreate(
+            nombre=nombre,
+            team=team,
+            descripcion=descripcion,
+            poder_principal=poder_principal,
+            nivel=nivel
+        )
+        identity_map.register(hero)
+
+        bump_generation('heroes')
+        return hero
+
+    @staticmethod
+    async def aget_hero_by_id(hero_id: int) -> Optional[AnyHero]:
+        """
+        Versión async de get_hero_by_id() (con select_related('team')).
+        """
+        hero = identity_map.lookup(Hero, hero_id) or identity_map.lookup(ArchivedHero, hero_id)
+        if hero is not None:
+            return hero
+
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.get_hero_by_id)(hero_id)
+
+        try:
+            hero = await Hero.objects.select_related('team').aget(id=hero_id)
+        except Hero.DoesNotExist:
+            hero = await ArchivedHero.objects.select_related('team').filter(id=hero_id).afirst()
+            if hero is None:
+                return None
+
+        identity_map.register(hero.team)
+        return identity_map.register(hero)
+
+    @staticmethod
+    async def aget_hero_by_name(nombre: str) -> Optional[AnyHero]:
+        """
+        Versión async de get_hero_by_name().
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.get_hero_by_name)(nombre)
+
+        try:
+            hero = await Hero.objects.select_related('team').aget(nombre=nombre)
+        except Hero.DoesNotExist:
+            hero = await ArchivedHero.objects.select_related('team').filter(nombre=nombre).afirst()
+            if hero is None:
+                return None
+
+        identity_map.register(hero.team)
+        return identity_map.register(hero)
+
+    @staticmethod
+    async def aget_all_heroes(offset: int = 0, limit: int = 10,
+                              include_archived: bool = False) -> Tuple[List[AnyHero], int]:
+        """
+        Versión async de get_all_heroes(): COUNT con acount() y la página con async for.
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.get_all_heroes)(offset, limit, include_archived)
+
+        queryset = Hero.objects.select_related('team').all().order_by('-fecha_creacion')
+        total = await queryset.acount()
+        heroes = [hero async for hero in queryset[offset:offset + limit]]
+        return heroes, total
+
+    @staticmethod
+    async def aget_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10,
+                                  include_archived: bool = False) -> Tuple[List[AnyHero], int]:
+        """
+        Versión async de get_heroes_by_team().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.get_heroes_by_team)(team_id, offset, limit, include_archived)
+
+        queryset = Hero.objects.select_related('team').filter(team_id=team_id).order_by('-fecha_creacion')
+        total = await queryset.acount()
+        heroes = [hero async for hero in queryset[offset:offset + limit]]
+        return heroes, total
+
+    @staticmethod
+    async def aget_heroes_version(team_id: Optional[int] = None,
+                                  include_archived: bool = False) -> Tuple[int, Optional[datetime]]:
+        """
+        Versión async de get_heroes_version().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.get_heroes_version)(team_id, include_archived)
+
+        queryset = Hero.objects.all()
+        if team_id is not None:
+            queryset = queryset.filter(team_id=team_id)
+        version = await queryset.aaggregate(total=Count('id'), last_modified=Max('fecha_actualizacion'))
+        return version['total'], version['last_modified']
+
+    @staticmethod
+    async def aupdate_hero(
+        hero_id: int,
+        nombre: Optional[str] = None,
+        descripcion: Optional[str] = None,
+        poder_principal: Optional[str] = None,
+        nivel: Optional[int] = None,
+        team: Optional[Team] = None
+    ) -> Optional[AnyHero]:
+        """
+        Versión async de update_hero() (mismo save(update_fields=...)).
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.update_hero)(
+                hero_id, nombre, descripcion, poder_principal, nivel, team
+            )
+
+        hero = await HeroRepository.aget_hero_by_id(hero_id)
+        if hero is None:
+            return None
+
+        update_fields = HeroRepository._apply_changes(hero, nombre, descripcion, poder_principal, nivel, team)
+        await hero.asave(update_fields=update_fields)
+
+        hero_cache.invalidate(hero_id)
+        bump_generation('heroes')
+        return hero
+
+    @staticmethod
+    async def adelete_hero(hero_id: int) -> bool:
+        """
+        Versión async de delete_hero().
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.delete_hero)(hero_id)
+
+        hero = identity_map.lookup(Hero, hero_id) or identity_map.lookup(ArchivedHero, hero_id)
+        if hero is None:
+            try:
+                hero = await Hero.objects.aget(id=hero_id)
+            except Hero.DoesNotExist:
+                hero = await ArchivedHero.objects.filter(id=hero_id).afirst()
+                if hero is None:
+                    return False
+
+        await hero.adelete()
+        identity_map.forget(type(hero), hero_id)
+        hero_cache.invalidate(hero_id)
+        bump_generation('heroes')
+        return True
+
+    @staticmethod
+    async def aexists_by_id(hero_id: int) -> bool:
+        """
+        Versión async de exists_by_id().
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.exists_by_id)(hero_id)
+
+        if identity_map.lookup(Hero, hero_id) is not None:
+            return True
+        return await in_any_table(id=hero_id).aexists()
+
+    @staticmethod
+    async def aexists_by_name(nombre: str, exclude_id: Optional[int] = None) -> bool:
+        """
+        Versión async de exists_by_name().
+        """
+        if sharding.is_enabled():
+            return await sync_to_async(HeroRepository.exists_by_name)(nombre, exclude_id)
+        return await in_any_table(exclude_id, nombre=nombre).aexists()
+
+    @staticmethod
+    async def acount_heroes(include_archived: bool = False) -> int:
+        """
+        Versión async de count_heroes().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.count_heroes)(include_archived)
+        return await Hero.objects.acount()
+
+    @staticmethod
+    async def acount_heroes_by_team(team_id: int, include_archived: bool = False) -> int:
+        """
+        Versión async de count_heroes_by_team().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.count_heroes_by_team)(team_id, include_archived)
+        return await Hero.objects.filter(team_id=team_id).acount()
+
+    @staticmethod
+    async def alist_heroes(offset: int = 0, limit: int = 10, include_archived: bool = False) -> List[AnyHero]:
+        """
+        Versión async de list_heroes().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.list_heroes)(offset, limit, include_archived)
+
+        queryset = Hero.objects.select_related('team').order_by('-fecha_creacion')
+        return [hero async for hero in queryset[offset:offset + limit]]
+
+    @staticmethod
+    async def alist_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10,
+                                   include_archived: bool = False) -> List[AnyHero]:
+        """
+        Versión async de list_heroes_by_team().
+        """
+        if include_archived or sharding.is_enabled():
+            return await sync_to_async(HeroRepository.list_heroes_by_team)(team_id, offset, limit, include_archived)
+
+        queryset = Hero.objects.select_related('team').filter(team_id=team_id).order_by('-fecha_creacion')
+        return [hero async for hero in queryset[offset:offset + limit]]
+
+
+class ShardedHeroRepository:
+    """
+    Queries de heroes con sharding (settings.HERO_SHARDS). HeroRepository
+    delega acá cuando el sharding está activo; mismos retornos, mismas
+    invalidaciones.
+
+    Los teams están en `default`, así que no hay JOIN (select_related):
+    después de leer los heroes, attach_teams() trae sus teams en una sola
+    query y se los asigna.
+    """
+
+    @staticmethod
+    def attach_teams(heroes: List[Hero]) -> List[Hero]:
+        """
+        Asigna a cada héroe su team (Identity Map o un único SELECT ... IN en default).
+        """
+        teams: Dict[int, Team] = {}
+        missing = set()
+        for team_id in {hero.team_id for hero in heroes}:
+            team = identity_map.lookup(Team, team_id)
+            if team is not None:
+                teams[team_id] = team
+            else:
+                missing.add(team_id)
+        if missing:
+            for team in Team.objects.filter(id__in=missing):
+                teams[team.id] = identity_map.register(team)
+
+        for hero in heroes:
+            if hero.team_id in teams:
+                hero.team = teams[hero.team_id]
+        return heroes
+
+    @staticmethod
+    def create_hero(
+        nombre: str,
+        team: Team,
+        descripcion: Optional[str] = None,
+        poder_principal: Optional[str] = None,
+        nivel: int = 1
+    ) -> Hero:
+        """
+        Reserva el ID en el índice y crea el héroe en el shard de su team.
+        """
+        alias = sharding.shard_for_team(team.id)
+        hero_id = sharding.allocate_id(alias)
+        try:
+            hero = Hero.objects.using(alias).create(
+                id=hero_id,
+                nombre=nombre,
+                team=team,
+                descripcion=descripcion,
+                poder_principal=poder_principal,
+                nivel=nivel
+            )
+        except Exception:
+            sharding.forget([hero_id])
+            raise
+        identity_map.register(hero)
+
+        after_commit(lambda: bump_generation('heroes'))
+        return hero
+
+    @staticmethod
+    def get_hero_by_id(hero_id: int) -> Optional[AnyHero]:
+        """
+        Busca el shard en el índice y lee el héroe de ahí (de heroes o, si
+        está archivado, de heroes_archive del mismo shard). Si no está (otro
+        proceso lo mudó y hero_shard_cache quedó vieja) se consulta el
+        índice una vez más.
+        """
+        for _ in range(2):
+            alias = sharding.locate(hero_id)
+            if alias is None:
+                return None
+            hero = (Hero.objects.using(alias).filter(id=hero_id).first()
+                    or ArchivedHero.objects.using(alias).filter(id=hero_id).first())
+            if hero is not None:
+                ShardedHeroRepository.attach_teams([hero])
+                return identity_map.register(hero)
+            hero_shard_cache.invalidate(hero_id)
+        return None
+
+    @staticmethod
+    def get_hero_by_name(nombre: str) -> Optional[AnyHero]:
+        """
+        El nombre no dice el shard: se busca en cada uno (primero en heroes
+        de todos los shards y después en heroes_archive).
+        """
+        for model in (Hero, ArchivedHero):
+            for alias in sharding.shard_aliases():
+                hero = model.objects.using(alias).filter(nombre=nombre).first()
+                if hero is not None:
+                    ShardedHeroRepository.attach_teams([hero])
+                    return identity_map.register(hero)
+        return None
+
+    @staticmethod
+    def list_heroes(offset: int = 0, limit: int = 10, model: Type[AnyHero] = Hero) -> List[AnyHero]:
+        """
+        Primeras offset + limit filas de cada shard, intercaladas por fecha_creacion.
+        """
+        pages = [
+            list(model.objects.using(alias).order_by('-fecha_creacion', '-id')[:offset + limit])
+            for alias in sharding.shard_aliases()
+        ]
+        return ShardedHeroRepository.attach_teams(sharding.merge_newest(pages, offset, limit))
+
+    @staticmethod
+    def list_heroes_by_team(team_id: int, offset: int = 0, limit: int = 10,
+                            model: Type[AnyHero] = Hero) -> List[AnyHero]:
+        queryset = model.objects.using(sharding.shard_for_team(team_id)).filter(team_id=team_id)
+        heroes = list(queryset.order_by('-fecha_creacion')[offset:offset + limit])
+        return ShardedHeroRepository.attach_teams(heroes)
+
+    @staticmethod
+    def count_heroes(model: Type[AnyHero] = Hero) -> int:
+        return sum(model.objects.using(alias).count() for alias in sharding.shard_aliases())
+
+    @staticmethod
+    def count_heroes_by_team(team_id: int, model: Type[AnyHero] = Hero) -> int:
+        return model.objects.using(sharding.shard_for_team(team_id)).filter(team_id=team_id).count()
+
+    @staticmethod
+    def get_heroes_version(team_id: Optional[int] = None,
+                           model: Type[AnyHero] = Hero) -> Tuple[int, Optional[datetime]]:
+        """
+        COUNT + MAX(fecha_actualizacion) del shard del team, o de todos sumados.
+        """
+        if team_id is not None:
+            queries = [model.objects.using(sharding.shard_for_team(team_id)).filter(team_id=team_id)]
+        else:
+            queries = [model.objects.using(alias).all() for alias in sharding.shard_aliases()]
+
+        versions = []
+        for queryset in queries:
+            version = queryset.aggregate(total=Count('id'), last_modified=Max('fecha_actualizacion'))
+            versions.append((version['total'], version['last_modified']))
+        return combine_versions(versions)
+
+    @staticmethod
+    def save_hero(hero: AnyHero, update_fields: List[str]) -> None:
+        """
+        Guarda los cambios de update_hero(). Si el team nuevo está en otro
+        shard, el héroe se muda: se inserta en el shard nuevo con el mismo
+        ID y fecha_creacion, se actualiza el índice y se borra del viejo
+        (un héroe archivado se muda al archivo del shard nuevo).
+        """
+        source = hero._state.db
+        target = sharding.shard_for_team(hero.team_id)
+        if source == target:
+            hero.save(using=source, update_fields=update_fields)
+            return
+
+        # raw=True: INSERT con los valores tal cual (auto_now_add pisaría fecha_creacion)
+        hero.fecha_actualizacion = timezone.now()
+        with transaction.atomic(using=target):
+            hero.save_base(using=target, raw=True, force_insert=True)
+        sharding.relocate(hero.id, target)
+        type(hero).objects.using(source).filter(id=hero.id).delete()
+
+    @staticmethod
+    def delete_hero(hero_id: int) -> bool:
+        hero = identity_map.lookup(Hero, hero_id) or identity_map.lookup(ArchivedHero, hero_id)
+        alias = hero._state.db if hero is not None else sharding.locate(hero_id)
+        if alias is None:
+            return False
+
+        deleted, _ = Hero.objects.using(alias).filter(id=hero_id).delete()
+        if not deleted:
+            deleted, _ = ArchivedHero.objects.using(alias).filter(id=hero_id).delete()
+        sharding.forget([hero_id])
+        identity_map.forget(Hero, hero_id)
+        identity_map.forget(ArchivedHero, hero_id)
+        hero_cache.invalidate(hero_id)
+        bump_generation('heroes')
+        return deleted > 0
+
+    @staticmethod
+    def delete_heroes_by_team(team_id: int) -> int:
+        """
+        Elimina los heroes de un team, activos y archivados (el CASCADE de
+        Django solo alcanza a la base del team). Lo llama
+        TeamRepository.delete_team().
+
+        Returns:
+            int: Cantidad de heroes eliminados
+        """
+        alias = sharding.shard_for_team(team_id)
+        hero_ids = []
+        for model in (Hero, ArchivedHero):
+            queryset = model.objects.using(alias).filter(team_id=team_id)
+            model_ids = list(queryset.values_list('id', flat=True))
+            queryset.delete()
+            for hero_id in model_ids:
+                identity_map.forget(model, hero_id)
+            hero_ids += model_ids
+        sharding.forget(hero_ids)
+        return len(hero_ids)
+
+    @staticmethod
+    def exists_by_id(hero_id: int) -> bool:
+        if identity_map.lookup(Hero, hero_id) is not None:
+            return True
+        return sharding.locate(hero_id) is not None
+
+    @staticmethod
+    def exists_by_name(nombre: str, exclude_id: Optional[int] = None) -> bool:
+        return any(
+            in_any_table(exclude_id, nombre=nombre).using(alias).exists() for alias in sharding.shard_aliases()
+        )
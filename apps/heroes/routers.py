@@ -14,15 +14,22 @@ El router genera automáticamente las siguientes rutas:
 - GET    /heroes/{pk}/by-team/       → get_by_team() (custom action)
 
 Nota: El prefijo 'api/' se agrega en config/urls.py
+
+Con ASYNC_VIEWS activo (pensado para ASGI) las mismas rutas
+las atiende AsyncHeroViewSet.
 """
+from django.conf import settings
 from rest_framework.routers import DefaultRouter
-from .views import HeroViewSet
+from .views import AsyncHeroViewSet, HeroViewSet
 
 
-def get_heroes_router():
+def get_heroes_router(async_views: bool = None):
     """
     Crea y configura el router para Heroes.
 
+    Args:
+        async_views: Usar AsyncHeroViewSet (default: settings.ASYNC_VIEWS)
+
     Returns:
         DefaultRouter: Router configurado con HeroViewSet
     """
@@ -31,8 +38,12 @@ def get_heroes_router():
     # Registrar el ViewSet
     # - r'heroes': Prefijo de URL (se convierte en /heroes/)
     # - HeroViewSet: La clase ViewSet que maneja las operaciones
+    #   (AsyncHeroViewSet bajo ASGI con ASYNC_VIEWS)
     # - basename='hero': Nombre base para las rutas (se usa para reverse URLs)
-    router.register(r'heroes', HeroViewSet, basename='hero')
+    if async_views is None:
+        async_views = settings.ASYNC_VIEWS
+    viewset = AsyncHeroViewSet if async_views else HeroViewSet
+    router.register(r'heroes', viewset, basename='hero')
 
     return router
 
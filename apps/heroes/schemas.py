@@ -13,6 +13,35 @@ Importante sobre la relación con Team:
 from rest_framework import serializers
 from .models import Hero
 from apps.teams.models import Team
+from apps.teams.repository import TeamRepository
+
+
+# ========== CAMPO team_id ==========
+class TeamIdField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que resuelve el team con TeamRepository.get_cached_team_by_id.
+
+    Así la validación del schema y el HeroService comparten la misma caché
+    de teams (team_lookup_cache): el team se consulta una sola vez por
+    request (y ninguna si ya estaba en caché).
+
+    El queryset se mantiene para la documentación Swagger y los mensajes
+    de error estándar de DRF.
+    """
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            team_id = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        team = TeamRepository.get_cached_team_by_id(team_id)
+        if team is None:
+            self.fail('does_not_exist', pk_value=data)
+        return team
 
 
 # ========== SERIALIZER ANIDADO PARA TEAM ==========
@@ -58,9 +87,11 @@ class HeroCreateSchema(serializers.ModelSerializer):
     Campos automáticos (NO enviar):
     - id: Se genera automáticamente
     - fecha_creacion: Se genera automáticamente
+    - fecha_actualizacion: Se actualiza automáticamente en cada escritura
     """
     # Usamos PrimaryKeyRelatedField para aceptar solo el ID del team
-    team_id = serializers.PrimaryKeyRelatedField(
+    # (TeamIdField: la consulta pasa por la caché de teams)
+    team_id = TeamIdField(
         queryset=Team.objects.all(),
         source='team',
         write_only=True,
@@ -117,6 +148,7 @@ class HeroReadSchema(serializers.ModelSerializer):
     Incluye TODOS los campos del modelo, incluyendo:
     - id: ID del héroe
     - fecha_creacion: Fecha de creación
+    - fecha_actualizacion: Fecha de la última modificación
     - team_id: ID del equipo
     - team: Información completa del equipo (anidada)
 
@@ -139,9 +171,10 @@ class HeroReadSchema(serializers.ModelSerializer):
             'nivel',
             'team_id',      # ID del team (para referencia rápida)
             'team',         # Objeto completo del team (para ver detalles)
-            'fecha_creacion'
+            'fecha_creacion',
+            'fecha_actualizacion'
         ]
-        read_only_fields = ['id', 'fecha_creacion', 'team_id', 'team']
+        read_only_fields = ['id', 'fecha_creacion', 'fecha_actualizacion', 'team_id', 'team']
 
 
 # ========== UPDATE SCHEMA ==========
@@ -162,7 +195,7 @@ class HeroUpdateSchema(serializers.ModelSerializer):
     - id (nunca se puede cambiar)
     - fecha_creacion (se establece solo al crear)
     """
-    team_id = serializers.PrimaryKeyRelatedField(
+    team_id = TeamIdField(
         queryset=Team.objects.all(),
         source='team',
         required=False,  # Opcional al actualizar
@@ -13,12 +13,34 @@ Responsabilidades:
 NO maneja:
 - Requests/Responses HTTP (eso es responsabilidad de Views)
 - Queries directas a la BD (eso es responsabilidad de Repository)
+
+Los métodos con prefijo a son las versiones async (vistas async bajo ASGI):
+mismas validaciones, en el mismo orden y con los mismos mensajes, sobre
+los métodos async del Repository.
+
+Lecturas independientes (apps/core/concurrency.py): cuando un método
+necesita varias lecturas que no dependen entre sí (nombre único + team,
+team + COUNT + página) las declara juntas en run_concurrently()/
+arun_concurrently() y después valida los resultados en el orden de siempre.
+
+Group commit (apps/core/group_commit.py): create_hero y update_hero llevan
+@batched_write; con GROUP_COMMIT['enabled'] corren completos (validaciones
++ escritura) en el thread escritor, que confirma varias escrituras en una
+sola transacción. Las versiones async delegan en ellas con asubmit(). Con
+sharding (HERO_SHARDS) no: cada escritura toca `default` y un shard
+(HeroRepository.writes_span_databases()).
 """
 from typing import Dict, Any
 from rest_framework.exceptions import ValidationError, NotFound
 from .repository import HeroRepository
 from apps.teams.repository import TeamRepository
+from .cache import hero_cache, heroes_page_cache, heroes_by_team_page_cache
 from .models import Hero
+from .schemas import HeroReadSchema
+from apps.core.cache import DeferredRepresentation, Representation
+from apps.core import group_commit
+from apps.core.concurrency import arun_concurrently, run_concurrently
+from apps.core.conditional import Validators, build_validators, latest
 
 
 class HeroService:
@@ -34,6 +56,7 @@ class HeroService:
         self.team_repository = TeamRepository()
 
     # ==================== CREATE ====================
+    @group_commit.batched_write(unless=HeroRepository.writes_span_databases)
     def create_hero(
         self,
         nombre: str,
@@ -74,14 +97,19 @@ class HeroService:
         if len(nombre) > 255:
             raise ValidationError({"nombre": "El nombre no puede exceder 255 caracteres"})
 
+        # Lecturas independientes de las validaciones 3 y 4
+        name_taken, team = run_concurrently(
+            lambda: self.hero_repository.exists_by_name(nombre.strip()),
+            lambda: self.team_repository.get_cached_team_by_id(team_id),
+        )
+
         # Validación 3: Nombre único
-        if self.hero_repository.exists_by_name(nombre.strip()):
+        if name_taken:
             raise ValidationError({
                 "nombre": f"Ya existe un héroe con el nombre '{nombre.strip()}'"
             })
 
         # Validación 4: Team debe existir
-        team = self.team_repository.get_team_by_id(team_id)
         if not team:
             raise ValidationError({
                 "team_id": f"No existe un equipo con ID {team_id}"
@@ -140,6 +168,43 @@ class HeroService:
 
         return hero
 
+    # ==================== READ BY ID (CACHÉ) ====================
+    def get_hero_representation(self, hero_id: int) -> DeferredRepresentation:
+        """
+        Obtiene la representación serializada de un héroe (read-through cache).
+
+        En un acierto de caché no se consulta la base de datos ni se
+        ejecuta HeroReadSchema. En un fallo se usa get_hero_by_id() y se
+        calculan los validadores; HeroReadSchema corre (y la representación
+        se guarda) recién con build(), así un 304/HEAD no serializa.
+
+        Args:
+            hero_id: ID del héroe
+
+        Returns:
+            DeferredRepresentation: validadores ETag/Last-Modified + build()
+
+        Raises:
+            ValidationError: Si el ID no es válido
+            NotFound: Si el héroe no existe
+        """
+        if hero_id <= 0:
+            raise ValidationError({"id": "El ID debe ser un número positivo"})
+
+        representation, token = hero_cache.lookup(hero_id)
+        if representation is not None:
+            return DeferredRepresentation.ready(representation)
+
+        hero = self.get_hero_by_id(hero_id)
+        validators = self.get_hero_validators(hero)
+
+        def build() -> Representation:
+            representation = Representation(HeroReadSchema(hero).data, validators)
+            hero_cache.store(hero_id, token, representation)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
     # ==================== READ BY NAME ====================
     def get_hero_by_name(self, nombre: str) -> Hero:
         """
@@ -171,7 +236,7 @@ class HeroService:
         return hero
 
     # ==================== READ ALL ====================
-    def get_all_heroes(self, offset: int = 0, limit: int = 10) -> Dict[str, Any]:
+    def get_all_heroes(self, offset: int = 0, limit: int = 10, include_archived: bool = False) -> Dict[str, Any]:
         """
         Obtiene todos los héroes con paginación.
 
@@ -182,6 +247,7 @@ class HeroService:
         Args:
             offset: Índice de inicio (default: 0)
             limit: Cantidad de resultados (default: 10, max: 100)
+            include_archived: Incluir los heroes archivados, después de los activos (default: False)
 
         Returns:
             Dict con heroes, total, offset, limit, has_next, has_previous
@@ -197,8 +263,11 @@ class HeroService:
         if limit < 1 or limit > 100:
             raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
 
-        # Obtener heroes
-        heroes, total = self.hero_repository.get_all_heroes(offset, limit)
+        # Obtener heroes (COUNT y página en paralelo)
+        total, heroes = run_concurrently(
+            lambda: self.hero_repository.count_heroes(include_archived),
+            lambda: self.hero_repository.list_heroes(offset, limit, include_archived),
+        )
 
         # Calcular has_next y has_previous
         has_next = (offset + limit) < total
@@ -214,7 +283,8 @@ class HeroService:
         }
 
     # ==================== READ HEROES BY TEAM ====================
-    def get_heroes_by_team(self, team_id: int, offset: int = 0, limit: int = 10) -> Dict[str, Any]:
+    def get_heroes_by_team(self, team_id: int, offset: int = 0, limit: int = 10,
+                           include_archived: bool = False) -> Dict[str, Any]:
         """
         Obtiene todos los héroes de un equipo específico con paginación.
 
@@ -227,6 +297,7 @@ class HeroService:
             team_id: ID del equipo
             offset: Índice de inicio (default: 0)
             limit: Cantidad de resultados (default: 10, max: 100)
+            include_archived: Incluir los heroes archivados, después de los activos (default: False)
 
         Returns:
             Dict con heroes, total, offset, limit, has_next, has_previous, team_info
@@ -235,8 +306,17 @@ class HeroService:
             ValidationError: Si los parámetros son inválidos
             NotFound: Si el team no existe
         """
+        # Lecturas independientes: team, COUNT y página
+        # (la página solo si la paginación es válida: no se consulta con un offset negativo)
+        reads = [lambda: self.team_repository.get_team_by_id(team_id)]
+        if offset >= 0 and 1 <= limit <= 100:
+            reads += [
+                lambda: self.hero_repository.count_heroes_by_team(team_id, include_archived),
+                lambda: self.hero_repository.list_heroes_by_team(team_id, offset, limit, include_archived),
+            ]
+        team, *page = run_concurrently(*reads)
+
         # Validación 1: Team debe existir
-        team = self.team_repository.get_team_by_id(team_id)
         if not team:
             raise NotFound({"detail": f"No existe un equipo con ID {team_id}"})
 
@@ -248,8 +328,7 @@ class HeroService:
         if limit < 1 or limit > 100:
             raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
 
-        # Obtener heroes del team
-        heroes, total = self.hero_repository.get_heroes_by_team(team_id, offset, limit)
+        total, heroes = page
 
         # Calcular has_next y has_previous
         has_next = (offset + limit) < total
@@ -269,7 +348,193 @@ class HeroService:
             }
         }
 
+    # ==================== PÁGINAS SERIALIZADAS (CACHÉ) ====================
+    def get_heroes_page(self, offset: int = 0, limit: int = 10,
+                        include_archived: bool = False) -> DeferredRepresentation:
+        """
+        Obtiene una página del listado de héroes ya serializada.
+
+        Pasa por heroes_page_cache: una página fresca se sirve sin COUNT,
+        sin JOIN y sin serializer. Si algún héroe/team cambió, la página
+        vieja puede servirse (hasta max_stale segundos) mientras se
+        recalcula en segundo plano. Sin página cacheada solo se calculan
+        los validadores (get_heroes_validators); COUNT, página y serializer
+        corren recién con build(), así un 304/HEAD no los ejecuta.
+
+        Args:
+            offset: Índice de inicio (default: 0)
+            limit: Cantidad de resultados (default: 10, max: 100)
+            include_archived: Incluir los heroes archivados (default: False)
+
+        Returns:
+            DeferredRepresentation: validadores ETag + build() de la página
+
+        Raises:
+            ValidationError: Si los parámetros de paginación son inválidos
+        """
+        # Validadores primero: si hay una escritura en medio, el ETag
+        # queda "más viejo" que los datos y el cliente vuelve a pedirlos
+        def validate() -> Validators:
+            return self.get_heroes_validators(offset=offset, limit=limit, include_archived=include_archived)
+
+        def build_page(validators: Validators) -> Representation:
+            result = self.get_all_heroes(offset=offset, limit=limit, include_archived=include_archived)
+            data = {
+                "heroes": HeroReadSchema(result['heroes'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous']
+            }
+            return Representation(data, validators)
+
+        return heroes_page_cache.lookup(
+            {'offset': offset, 'limit': limit, 'include_archived': include_archived},
+            validate,
+            build_page
+        )
+
+    def get_heroes_by_team_page(self, team_id: int, offset: int = 0, limit: int = 10,
+                                include_archived: bool = False) -> DeferredRepresentation:
+        """
+        Obtiene una página de los héroes de un equipo ya serializada
+        (misma estrategia de caché que get_heroes_page).
+
+        Args:
+            team_id: ID del equipo
+            offset: Índice de inicio (default: 0)
+            limit: Cantidad de resultados (default: 10, max: 100)
+            include_archived: Incluir los heroes archivados (default: False)
+
+        Returns:
+            DeferredRepresentation: validadores ETag + build() de la página
+
+        Raises:
+            ValidationError: Si los parámetros son inválidos
+            NotFound: Si el team no existe
+        """
+        def validate() -> Validators:
+            return self.get_heroes_by_team_validators(
+                team_id=team_id, offset=offset, limit=limit, include_archived=include_archived
+            )
+
+        def build_page(validators: Validators) -> Representation:
+            result = self.get_heroes_by_team(team_id=team_id, offset=offset, limit=limit,
+                                             include_archived=include_archived)
+            data = {
+                "heroes": HeroReadSchema(result['heroes'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous'],
+                "team_info": result['team_info']
+            }
+            return Representation(data, validators)
+
+        return heroes_by_team_page_cache.lookup(
+            {'team_id': team_id, 'offset': offset, 'limit': limit, 'include_archived': include_archived},
+            validate,
+            build_page
+        )
+
+    # ==================== VERSIONES (ETag / Last-Modified) ====================
+    def get_hero_validators(self, hero: Hero) -> Validators:
+        """
+        Calcula ETag/Last-Modified de un héroe ya cargado (sin queries extra).
+
+        La respuesta incluye el team anidado, por lo que la fecha_actualizacion
+        del team también forma parte de la versión: renombrar el team cambia el ETag.
+
+        Args:
+            hero: Héroe cargado con select_related('team')
+
+        Returns:
+            Validators: (etag, last_modified)
+        """
+        return build_validators(
+            'hero', hero.id, hero.fecha_actualizacion, hero.team.fecha_actualizacion,
+            last_modified=latest(hero.fecha_actualizacion, hero.team.fecha_actualizacion)
+        )
+
+    def get_heroes_validators(self, offset: int = 0, limit: int = 10, include_archived: bool = False) -> Validators:
+        """
+        Calcula el ETag del listado paginado de héroes.
+
+        Se basa en COUNT + MAX(fecha_actualizacion) de heroes y en
+        MAX(fecha_actualizacion) de teams (cada héroe lleva su team anidado).
+        No trae filas ni serializa nada.
+
+        Sin Last-Modified: MAX(fecha_actualizacion) no cambia cuando se
+        borra un héroe, y un If-Modified-Since respondería 304 con el
+        héroe borrado todavía en la copia del cliente. El COUNT del ETag sí
+        cambia.
+
+        Args:
+            offset: Índice de inicio
+            limit: Cantidad de resultados
+            include_archived: Incluir heroes_archive en la versión
+
+        Returns:
+            Validators: (etag, None)
+
+        Raises:
+            ValidationError: Si los parámetros de paginación son inválidos
+        """
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        (total, heroes_modified), (_, teams_modified) = run_concurrently(
+            lambda: self.hero_repository.get_heroes_version(include_archived=include_archived),
+            self.team_repository.get_teams_version,
+        )
+
+        return build_validators('heroes', total, heroes_modified, teams_modified, offset, limit, include_archived)
+
+    def get_heroes_by_team_validators(self, team_id: int, offset: int = 0, limit: int = 10,
+                                      include_archived: bool = False) -> Validators:
+        """
+        Calcula el ETag del listado de héroes de un equipo (sin
+        Last-Modified, igual que get_heroes_validators()).
+
+        Args:
+            team_id: ID del equipo
+            offset: Índice de inicio
+            limit: Cantidad de resultados
+            include_archived: Incluir heroes_archive en la versión
+
+        Returns:
+            Validators: (etag, None)
+
+        Raises:
+            ValidationError: Si los parámetros de paginación son inválidos
+            NotFound: Si el team no existe
+        """
+        team = self.team_repository.get_team_by_id(team_id)
+        if not team:
+            raise NotFound({"detail": f"No existe un equipo con ID {team_id}"})
+
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        total, heroes_modified = self.hero_repository.get_heroes_version(
+            team_id=team_id, include_archived=include_archived
+        )
+
+        return build_validators(
+            'heroes-by-team', team.id, team.fecha_actualizacion, total, heroes_modified, offset, limit,
+            include_archived
+        )
+
     # ==================== UPDATE ====================
+    @group_commit.batched_write(unless=HeroRepository.writes_span_databases)
     def update_hero(
         self,
         hero_id: int,
@@ -318,9 +583,8 @@ class HeroService:
             if len(nombre) > 255:
                 raise ValidationError({"nombre": "El nombre no puede exceder 255 caracteres"})
 
-            # Verificar que no exista otro héroe con ese nombre
-            existing_hero = self.hero_repository.get_hero_by_name(nombre.strip())
-            if existing_hero and existing_hero.id != hero_id:
+            # Verificar que no exista otro héroe con ese nombre (activo o archivado)
+            if self.hero_repository.exists_by_name(nombre.strip(), exclude_id=hero_id):
                 raise ValidationError({
                     "nombre": f"Ya existe otro héroe con el nombre '{nombre.strip()}'"
                 })
@@ -339,7 +603,7 @@ class HeroService:
         # Validación 5: Si se actualiza el team
         team = None
         if team_id is not None:
-            team = self.team_repository.get_team_by_id(team_id)
+            team = self.team_repository.get_cached_team_by_id(team_id)
             if not team:
                 raise ValidationError({"team_id": f"No existe un equipo con ID {team_id}"})
 
@@ -388,3 +652,341 @@ class HeroService:
             "message": f"Héroe '{hero_nombre}' del equipo '{team_nombre}' eliminado exitosamente",
             "id": hero_id
         }
+
+    # ==================== ASYNC ====================
+    async def acreate_hero(
+        self,
+        nombre: str,
+        team_id: int,
+        descripcion: str = None,
+        poder_principal: str = None,
+        nivel: int = 1
+    ) -> Hero:
+        """
+        Versión async de create_hero() (mismas validaciones).
+        """
+        if group_commit.is_enabled() and not self.hero_repository.writes_span_databases():
+            return await group_commit.asubmit(
+                lambda: self.create_hero(nombre, team_id, descripcion, poder_principal, nivel)
+            )
+
+        if not nombre or nombre.strip() == "":
+            raise ValidationError({"nombre": "El nombre del héroe es requerido"})
+
+        if len(nombre) > 255:
+            raise ValidationError({"nombre": "El nombre no puede exceder 255 caracteres"})
+
+        name_taken, team = await arun_concurrently(
+            lambda: self.hero_repository.aexists_by_name(nombre.strip()),
+            lambda: self.team_repository.aget_cached_team_by_id(team_id),
+        )
+
+        if name_taken:
+            raise ValidationError({
+                "nombre": f"Ya existe un héroe con el nombre '{nombre.strip()}'"
+            })
+
+        if not team:
+            raise ValidationError({
+                "team_id": f"No existe un equipo con ID {team_id}"
+            })
+
+        if nivel < 1 or nivel > 100:
+            raise ValidationError({
+                "nivel": "El nivel debe estar entre 1 y 100"
+            })
+
+        if poder_principal and len(poder_principal) > 255:
+            raise ValidationError({
+                "poder_principal": "El poder principal no puede exceder 255 caracteres"
+            })
+
+        return await self.hero_repository.acreate_hero(
+            nombre=nombre.strip(),
+            team=team,
+            descripcion=descripcion.strip() if descripcion else None,
+            poder_principal=poder_principal.strip() if poder_principal else None,
+            nivel=nivel
+        )
+
+    async def aget_hero_by_id(self, hero_id: int) -> Hero:
+        """
+        Versión async de get_hero_by_id().
+        """
+        if hero_id <= 0:
+            raise ValidationError({"id": "El ID debe ser un número positivo"})
+
+        hero = await self.hero_repository.aget_hero_by_id(hero_id)
+        if not hero:
+            raise NotFound({"detail": f"No se encontró el héroe con ID {hero_id}"})
+
+        return hero
+
+    async def aget_hero_representation(self, hero_id: int) -> DeferredRepresentation:
+        """
+        Versión async de get_hero_representation() (misma hero_cache).
+        """
+        if hero_id <= 0:
+            raise ValidationError({"id": "El ID debe ser un número positivo"})
+
+        representation, token = hero_cache.lookup(hero_id)
+        if representation is not None:
+            return DeferredRepresentation.aready(representation)
+
+        hero = await self.aget_hero_by_id(hero_id)
+        validators = self.get_hero_validators(hero)
+
+        async def build() -> Representation:
+            representation = Representation(HeroReadSchema(hero).data, validators)
+            hero_cache.store(hero_id, token, representation)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
+    async def aget_hero_by_name(self, nombre: str) -> Hero:
+        """
+        Versión async de get_hero_by_name().
+        """
+        if not nombre or nombre.strip() == "":
+            raise ValidationError({"nombre": "El nombre del héroe es requerido para la búsqueda"})
+
+        hero = await self.hero_repository.aget_hero_by_name(nombre.strip())
+        if not hero:
+            raise NotFound({"detail": f"No se encontró el héroe con nombre '{nombre.strip()}'"})
+
+        return hero
+
+    async def aget_all_heroes(self, offset: int = 0, limit: int = 10, include_archived: bool = False) -> Dict[str, Any]:
+        """
+        Versión async de get_all_heroes().
+        """
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        total, heroes = await arun_concurrently(
+            lambda: self.hero_repository.acount_heroes(include_archived),
+            lambda: self.hero_repository.alist_heroes(offset, limit, include_archived),
+        )
+
+        return {
+            "heroes": heroes,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "has_next": (offset + limit) < total,
+            "has_previous": offset > 0
+        }
+
+    async def aget_heroes_by_team(self, team_id: int, offset: int = 0, limit: int = 10,
+                                  include_archived: bool = False) -> Dict[str, Any]:
+        """
+        Versión async de get_heroes_by_team().
+        """
+        reads = [lambda: self.team_repository.aget_team_by_id(team_id)]
+        if offset >= 0 and 1 <= limit <= 100:
+            reads += [
+                lambda: self.hero_repository.acount_heroes_by_team(team_id, include_archived),
+                lambda: self.hero_repository.alist_heroes_by_team(team_id, offset, limit, include_archived),
+            ]
+        team, *page = await arun_concurrently(*reads)
+
+        if not team:
+            raise NotFound({"detail": f"No existe un equipo con ID {team_id}"})
+
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        total, heroes = page
+
+        return {
+            "heroes": heroes,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "has_next": (offset + limit) < total,
+            "has_previous": offset > 0,
+            "team_info": {
+                "id": team.id,
+                "nombre": team.nombre,
+                "descripcion": team.descripcion
+            }
+        }
+
+    async def aget_heroes_page(self, offset: int = 0, limit: int = 10,
+                               include_archived: bool = False) -> DeferredRepresentation:
+        """
+        Versión async de get_heroes_page() (misma heroes_page_cache).
+        """
+        async def validate() -> Validators:
+            return await self.aget_heroes_validators(offset=offset, limit=limit, include_archived=include_archived)
+
+        async def build_page(validators: Validators) -> Representation:
+            result = await self.aget_all_heroes(offset=offset, limit=limit, include_archived=include_archived)
+            data = {
+                "heroes": HeroReadSchema(result['heroes'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous']
+            }
+            return Representation(data, validators)
+
+        return await heroes_page_cache.alookup(
+            {'offset': offset, 'limit': limit, 'include_archived': include_archived},
+            validate,
+            build_page
+        )
+
+    async def aget_heroes_by_team_page(self, team_id: int, offset: int = 0, limit: int = 10,
+                                       include_archived: bool = False) -> DeferredRepresentation:
+        """
+        Versión async de get_heroes_by_team_page() (misma heroes_by_team_page_cache).
+        """
+        async def validate() -> Validators:
+            return await self.aget_heroes_by_team_validators(
+                team_id=team_id, offset=offset, limit=limit, include_archived=include_archived
+            )
+
+        async def build_page(validators: Validators) -> Representation:
+            result = await self.aget_heroes_by_team(team_id=team_id, offset=offset, limit=limit,
+                                                    include_archived=include_archived)
+            data = {
+                "heroes": HeroReadSchema(result['heroes'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous'],
+                "team_info": result['team_info']
+            }
+            return Representation(data, validators)
+
+        return await heroes_by_team_page_cache.alookup(
+            {'team_id': team_id, 'offset': offset, 'limit': limit, 'include_archived': include_archived},
+            validate,
+            build_page
+        )
+
+    async def aget_heroes_validators(self, offset: int = 0, limit: int = 10,
+                                     include_archived: bool = False) -> Validators:
+        """
+        Versión async de get_heroes_validators().
+        """
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        (total, heroes_modified), (_, teams_modified) = await arun_concurrently(
+            lambda: self.hero_repository.aget_heroes_version(include_archived=include_archived),
+            self.team_repository.aget_teams_version,
+        )
+
+        return build_validators('heroes', total, heroes_modified, teams_modified, offset, limit, include_archived)
+
+    async def aget_heroes_by_team_validators(self, team_id: int, offset: int = 0, limit: int = 10,
+                                             include_archived: bool = False) -> Validators:
+        """
+        Versión async de get_heroes_by_team_validators().
+        """
+        team = await self.team_repository.aget_team_by_id(team_id)
+        if not team:
+            raise NotFound({"detail": f"No existe un equipo con ID {team_id}"})
+
+        if offset < 0:
+            raise ValidationError({"offset": "El offset debe ser mayor o igual a 0"})
+
+        if limit < 1 or limit > 100:
+            raise ValidationError({"limit": "El limit debe estar entre 1 y 100"})
+
+        total, heroes_modified = await self.hero_repository.aget_heroes_version(
+            team_id=team_id, include_archived=include_archived
+        )
+
+        return build_validators(
+            'heroes-by-team', team.id, team.fecha_actualizacion, total, heroes_modified, offset, limit,
+            include_archived
+        )
+
+    async def aupdate_hero(
+        self,
+        hero_id: int,
+        nombre: str = None,
+        descripcion: str = None,
+        poder_principal: str = None,
+        nivel: int = None,
+        team_id: int = None
+    ) -> Hero:
+        """
+        Versión async de update_hero() (mismas validaciones).
+        """
+        if group_commit.is_enabled() and not self.hero_repository.writes_span_databases():
+            return await group_commit.asubmit(
+                lambda: self.update_hero(hero_id, nombre, descripcion, poder_principal, nivel, team_id)
+            )
+
+        hero = await self.hero_repository.aget_hero_by_id(hero_id)
+        if not hero:
+            raise NotFound({"detail": f"No se encontró el héroe con ID {hero_id}"})
+
+        if nombre is not None:
+            if nombre.strip() == "":
+                raise ValidationError({"nombre": "El nombre del héroe no puede estar vacío"})
+
+            if len(nombre) > 255:
+                raise ValidationError({"nombre": "El nombre no puede exceder 255 caracteres"})
+
+            if await self.hero_repository.aexists_by_name(nombre.strip(), exclude_id=hero_id):
+                raise ValidationError({
+                    "nombre": f"Ya existe otro héroe con el nombre '{nombre.strip()}'"
+                })
+
+        if nivel is not None:
+            if nivel < 1 or nivel > 100:
+                raise ValidationError({"nivel": "El nivel debe estar entre 1 y 100"})
+
+        if poder_principal is not None and len(poder_principal) > 255:
+            raise ValidationError({
+                "poder_principal": "El poder principal no puede exceder 255 caracteres"
+            })
+
+        team = None
+        if team_id is not None:
+            team = await self.team_repository.aget_cached_team_by_id(team_id)
+            if not team:
+                raise ValidationError({"team_id": f"No existe un equipo con ID {team_id}"})
+
+        return await self.hero_repository.aupdate_hero(
+            hero_id=hero_id,
+            nombre=nombre.strip() if nombre else None,
+            descripcion=descripcion.strip() if descripcion else None,
+            poder_principal=poder_principal.strip() if poder_principal else None,
+            nivel=nivel,
+            team=team
+        )
+
+    async def adelete_hero(self, hero_id: int) -> Dict[str, Any]:
+        """
+        Versión async de delete_hero().
+        """
+        hero = await self.hero_repository.aget_hero_by_id(hero_id)
+        if not hero:
+            raise NotFound({"detail": f"No se encontró el héroe con ID {hero_id}"})
+
+        hero_nombre = hero.nombre
+        team_nombre = hero.team.nombre
+
+        await self.hero_repository.adelete_hero(hero_id)
+
+        return {
+            "message": f"Héroe '{hero_nombre}' del equipo '{team_nombre}' eliminado exitosamente",
+            "id": hero_id
+        }
@@ -0,0 +1,148 @@
+"""
+Sharding horizontal de heroes por team
+
+Los heroes siempre se leen por ID o por team_id. Con settings.HERO_SHARDS
+(lista de alias de DATABASES) la tabla heroes se reparte entre varias
+bases: cada héroe vive en el shard que le toca a su team por un hash
+estable del team_id (shard_for_team). Los teams y el índice hero_shards
+quedan en `default`.
+
+- Por team: un solo shard (el del hash)
+- Por ID: el índice hero_shards (modelo HeroShard) dice en qué shard está
+  cada héroe; hero_shard_cache lo mantiene en memoria. El índice también
+  reparte los IDs: así no se repiten entre shards y un héroe conserva su
+  ID cuando se muda
+- Listado completo: cada shard trae su página ordenada por fecha_creacion
+  y merge_newest() las intercala (offset + limit filas por shard)
+- Cambio de team hacia un team de otro shard: el héroe se copia al shard
+  nuevo (mismo ID y fechas), se actualiza el índice y se borra del viejo
+- Archivo: cada shard tiene su heroes_archive y un héroe archivado queda
+  en el mismo shard (el índice sigue sirviendo para encontrarlo)
+
+No hay transacciones entre bases: cada paso confirma por separado y el
+orden elegido (índice antes que el héroe al crear; copia antes que borrado
+al mudar) deja, ante una falla a mitad de camino, una entrada o un
+duplicado sobrante en lugar de un héroe perdido. Por eso las escrituras de
+heroes no pasan por group commit con sharding: un lote deshecho borraría la
+entrada del índice y dejaría el héroe en el shard. `manage.py shard_heroes`
+vuelve a repartir los heroes y reconstruye el índice (también sirve para
+pasar a sharding una base existente o cambiar la cantidad de shards).
+
+Con HERO_SHARDS vacío nada de esto se usa: los heroes quedan en `default`
+y HeroRepository hace las mismas queries de siempre.
+"""
+import heapq
+import zlib
+from itertools import islice
+from typing import Iterable, List, Optional
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from .cache import hero_shard_cache
+from .models import ArchivedHero, Hero, HeroShard
+
+
+def shard_aliases() -> List[str]:
+    return list(getattr(settings, 'HERO_SHARDS', []))
+
+
+def is_enabled() -> bool:
+    return bool(shard_aliases())
+
+
+def shard_for_team(team_id: int) -> str:
+    """
+    Alias del shard de un team (crc32 del team_id: estable entre procesos,
+    a diferencia de hash()).
+    """
+    aliases = shard_aliases()
+    return aliases[zlib.crc32(str(team_id).encode()) % len(aliases)]
+
+
+def allocate_id(alias: str) -> int:
+    """
+    Reserva el ID de un héroe nuevo registrándolo en el índice.
+    """
+    entry = HeroShard.objects.using(DEFAULT_DB_ALIAS).create(shard=alias)
+    hero_shard_cache.set(entry.id, alias)
+    return entry.id
+
+
+def locate(hero_id: int) -> Optional[str]:
+    """
+    Shard donde está un héroe (None si no existe).
+    """
+    return hero_shard_cache.get_or_load(
+        hero_id,
+        lambda: HeroShard.objects.using(DEFAULT_DB_ALIAS).filter(id=hero_id).values_list('shard', flat=True).first()
+    )
+
+
+def relocate(hero_id: int, alias: str) -> None:
+    """
+    Registra que un héroe se mudó a otro shard.
+    """
+    HeroShard.objects.using(DEFAULT_DB_ALIAS).filter(id=hero_id).update(shard=alias)
+    hero_shard_cache.invalidate(hero_id)
+
+
+def forget(hero_ids: Iterable[int]) -> None:
+    """
+    Quita heroes eliminados del índice.
+    """
+    hero_ids = list(hero_ids)
+    HeroShard.objects.using(DEFAULT_DB_ALIAS).filter(id__in=hero_ids).delete()
+    for hero_id in hero_ids:
+        hero_shard_cache.invalidate(hero_id)
+
+
+def merge_newest(pages: List[List[Hero]], offset: int, limit: int) -> List[Hero]:
+    """
+    Intercala las páginas de cada shard (cada una con sus primeras
+    offset + limit filas, de la más nueva a la más vieja) y retorna la
+    página [offset, offset + limit) del listado completo.
+    """
+    merged = heapq.merge(*pages, key=lambda hero: (hero.fecha_creacion, hero.id), reverse=True)
+    return list(islice(merged, offset, offset + limit))
+
+
+class HeroShardRouter:
+    """
+    Router de los heroes con sharding (settings.DATABASE_ROUTERS, antes que
+    ReadReplicaRouter).
+
+    HeroRepository elige el shard explícitamente (.using(alias)); el router
+    cubre lo que Django resuelve por su cuenta:
+    - save()/delete() de un héroe leído de un shard: se quedan en ese shard
+    - hero.team de un héroe de un shard: el team se lee de `default`
+    - la relación héroe (shard) → team (default) es válida
+    - en los shards solo se migran las tablas heroes y heroes_archive
+    """
+
+    @staticmethod
+    def _instance_shard(hints) -> Optional[str]:
+        instance = hints.get('instance')
+        if instance is None or instance._state.db not in shard_aliases():
+            return None
+        return instance._state.db
+
+    def db_for_read(self, model, **hints):
+        shard = self._instance_shard(hints)
+        if shard is None:
+            return None
+        return shard if model in (Hero, ArchivedHero) else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return self.db_for_read(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = shard_aliases()
+        if obj1._state.db in aliases or obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == DEFAULT_DB_ALIAS or db not in shard_aliases():
+            return None
+        return app_label == Hero._meta.app_label and model_name in (
+            Hero._meta.model_name, ArchivedHero._meta.model_name
+        )
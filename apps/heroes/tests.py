@@ -1,3 +1,510 @@
-from django.test import TestCase
+"""
+Tests de presupuesto de queries para los endpoints de Heroes
 
-# Create your tests here.
+Cada ruta registrada en heroes_router tiene un máximo explícito de queries
+(con las cachés vacías) para cada tamaño de página. Si un cambio pierde un
+select_related o introduce un N+1, el test falla mostrando el SQL agrupado
+por el punto del código que lo ejecutó.
+
+HeroArchiveTests cubre el archivo de heroes viejos (heroes_archive) y
+HeroShardingTests corre la API con los heroes repartidos en dos shards
+(bases SQLite temporales).
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import include, path, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core import group_commit
+from apps.core.testing import QueryBudgetMixin
+from apps.teams.cache import team_lookup_cache
+from apps.teams.models import Team
+from . import sharding
+from .cache import hero_shard_cache
+from .models import ArchivedHero, Hero, HeroShard
+from .repository import HeroRepository
+from .routers import get_heroes_router, heroes_router
+from .schemas import HeroReadSchema
+from .services import HeroService
+
+SHARDS = ['heroes_shard_0', 'heroes_shard_1']
+
+PAGE_SIZES = [1, 10, 100]
+
+# URLconf con AsyncHeroViewSet para AsyncHeroQueryBudgetTests
+urlpatterns = [path('api/', include(get_heroes_router(async_views=True).urls))]
+
+# Máximo de queries por (ruta, método) con las cachés vacías
+QUERY_BUDGETS = {
+    # aggregate heroes + aggregate teams + COUNT + página (JOIN)
+    ('hero-list', 'GET'): 4,
+    # nombre único + team_id + INSERT
+    ('hero-list', 'POST'): 3,
+    # SELECT ... JOIN teams
+    ('hero-detail', 'GET'): 1,
+    # héroe + nombre único + team_id + UPDATE
+    ('hero-detail', 'PATCH'): 4,
+    # héroe + DELETE
+    ('hero-detail', 'DELETE'): 2,
+    # SELECT ... JOIN teams
+    ('hero-get-by-name', 'GET'): 1,
+    # team + aggregate heroes del team + COUNT + página (JOIN)
+    ('hero-get-by-team', 'GET'): 4,
+}
+
+
+class HeroQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Presupuesto de queries de cada ruta de heroes_router
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(nombre="Justice League", descripcion="Los más poderosos")
+        cls.other_team = Team.objects.create(nombre="Avengers", descripcion="Los más fuertes")
+        Hero.objects.bulk_create([
+            Hero(nombre=f"Hero {i}", descripcion="Descripción", poder_principal="Fuerza",
+                 nivel=(i % 100) + 1, team=cls.team if i % 3 else cls.other_team)
+            for i in range(150)
+        ])
+        cls.hero = Hero.objects.filter(team=cls.team).first()
+
+    def setUp(self):
+        self.client = APIClient()
+        # Las cachés no se deshacen con el rollback de cada test
+        cache.clear()
+        team_lookup_cache.clear()
+
+    def test_every_route_has_a_budget(self):
+        """Cada (ruta, método) del router, salvo la raíz de la API, tiene presupuesto"""
+        routes = {
+            (pattern.name, method.upper())
+            for pattern in heroes_router.urls
+            if pattern.name != 'api-root'
+            for method in pattern.callback.actions
+            if method != 'head'
+        }
+        self.assertEqual(routes - set(QUERY_BUDGETS), set())
+
+    def test_list(self):
+        for limit in PAGE_SIZES:
+            cache.clear()
+            with self.subTest(limit=limit), self.assertMaxQueries(QUERY_BUDGETS[('hero-list', 'GET')], f'GET /api/heroes/?limit={limit}'):
+                response = self.client.get(reverse('hero-list'), {'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['heroes']), limit)
+
+    def test_retrieve(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('hero-detail', 'GET')], 'GET /api/heroes/{id}/'):
+            response = self.client.get(reverse('hero-detail', args=[self.hero.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_by_name(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('hero-get-by-name', 'GET')], 'GET /api/heroes/by-name/'):
+            response = self.client.get(reverse('hero-get-by-name'), {'nombre': self.hero.nombre})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_by_team(self):
+        for limit in PAGE_SIZES:
+            cache.clear()
+            team_lookup_cache.clear()
+            with self.subTest(limit=limit), self.assertMaxQueries(QUERY_BUDGETS[('hero-get-by-team', 'GET')], f'GET /api/heroes/{{team_id}}/by-team/?limit={limit}'):
+                response = self.client.get(reverse('hero-get-by-team', args=[self.team.id]), {'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['heroes']), limit)
+
+    def test_create(self):
+        data = {'nombre': 'Superman', 'team_id': self.team.id, 'nivel': 95}
+        with self.assertMaxQueries(QUERY_BUDGETS[('hero-list', 'POST')], 'POST /api/heroes/'):
+            response = self.client.post(reverse('hero-list'), data, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_partial_update(self):
+        data = {'nombre': 'Nuevo nombre', 'nivel': 50, 'team_id': self.other_team.id}
+        with self.assertMaxQueries(QUERY_BUDGETS[('hero-detail', 'PATCH')], 'PATCH /api/heroes/{id}/'):
+            response = self.client.patch(reverse('hero-detail', args=[self.hero.id]), data, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['team']['nombre'], self.other_team.nombre)
+
+    def test_destroy(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('hero-detail', 'DELETE')], 'DELETE /api/heroes/{id}/'):
+            response = self.client.delete(reverse('hero-detail', args=[self.hero.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_reads_do_not_query(self):
+        """Con las cachés calientes, detalle y listados no consultan la BD"""
+        urls = [
+            reverse('hero-list'),
+            reverse('hero-detail', args=[self.hero.id]),
+            reverse('hero-get-by-team', args=[self.team.id]),
+        ]
+        for url in urls:
+            self.client.get(url)
+            with self.subTest(url=url), self.assertMaxQueries(0, f'GET {url} (caché)'):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_conditional_get_returns_304(self):
+        url = reverse('hero-detail', args=[self.hero.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cold_conditional_retrieve_does_not_serialize(self):
+        """Con la caché fría, 304 y HEAD del detalle responden sin ejecutar HeroReadSchema"""
+        url = reverse('hero-detail', args=[self.hero.id])
+        etag = self.client.get(url)['ETag']
+        requests = [
+            ('304', lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag), 304),
+            ('HEAD', lambda: self.client.head(url), 200),
+        ]
+        for label, send, expected in requests:
+            cache.clear()
+            with self.subTest(label), mock.patch.object(HeroReadSchema, 'to_representation') as serialize:
+                response = send()
+            self.assertEqual(response.status_code, expected)
+            self.assertEqual(response['ETag'], etag)
+            serialize.assert_not_called()
+
+    def test_cold_conditional_list_only_reads_versions(self):
+        """
+        Con la caché fría (o una página que no se cachea), 304 y HEAD de los
+        listados solo hacen las queries de versión: sin COUNT, página ni serializer
+        """
+        requests = [
+            (reverse('hero-list'), {'limit': 20}),
+            (reverse('hero-list'), {'offset': 120, 'limit': 20}),
+            (reverse('hero-get-by-team', args=[self.team.id]), {'limit': 20}),
+        ]
+        for url, params in requests:
+            etag = self.client.get(url, params)['ETag']
+            for method, headers, expected in (('get', {'HTTP_IF_NONE_MATCH': etag}, 304), ('head', {}, 200)):
+                cache.clear()
+                team_lookup_cache.clear()
+                with mock.patch.object(HeroReadSchema, 'to_representation') as serialize:
+                    with self.subTest(url=url, params=params, method=method), self.assertMaxQueries(2, f'{method.upper()} {url} (caché fría)'):
+                        response = getattr(self.client, method)(url, params, **headers)
+                self.assertEqual(response.status_code, expected)
+                self.assertEqual(response['ETag'], etag)
+                serialize.assert_not_called()
+
+    def test_list_has_no_last_modified(self):
+        """
+        Borrar un héroe no mueve MAX(fecha_actualizacion): los listados llevan
+        solo el ETag (con el COUNT) e ignoran If-Modified-Since
+        """
+        url = reverse('hero-list')
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncHeroQueryBudgetTests(HeroQueryBudgetTests):
+    """
+    Los mismos presupuestos y respuestas con AsyncHeroViewSet (ASYNC_VIEWS)
+    """
+
+    def test_not_found_and_validation_errors(self):
+        response = self.client.get(reverse('hero-detail', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(reverse('hero-list'), {'nombre': self.hero.nombre, 'team_id': self.team.id},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nombre', response.data)
+
+
+class HeroArchiveTests(TestCase):
+    """
+    Heroes viejos movidos a heroes_archive con `manage.py archive_heroes`
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(nombre="Justice League")
+        cls.other_team = Team.objects.create(nombre="Avengers")
+        now = timezone.now()
+        # Del más viejo al más nuevo: los 3 primeros quedan antes del corte (30 días)
+        ages = [400, 200, 90, 10, 1]
+        cls.heroes = []
+        for i, days in enumerate(ages):
+            hero = Hero.objects.create(nombre=f"Hero {i}", team=cls.team if i % 2 == 0 else cls.other_team)
+            Hero.objects.filter(id=hero.id).update(fecha_creacion=now - timedelta(days=days))
+            cls.heroes.append(hero.id)
+        # Más nuevo primero, como los listados
+        cls.newest_first = list(reversed(cls.heroes))
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        team_lookup_cache.clear()
+        call_command('archive_heroes', older_than_days=30, batch_size=2, stdout=io.StringIO())
+
+    def _ids(self, response):
+        return [hero['id'] for hero in response.data['heroes']]
+
+    def test_command_moves_heroes_older_than_the_cutoff(self):
+        self.assertEqual(set(Hero.objects.values_list('id', flat=True)), set(self.heroes[3:]))
+        archived = ArchivedHero.objects.order_by('id')
+        self.assertEqual([hero.id for hero in archived], self.heroes[:3])
+        self.assertTrue(all(hero.fecha_archivado is not None for hero in archived))
+        self.assertLess(archived[0].fecha_creacion, timezone.now() - timedelta(days=399))
+
+        out = io.StringIO()
+        call_command('archive_heroes', older_than_days=30, dry_run=True, stdout=out)
+        self.assertIn('default: 0 heroes a archivar', out.getvalue())
+
+    def test_detail_and_name_fall_through_to_the_archive(self):
+        archived_id = self.heroes[0]
+        response = self.client.get(reverse('hero-detail', args=[archived_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['team']['nombre'], self.team.nombre)
+
+        response = self.client.get(reverse('hero-get-by-name'), {'nombre': 'Hero 1'})
+        self.assertEqual(response.data['id'], self.heroes[1])
+
+    def test_lists_continue_into_the_archive_with_include_archived(self):
+        response = self.client.get(reverse('hero-list'))
+        self.assertEqual((response.data['total'], self._ids(response)), (2, self.newest_first[:2]))
+        hot_etag = response['ETag']
+
+        response = self.client.get(reverse('hero-list'), {'include_archived': 'true'})
+        self.assertEqual((response.data['total'], self._ids(response)), (5, self.newest_first))
+        self.assertNotEqual(response['ETag'], hot_etag)
+
+        # Página que cruza de heroes a heroes_archive y página solo de archivados
+        response = self.client.get(reverse('hero-list'), {'include_archived': '1', 'offset': 1, 'limit': 2})
+        self.assertEqual(self._ids(response), self.newest_first[1:3])
+        response = self.client.get(reverse('hero-list'), {'include_archived': '1', 'offset': 3, 'limit': 2})
+        self.assertEqual(self._ids(response), self.newest_first[3:5])
+
+        response = self.client.get(reverse('hero-get-by-team', args=[self.team.id]), {'include_archived': 'true'})
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(self._ids(response), [self.heroes[4], self.heroes[2], self.heroes[0]])
+
+    def test_archived_heroes_keep_their_name_and_can_be_updated_and_deleted(self):
+        archived_id = self.heroes[0]
+        response = self.client.post(reverse('hero-list'), {'nombre': 'Hero 0', 'team_id': self.team.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch(reverse('hero-detail', args=[archived_id]), {'nivel': 50}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ArchivedHero.objects.get(id=archived_id).nivel, 50)
+
+        response = self.client.delete(reverse('hero-detail', args=[archived_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ArchivedHero.objects.filter(id=archived_id).exists())
+        self.assertEqual(self.client.get(reverse('hero-detail', args=[archived_id])).status_code, 404)
+
+    def test_async_repository_reads_the_archive(self):
+        hero = async_to_sync(HeroRepository.aget_hero_by_id)(self.heroes[0])
+        self.assertIsInstance(hero, ArchivedHero)
+        heroes, total = async_to_sync(HeroRepository.aget_all_heroes)(0, 10, True)
+        self.assertEqual((total, [hero.id for hero in heroes]), (5, self.newest_first))
+
+
+@override_settings(HERO_SHARDS=SHARDS)
+class HeroShardingTests(TransactionTestCase):
+    """
+    Heroes repartidos en dos shards SQLite por team (apps/heroes/sharding.py)
+    """
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Las rutas no cambian entre tests: el thread de group commit guarda su propia conexión a cada alias
+        tmpdir = tempfile.mkdtemp(prefix='hero-shards-')
+        cls.addClassCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        for alias in SHARDS:
+            connections.settings[alias] = {
+                **connections.settings['default'],
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(tmpdir, f'{alias}.sqlite3'),
+                'OPTIONS': {},
+            }
+            cls.addClassCleanup(cls._remove_database, alias)
+            with override_settings(HERO_SHARDS=SHARDS):
+                call_command('migrate', database=alias, verbosity=0)
+
+    @staticmethod
+    def _remove_database(alias):
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+    def setUp(self):
+        # El flush de TransactionTestCase solo alcanza a los alias de settings.DATABASES
+        for alias in SHARDS:
+            Hero.objects.using(alias).all().delete()
+            ArchivedHero.objects.using(alias).all().delete()
+
+        self.client = APIClient()
+        cache.clear()
+        team_lookup_cache.clear()
+        hero_shard_cache.clear()
+
+        # Un team en cada shard
+        self.teams = {}
+        index = 0
+        while len(self.teams) < len(SHARDS):
+            team = Team.objects.create(nombre=f"Team {index}")
+            self.teams.setdefault(sharding.shard_for_team(team.id), team)
+            index += 1
+
+    def _create(self, nombre, team):
+        response = self.client.post(reverse('hero-list'), {'nombre': nombre, 'team_id': team.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def test_foreign_key_only_in_default(self):
+        """heroes.team_id referencia a teams en default; en los shards no hay tabla teams"""
+        for alias, references in (('default', {'team_id': ('id', 'teams')}), (SHARDS[0], {})):
+            with self.subTest(alias=alias), connections[alias].cursor() as cursor:
+                self.assertEqual(connections[alias].introspection.get_relations(cursor, 'heroes'), references)
+
+    def test_heroes_are_stored_in_the_shard_of_their_team(self):
+        first = self._create('Superman', self.teams[SHARDS[0]])
+        second = self._create('Iron Man', self.teams[SHARDS[1]])
+
+        self.assertNotEqual(first['id'], second['id'])
+        for hero, alias in ((first, SHARDS[0]), (second, SHARDS[1])):
+            self.assertEqual(list(Hero.objects.using(alias).values_list('id', flat=True)), [hero['id']])
+            self.assertEqual(HeroShard.objects.get(id=hero['id']).shard, alias)
+        self.assertFalse(Hero.objects.using('default').exists())
+
+        response = self.client.get(reverse('hero-detail', args=[second['id']]))
+        self.assertEqual(response.data['team']['nombre'], self.teams[SHARDS[1]].nombre)
+        response = self.client.get(reverse('hero-get-by-name'), {'nombre': 'Superman'})
+        self.assertEqual(response.data['id'], first['id'])
+
+    def test_list_merges_shards_by_fecha_creacion(self):
+        created = [self._create(f'Hero {i}', self.teams[SHARDS[i % 2]]) for i in range(6)]
+        newest_first = [hero['id'] for hero in reversed(created)]
+
+        response = self.client.get(reverse('hero-list'), {'offset': 1, 'limit': 3})
+        self.assertEqual(response.data['total'], 6)
+        self.assertEqual([hero['id'] for hero in response.data['heroes']], newest_first[1:4])
+
+        response = self.client.get(reverse('hero-get-by-team', args=[self.teams[SHARDS[1]].id]))
+        self.assertEqual([hero['id'] for hero in response.data['heroes']], newest_first[0:6:2])
+
+    def test_team_transfer_moves_hero_between_shards(self):
+        hero = self._create('Flash', self.teams[SHARDS[0]])
+        target = self.teams[SHARDS[1]]
+
+        response = self.client.patch(reverse('hero-detail', args=[hero['id']]), {'team_id': target.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(Hero.objects.using(SHARDS[0]).filter(id=hero['id']).exists())
+        moved = Hero.objects.using(SHARDS[1]).get(id=hero['id'])
+        self.assertEqual(moved.team_id, target.id)
+        self.assertEqual(moved.fecha_creacion.isoformat().replace('+00:00', 'Z'), hero['fecha_creacion'])
+        self.assertEqual(HeroShard.objects.get(id=hero['id']).shard, SHARDS[1])
+
+        response = self.client.get(reverse('hero-detail', args=[hero['id']]))
+        self.assertEqual(response.data['team']['nombre'], target.nombre)
+
+    def test_delete_team_deletes_its_heroes_from_the_shard(self):
+        hero = self._create('Aquaman', self.teams[SHARDS[0]])
+        other = self._create('Thor', self.teams[SHARDS[1]])
+
+        response = self.client.delete(reverse('team-detail', args=[self.teams[SHARDS[0]].id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Hero.objects.using(SHARDS[0]).exists())
+        self.assertFalse(HeroShard.objects.filter(id=hero['id']).exists())
+        self.assertEqual(self.client.get(reverse('hero-detail', args=[hero['id']])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('hero-detail', args=[other['id']])).status_code, 200)
+
+    def test_hero_writes_skip_group_commit(self):
+        """
+        Con sharding las escrituras de heroes no pasan por el escritor de group
+        commit: un lote deshecho dejaría al héroe del shard fuera del índice
+        """
+        batched = mock.patch.object(group_commit.GroupCommitWriter, 'submit', side_effect=AssertionError('lote'))
+        with override_settings(GROUP_COMMIT={'enabled': True, 'window_ms': 1, 'max_batch': 8}), batched:
+            hero = self._create('Cyborg', self.teams[SHARDS[0]])
+            response = self.client.patch(reverse('hero-detail', args=[hero['id']]),
+                                         {'team_id': self.teams[SHARDS[1]].id}, format='json')
+            self.assertEqual(response.status_code, 200)
+            other = async_to_sync(HeroService().acreate_hero)(nombre='Raven', team_id=self.teams[SHARDS[0]].id)
+
+        self.assertEqual(HeroShard.objects.get(id=hero['id']).shard, SHARDS[1])
+        self.assertTrue(Hero.objects.using(SHARDS[1]).filter(id=hero['id']).exists())
+        self.assertEqual(HeroShard.objects.get(id=other.id).shard, SHARDS[0])
+
+    def test_async_repository_uses_shards(self):
+        hero = self._create('Batman', self.teams[SHARDS[1]])
+        found = async_to_sync(HeroRepository.aget_hero_by_id)(hero['id'])
+        self.assertEqual(found.team.nombre, self.teams[SHARDS[1]].nombre)
+        self.assertEqual(async_to_sync(HeroRepository.acount_heroes)(), 1)
+
+    def test_shard_heroes_command_moves_existing_heroes(self):
+        Hero.objects.using('default').bulk_create([
+            Hero(nombre=f'Legacy {i}', team=self.teams[SHARDS[i % 2]]) for i in range(4)
+        ])
+        call_command('shard_heroes', stdout=io.StringIO())
+
+        self.assertFalse(Hero.objects.using('default').exists())
+        for alias in SHARDS:
+            ids = set(Hero.objects.using(alias).values_list('id', flat=True))
+            self.assertEqual(len(ids), 2)
+            self.assertEqual(set(HeroShard.objects.filter(shard=alias).values_list('id', flat=True)), ids)
+
+        # Los IDs nuevos siguen después de los migrados
+        hero = self._create('Nuevo', self.teams[SHARDS[0]])
+        self.assertGreater(hero['id'], max(HeroShard.objects.exclude(id=hero['id']).values_list('id', flat=True)))
+
+    def test_shard_heroes_command_moves_archived_heroes(self):
+        legacy = Hero.objects.using('default').bulk_create([
+            Hero(nombre=f'Legacy {i}', team=self.teams[SHARDS[i % 2]]) for i in range(4)
+        ])
+        Hero.objects.using('default').filter(id__in=[hero.id for hero in legacy[:2]]).update(
+            fecha_creacion=timezone.now() - timedelta(days=400)
+        )
+        # Archivado antes del sharding: heroes_archive todavía en default
+        with override_settings(HERO_SHARDS=[]):
+            call_command('archive_heroes', older_than_days=30, stdout=io.StringIO())
+        call_command('shard_heroes', stdout=io.StringIO())
+
+        self.assertFalse(ArchivedHero.objects.using('default').exists())
+        for hero in legacy[:2]:
+            alias = sharding.shard_for_team(hero.team_id)
+            self.assertTrue(ArchivedHero.objects.using(alias).filter(id=hero.id).exists())
+        self.assertEqual(set(HeroShard.objects.values_list('id', flat=True)), {hero.id for hero in legacy})
+
+        # Volver a repartir no pierde los archivados del índice
+        call_command('shard_heroes', stdout=io.StringIO())
+        hero_shard_cache.clear()
+        self.assertEqual(set(HeroShard.objects.values_list('id', flat=True)), {hero.id for hero in legacy})
+        for hero in legacy:
+            self.assertEqual(self.client.get(reverse('hero-detail', args=[hero.id])).status_code, 200)
+        response = self.client.get(reverse('hero-list'), {'include_archived': 'true'})
+        self.assertEqual(response.data['total'], 4)
+
+    def test_archive_heroes_command_archives_in_each_shard(self):
+        old = [self._create(f'Old {i}', self.teams[SHARDS[i]]) for i in range(2)]
+        recent = self._create('Recent', self.teams[SHARDS[0]])
+        for hero, alias, days in zip(old, SHARDS, (400, 500)):
+            Hero.objects.using(alias).filter(id=hero['id']).update(fecha_creacion=timezone.now() - timedelta(days=days))
+        call_command('archive_heroes', older_than_days=30, stdout=io.StringIO())
+
+        for hero, alias in zip(old, SHARDS):
+            self.assertEqual(list(ArchivedHero.objects.using(alias).values_list('id', flat=True)), [hero['id']])
+            self.assertEqual(self.client.get(reverse('hero-detail', args=[hero['id']])).status_code, 200)
+
+        response = self.client.get(reverse('hero-list'), {'include_archived': 'true'})
+        self.assertEqual([hero['id'] for hero in response.data['heroes']], [recent['id'], old[0]['id'], old[1]['id']])
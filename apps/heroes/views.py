@@ -14,24 +14,36 @@ Responsabilidades:
 NO maneja:
 - Lógica de negocio (eso es responsabilidad de Services)
 - Acceso a base de datos (eso es responsabilidad de Repository)
+
+AsyncHeroViewSet sirve las mismas rutas con acciones async (ORM async);
+el router lo usa en lugar de HeroViewSet cuando ASYNC_VIEWS está activo.
+
+Ambos pasan por el control de admisión (rate limit por cliente y
+límite de concurrencia, 429/503): ver apps/core/admission.py.
 """
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from apps.core.admission import AdmissionControlMixin, AsyncAdmissionControlMixin
+from apps.core.api_docs import LazyDocs
+from apps.core.async_views import AsyncViewSet
+from apps.core.conditional import apply_validators, conditional_response
 from .services import HeroService
 from .schemas import HeroCreateSchema, HeroReadSchema, HeroUpdateSchema
-from .docs import (
-    create_hero_docs,
-    list_heroes_docs,
-    retrieve_hero_docs,
-    update_hero_docs,
-    delete_hero_docs,
-    get_by_name_docs,
-    get_by_team_docs
-)
-
-
-class HeroViewSet(viewsets.ViewSet):
+
+# Decoradores de documentación de heroes/docs.py (se importa recién al pedir /docs/)
+docs = LazyDocs('apps.heroes.docs')
+
+
+def include_archived_param(request) -> bool:
+    """
+    Query param include_archived (true/1): los listados siguen con los heroes archivados.
+    """
+    return request.query_params.get('include_archived', '').lower() in ('true', '1')
+
+
+class HeroViewSet(AdmissionControlMixin, viewsets.ViewSet):
     """
     ViewSet para operaciones CRUD de Heroes
 
@@ -53,7 +65,7 @@ class HeroViewSet(viewsets.ViewSet):
         super().__init__(*args, **kwargs)
         self.service = HeroService()
 
-    @create_hero_docs
+    @docs.create_hero_docs
     def create(self, request):
         """
         POST /api/heroes/
@@ -89,7 +101,7 @@ class HeroViewSet(viewsets.ViewSet):
         response_serializer = HeroReadSchema(hero)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
-    @list_heroes_docs
+    @docs.list_heroes_docs
     def list(self, request):
         """
         GET /api/heroes/
@@ -98,43 +110,50 @@ class HeroViewSet(viewsets.ViewSet):
         Query params:
         - offset: Índice de inicio (default: 0)
         - limit: Cantidad de resultados (default: 10, max: 100)
+        - include_archived: Incluir los heroes archivados (default: false)
+
+        Soporta If-None-Match (304) y HEAD.
         """
         # Obtener parámetros de paginación
         offset = int(request.query_params.get('offset', 0))
         limit = int(request.query_params.get('limit', 10))
 
-        # Llamar al servicio
-        result = self.service.get_all_heroes(offset=offset, limit=limit)
-
-        # Serializar heroes
-        heroes_serializer = HeroReadSchema(result['heroes'], many=True)
-
-        # Construir respuesta
-        response_data = {
-            "heroes": heroes_serializer.data,
-            "total": result['total'],
-            "offset": result['offset'],
-            "limit": result['limit'],
-            "has_next": result['has_next'],
-            "has_previous": result['has_previous']
-        }
+        # Llamar al servicio (validadores; la página, desde caché si existe)
+        page = self.service.get_heroes_page(
+            offset=offset,
+            limit=limit,
+            include_archived=include_archived_param(request)
+        )
+
+        # Responder 304/HEAD sin cuerpo (sin COUNT, página ni serializer)
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return apply_validators(Response(page.build().data, status=status.HTTP_200_OK), page.validators)
 
-    @retrieve_hero_docs
+    @docs.retrieve_hero_docs
     def retrieve(self, request, pk=None):
         """
         GET /api/heroes/{id}/
         Obtiene un héroe por su ID
+
+        Soporta If-None-Match / If-Modified-Since (304) y HEAD.
         """
-        # Llamar al servicio
-        hero = self.service.get_hero_by_id(int(pk))
+        # Llamar al servicio (validadores; desde caché si existe)
+        representation = self.service.get_hero_representation(int(pk))
 
-        # Serializar respuesta
-        serializer = HeroReadSchema(hero)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Responder 304/HEAD sin cuerpo (y sin serializar)
+        early_response = conditional_response(request, representation.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(
+            Response(representation.build().data, status=status.HTTP_200_OK),
+            representation.validators
+        )
 
-    @get_by_name_docs
+    @docs.get_by_name_docs
     @action(detail=False, methods=['get'], url_path='by-name')
     def get_by_name(self, request):
         """
@@ -155,7 +174,7 @@ class HeroViewSet(viewsets.ViewSet):
         serializer = HeroReadSchema(hero)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    @get_by_team_docs
+    @docs.get_by_team_docs
     @action(detail=True, methods=['get'], url_path='by-team')
     def get_by_team(self, request, pk=None):
         """
@@ -170,35 +189,29 @@ class HeroViewSet(viewsets.ViewSet):
         - url_path='by-team': El segmento de URL será 'by-team'
 
         Nota: Aunque es un endpoint de heroes, el {pk} representa el team_id
+
+        Soporta If-None-Match (304) y HEAD.
         """
         # Obtener parámetros de paginación
         offset = int(request.query_params.get('offset', 0))
         limit = int(request.query_params.get('limit', 10))
 
         # Llamar al servicio (pk es el team_id en este caso)
-        result = self.service.get_heroes_by_team(
+        page = self.service.get_heroes_by_team_page(
             team_id=int(pk),
             offset=offset,
-            limit=limit
+            limit=limit,
+            include_archived=include_archived_param(request)
         )
 
-        # Serializar heroes
-        heroes_serializer = HeroReadSchema(result['heroes'], many=True)
-
-        # Construir respuesta
-        response_data = {
-            "heroes": heroes_serializer.data,
-            "total": result['total'],
-            "offset": result['offset'],
-            "limit": result['limit'],
-            "has_next": result['has_next'],
-            "has_previous": result['has_previous'],
-            "team_info": result['team_info']
-        }
+        # Responder 304/HEAD sin cuerpo (sin COUNT, página ni serializer)
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return apply_validators(Response(page.build().data, status=status.HTTP_200_OK), page.validators)
 
-    @update_hero_docs
+    @docs.update_hero_docs
     def partial_update(self, request, pk=None):
         """
         PATCH /api/heroes/{id}/
@@ -237,7 +250,7 @@ class HeroViewSet(viewsets.ViewSet):
         response_serializer = HeroReadSchema(hero)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
-    @delete_hero_docs
+    @docs.delete_hero_docs
     def destroy(self, request, pk=None):
         """
         DELETE /api/heroes/{id}/
@@ -247,3 +260,143 @@ class HeroViewSet(viewsets.ViewSet):
         result = self.service.delete_hero(int(pk))
 
         return Response(result, status=status.HTTP_200_OK)
+
+
+class AsyncHeroViewSet(AsyncAdmissionControlMixin, AsyncViewSet):
+    """
+    Versión async de HeroViewSet (mismas rutas, schemas y respuestas)
+
+    La validación de los schemas de escritura corre en un thread
+    (sync_to_async): TeamIdField puede consultar la base de datos.
+    """
+    # Misma serie en /api/metrics que la versión sync
+    metrics_name = 'HeroViewSet'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.service = HeroService()
+
+    @docs.create_hero_docs
+    async def create(self, request):
+        """
+        POST /api/heroes/
+        """
+        serializer = HeroCreateSchema(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+        team = serializer.validated_data['team']
+
+        hero = await self.service.acreate_hero(
+            nombre=serializer.validated_data['nombre'],
+            team_id=team.id,
+            descripcion=serializer.validated_data.get('descripcion'),
+            poder_principal=serializer.validated_data.get('poder_principal'),
+            nivel=serializer.validated_data.get('nivel', 1)
+        )
+
+        response_serializer = HeroReadSchema(hero)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    @docs.list_heroes_docs
+    async def list(self, request):
+        """
+        GET /api/heroes/
+        """
+        offset = int(request.query_params.get('offset', 0))
+        limit = int(request.query_params.get('limit', 10))
+
+        page = await self.service.aget_heroes_page(
+            offset=offset,
+            limit=limit,
+            include_archived=include_archived_param(request)
+        )
+
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(Response((await page.build()).data, status=status.HTTP_200_OK), page.validators)
+
+    @docs.retrieve_hero_docs
+    async def retrieve(self, request, pk=None):
+        """
+        GET /api/heroes/{id}/
+        """
+        representation = await self.service.aget_hero_representation(int(pk))
+
+        early_response = conditional_response(request, representation.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(
+            Response((await representation.build()).data, status=status.HTTP_200_OK),
+            representation.validators
+        )
+
+    @docs.get_by_name_docs
+    @action(detail=False, methods=['get'], url_path='by-name')
+    async def get_by_name(self, request):
+        """
+        GET /api/heroes/by-name/?nombre={nombre}
+        """
+        nombre = request.query_params.get('nombre')
+
+        hero = await self.service.aget_hero_by_name(nombre)
+
+        serializer = HeroReadSchema(hero)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @docs.get_by_team_docs
+    @action(detail=True, methods=['get'], url_path='by-team')
+    async def get_by_team(self, request, pk=None):
+        """
+        GET /api/heroes/{team_id}/by-team/
+        """
+        offset = int(request.query_params.get('offset', 0))
+        limit = int(request.query_params.get('limit', 10))
+
+        page = await self.service.aget_heroes_by_team_page(
+            team_id=int(pk),
+            offset=offset,
+            limit=limit,
+            include_archived=include_archived_param(request)
+        )
+
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(Response((await page.build()).data, status=status.HTTP_200_OK), page.validators)
+
+    @docs.update_hero_docs
+    async def partial_update(self, request, pk=None):
+        """
+        PATCH /api/heroes/{id}/
+        """
+        serializer = HeroUpdateSchema(data=request.data, partial=True)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+        team_id = None
+        if 'team' in serializer.validated_data:
+            team_id = serializer.validated_data['team'].id
+
+        hero = await self.service.aupdate_hero(
+            hero_id=int(pk),
+            nombre=serializer.validated_data.get('nombre'),
+            descripcion=serializer.validated_data.get('descripcion'),
+            poder_principal=serializer.validated_data.get('poder_principal'),
+            nivel=serializer.validated_data.get('nivel'),
+            team_id=team_id
+        )
+
+        response_serializer = HeroReadSchema(hero)
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+    @docs.delete_hero_docs
+    async def destroy(self, request, pk=None):
+        """
+        DELETE /api/heroes/{id}/
+        """
+        result = await self.service.adelete_hero(int(pk))
+
+        return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,28 @@
+"""
+Cachés de Teams
+
+- team_cache: representación serializada (TeamReadSchema) por ID de team.
+  Se invalida en TeamRepository.update_team/delete_team.
+- team_lookup_cache: objetos Team en memoria del proceso (LRU + TTL) delante
+  de TeamRepository.get_cached_team_by_id. Solo la usan las escrituras de
+  heroes (HeroService y la validación de team_id en los schemas de Heroes);
+  las lecturas de teams no pasan por ella.
+  Se invalida en TeamRepository.update_team/delete_team; en otros procesos
+  un cambio se ve como máximo TEAM_LOOKUP_CACHE_TTL segundos después.
+  Sus contadores se publican en /api/metrics (cache="team_lookup").
+- teams_page_cache: páginas completas del listado de teams.
+"""
+from django.conf import settings
+from apps.core.cache import LRUCache, RepresentationCache
+from apps.core.metrics import registry
+from apps.core.page_cache import PageCache
+
+team_cache = RepresentationCache('teams')
+
+team_lookup_cache = LRUCache(
+    maxsize=settings.TEAM_LOOKUP_CACHE_SIZE,
+    ttl=settings.TEAM_LOOKUP_CACHE_TTL
+)
+registry.register_cache('team_lookup', team_lookup_cache)
+
+teams_page_cache = PageCache('teams-list', tables=('teams',))
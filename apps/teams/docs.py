@@ -80,6 +80,9 @@ list_teams_docs = swagger_auto_schema(
                 }
             }
         ),
+        304: openapi.Response(
+            description="No modificado (If-None-Match coincide con el ETag)"
+        ),
         400: openapi.Response(
             description="Parámetros de paginación inválidos"
         )
@@ -97,6 +100,9 @@ retrieve_team_docs = swagger_auto_schema(
             description="Team encontrado exitosamente",
             schema=TeamReadSchema
         ),
+        304: openapi.Response(
+            description="No modificado (If-None-Match / If-Modified-Since coinciden con ETag / Last-Modified)"
+        ),
         404: openapi.Response(
             description="Team no encontrado",
             examples={
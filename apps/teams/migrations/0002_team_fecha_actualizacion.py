@@ -0,0 +1,32 @@
+# Generated by Django 4.2.25 on 2026-10-19 10:00
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.utils.timezone
+
+
+def copy_fecha_creacion(apps, schema_editor):
+    """Inicializa fecha_actualizacion con fecha_creacion en los registros existentes"""
+    Team = apps.get_model('teams', 'Team')
+    Team.objects.update(fecha_actualizacion=django.db.models.expressions.F('fecha_creacion'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Fecha de actualización'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_fecha_creacion, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['fecha_actualizacion'], name='idx_team_updated'),
+        ),
+    ]
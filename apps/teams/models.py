@@ -9,12 +9,16 @@ class Team(models.Model):
     nombre = models.CharField(max_length=255, verbose_name="Nombre del equipo")
     descripcion = models.TextField(verbose_name="Descripción del equipo", blank=True, null=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
 
     class Meta:
         db_table = 'teams'
         verbose_name = 'Team'
         verbose_name_plural = 'Teams'
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['fecha_actualizacion'], name='idx_team_updated'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} (ID: {self.id})"
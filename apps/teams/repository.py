@@ -1,9 +1,37 @@
 """
 Repository Layer para Teams
 Esta capa maneja todas las operaciones de acceso a datos
+
+Lecturas por ID:
+1. Identity Map del request (apps/core/identity_map.py)
+2. Base de datos
+
+get_cached_team_by_id() agrega team_lookup_cache (LRU + TTL en memoria del
+proceso) entre los dos. Solo la usan las validaciones de team_id en las
+escrituras de heroes: el resto (GET /api/teams/{id}/, los listados de
+heroes por team, las escrituras de teams) lee siempre la base de datos y
+ve enseguida los cambios hechos por otros procesos.
+
+Los métodos con prefijo a son las versiones async (ORM async de Django)
+que usan las vistas async bajo ASGI, con las mismas cachés.
+
+Con sharding de heroes (apps/heroes/sharding.py) el CASCADE de Django solo
+alcanza a la base del team: delete_team() elimina antes los heroes del
+team en su shard.
 """
+import copy
+from datetime import datetime
 from typing import List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from .cache import team_cache, team_lookup_cache
 from .models import Team
+from apps.core import identity_map
+from apps.core.group_commit import after_commit
+from apps.core.page_cache import bump_generation
+from apps.heroes import sharding
+from apps.heroes.cache import hero_cache
+from apps.heroes.repository import ShardedHeroRepository
 
 
 class TeamRepository:
@@ -23,16 +51,22 @@ class TeamRepository:
         Returns:
             Team: Instancia del team creado
         """
+        # Un único INSERT (el ID vuelve con RETURNING en SQLite >= 3.35)
         team = Team.objects.create(
             nombre=nombre,
             descripcion=descripcion
         )
+        identity_map.register(team)
+
+        # Las páginas cacheadas de teams quedan obsoletas (con group commit,
+        # al confirmarse el lote)
+        after_commit(lambda: bump_generation('teams'))
         return team
 
     @staticmethod
     def get_team_by_id(team_id: int) -> Optional[Team]:
         """
-        Obtiene un team por su ID
+        Obtiene un team por su ID (Identity Map del request o base de datos)
 
         Args:
             team_id: ID del team
@@ -40,11 +74,40 @@ class TeamRepository:
         Returns:
             Team o None si no existe
         """
+        team = identity_map.lookup(Team, team_id)
+        if team is not None:
+            return team
+
         try:
-            return Team.objects.get(id=team_id)
+            return identity_map.register(Team.objects.get(id=team_id))
         except Team.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_cached_team_by_id(team_id: int) -> Optional[Team]:
+        """
+        Obtiene un team por su ID pasando por team_lookup_cache (LRU + TTL
+        en memoria del proceso)
+
+        Solo para validar el team_id de las altas/modificaciones de heroes
+        (TeamIdField y HeroService), que lo consultan en cada escritura.
+        Un cambio hecho por otro proceso se ve como máximo
+        TEAM_LOOKUP_CACHE_TTL segundos después. Se retorna una copia para
+        que quien la reciba pueda modificarla sin afectar a la caché.
+
+        Args:
+            team_id: ID del team
+
+        Returns:
+            Team o None si no existe
+        """
+        team = identity_map.lookup(Team, team_id)
+        if team is not None:
+            return team
+
+        team = team_lookup_cache.get_or_load(team_id, lambda: Team.objects.filter(id=team_id).first())
+        return copy.copy(team) if team is not None else None
+
     @staticmethod
     def get_team_by_name(nombre: str) -> Optional[Team]:
         """
@@ -57,7 +120,7 @@ class TeamRepository:
             Team o None si no existe
         """
         try:
-            return Team.objects.get(nombre=nombre)
+            return identity_map.register(Team.objects.get(nombre=nombre))
         except Team.DoesNotExist:
             return None
 
@@ -81,10 +144,25 @@ class TeamRepository:
 
         return teams, total
 
+    @staticmethod
+    def get_teams_version() -> Tuple[int, Optional[datetime]]:
+        """
+        Obtiene la "versión" del listado de teams: COUNT + MAX(fecha_actualizacion)
+
+        Una sola query agregada que cambia con cada alta, modificación
+        o baja. Se usa para calcular ETag/Last-Modified.
+
+        Returns:
+            Tuple: (total de teams, última modificación o None si no hay teams)
+        """
+        version = Team.objects.aggregate(total=Count('id'), last_modified=Max('fecha_actualizacion'))
+        return version['total'], version['last_modified']
+
     @staticmethod
     def update_team(team_id: int, **kwargs) -> Optional[Team]:
         """
         Actualiza un team existente
+        (fecha_actualizacion se actualiza automáticamente en save())
 
         Args:
             team_id: ID del team a actualizar
@@ -97,12 +175,29 @@ class TeamRepository:
         if not team:
             return None
 
-        # Actualizar solo los campos proporcionados
+        # Actualizar solo los campos proporcionados (y escribir solo esas columnas)
+        update_fields = ['fecha_actualizacion']
         for key, value in kwargs.items():
             if hasattr(team, key) and value is not None:
                 setattr(team, key, value)
+                update_fields.append(key)
 
-        team.save()
+        team.save(update_fields=update_fields)
+
+        # team_lookup_cache se invalida ya: con group commit las escrituras
+        # siguientes del mismo lote (altas de heroes) deben ver el team nuevo
+        team_lookup_cache.invalidate(team_id)
+
+        # Invalidar la representación del team y la de todos los heroes
+        # (cada héroe lleva el team anidado: nombre, descripcion);
+        # con group commit, al confirmarse el lote
+        def invalidate():
+            team_cache.invalidate(team_id)
+            team_lookup_cache.invalidate(team_id)
+            hero_cache.invalidate_all()
+            bump_generation('teams')
+
+        after_commit(invalidate)
         return team
 
     @staticmethod
@@ -120,7 +215,16 @@ class TeamRepository:
         if not team:
             return False
 
+        if sharding.is_enabled():
+            ShardedHeroRepository.delete_heroes_by_team(team_id)
         team.delete()
+        identity_map.forget(Team, team_id)
+
+        # El CASCADE elimina también sus heroes
+        team_cache.invalidate(team_id)
+        team_lookup_cache.invalidate(team_id)
+        hero_cache.invalidate_all()
+        bump_generation('teams', 'heroes')
         return True
 
     @staticmethod
@@ -147,4 +251,130 @@ class TeamRepository:
         Returns:
             bool: True si existe, False si no
         """
-        return Team.objects.filter(id=team_id).exists()
+        return TeamRepository.get_team_by_id(team_id) is not None
+
+    # ==================== ASYNC (ORM async) ====================
+    @staticmethod
+    async def acreate_team(nombre: str, descripcion: Optional[str] = None) -> Team:
+        """
+        Versión async de create_team()
+        """
+        team = await Team.objects.acreate(
+            nombre=nombre,
+            descripcion=descripcion
+        )
+        identity_map.register(team)
+
+        bump_generation('teams')
+        return team
+
+    @staticmethod
+    async def aget_team_by_id(team_id: int) -> Optional[Team]:
+        """
+        Versión async de get_team_by_id()
+        """
+        team = identity_map.lookup(Team, team_id)
+        if team is not None:
+            return team
+
+        try:
+            return identity_map.register(await Team.objects.aget(id=team_id))
+        except Team.DoesNotExist:
+            return None
+
+    @staticmethod
+    async def aget_cached_team_by_id(team_id: int) -> Optional[Team]:
+        """
+        Versión async de get_cached_team_by_id() (misma team_lookup_cache)
+        """
+        team = identity_map.lookup(Team, team_id)
+        if team is not None:
+            return team
+
+        team = await team_lookup_cache.aget_or_load(team_id, lambda: Team.objects.filter(id=team_id).afirst())
+        return copy.copy(team) if team is not None else None
+
+    @staticmethod
+    async def aget_team_by_name(nombre: str) -> Optional[Team]:
+        """
+        Versión async de get_team_by_name()
+        """
+        try:
+            return identity_map.register(await Team.objects.aget(nombre=nombre))
+        except Team.DoesNotExist:
+            return None
+
+    @staticmethod
+    async def aget_all_teams(offset: int = 0, limit: int = 10) -> Tuple[List[Team], int]:
+        """
+        Versión async de get_all_teams()
+        """
+        queryset = Team.objects.all().order_by('-fecha_creacion')
+        total = await queryset.acount()
+        teams = [team async for team in queryset[offset:offset + limit]]
+        return teams, total
+
+    @staticmethod
+    async def aget_teams_version() -> Tuple[int, Optional[datetime]]:
+        """
+        Versión async de get_teams_version()
+        """
+        version = await Team.objects.aaggregate(total=Count('id'), last_modified=Max('fecha_actualizacion'))
+        return version['total'], version['last_modified']
+
+    @staticmethod
+    async def aupdate_team(team_id: int, **kwargs) -> Optional[Team]:
+        """
+        Versión async de update_team()
+        """
+        team = await TeamRepository.aget_team_by_id(team_id)
+        if not team:
+            return None
+
+        update_fields = ['fecha_actualizacion']
+        for key, value in kwargs.items():
+            if hasattr(team, key) and value is not None:
+                setattr(team, key, value)
+                update_fields.append(key)
+
+        await team.asave(update_fields=update_fields)
+
+        team_cache.invalidate(team_id)
+        team_lookup_cache.invalidate(team_id)
+        hero_cache.invalidate_all()
+        bump_generation('teams')
+        return team
+
+    @staticmethod
+    async def adelete_team(team_id: int) -> bool:
+        """
+        Versión async de delete_team()
+        """
+        team = await TeamRepository.aget_team_by_id(team_id)
+        if not team:
+            return False
+
+        if sharding.is_enabled():
+            await sync_to_async(ShardedHeroRepository.delete_heroes_by_team)(team_id)
+        await team.adelete()
+        identity_map.forget(Team, team_id)
+
+        team_cache.invalidate(team_id)
+        team_lookup_cache.invalidate(team_id)
+        hero_cache.invalidate_all()
+        bump_generation('teams', 'heroes')
+        return True
+
+    @staticmethod
+    async def aexists_by_name(nombre: str) -> bool:
+        """
+        Versión async de exists_by_name()
+        """
+        return await Team.objects.filter(nombre=nombre).aexists()
+
+    @staticmethod
+    async def aexists_by_id(team_id: int) -> bool:
+        """
+        Versión async de exists_by_id()
+        """
+        return await TeamRepository.aget_team_by_id(team_id) is not None
@@ -1,20 +1,30 @@
 """
 Routers para Teams
 Configuración de rutas y endpoints
+
+Con ASYNC_VIEWS activo (pensado para ASGI) las rutas
+las atiende AsyncTeamViewSet
 """
+from django.conf import settings
 from rest_framework.routers import DefaultRouter
-from .views import TeamViewSet
+from .views import AsyncTeamViewSet, TeamViewSet
 
 
-def get_teams_router():
+def get_teams_router(async_views: bool = None):
     """
     Configura y retorna el router para Teams
 
+    Args:
+        async_views: Usar AsyncTeamViewSet (default: settings.ASYNC_VIEWS)
+
     Returns:
         DefaultRouter: Router configurado con las rutas de Teams
     """
     router = DefaultRouter()
-    router.register(r'teams', TeamViewSet, basename='team')
+    if async_views is None:
+        async_views = settings.ASYNC_VIEWS
+    viewset = AsyncTeamViewSet if async_views else TeamViewSet
+    router.register(r'teams', viewset, basename='team')
     return router
 
 
@@ -42,11 +42,12 @@ class TeamReadSchema(serializers.ModelSerializer):
     nombre = serializers.CharField(max_length=255)
     descripcion = serializers.CharField(allow_null=True, allow_blank=True)
     fecha_creacion = serializers.DateTimeField(read_only=True)
+    fecha_actualizacion = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Team
-        fields = ['id', 'nombre', 'descripcion', 'fecha_creacion']
-        read_only_fields = ['id', 'fecha_creacion']
+        fields = ['id', 'nombre', 'descripcion', 'fecha_creacion', 'fecha_actualizacion']
+        read_only_fields = ['id', 'fecha_creacion', 'fecha_actualizacion']
 
 
 class TeamUpdateSchema(serializers.ModelSerializer):
@@ -1,11 +1,23 @@
 """
 Services Layer para Teams
 Esta capa contiene la lógica de negocio y validaciones
+
+Los métodos con prefijo a son las versiones async (vistas async bajo ASGI),
+con las mismas validaciones y mensajes
+
+create_team y update_team llevan @batched_write: con group commit
+(apps/core/group_commit.py) corren en el thread escritor y se confirman
+en lotes
 """
 from typing import List, Dict, Optional, Tuple
 from rest_framework.exceptions import ValidationError, NotFound
 from .repository import TeamRepository
+from .cache import team_cache, teams_page_cache
 from .models import Team
+from .schemas import TeamReadSchema
+from apps.core import group_commit
+from apps.core.cache import DeferredRepresentation, Representation
+from apps.core.conditional import Validators, build_validators
 
 
 class TeamService:
@@ -16,6 +28,7 @@ class TeamService:
     def __init__(self):
         self.repository = TeamRepository()
 
+    @group_commit.batched_write
     def create_team(self, nombre: str, descripcion: Optional[str] = None) -> Team:
         """
         Crea un nuevo team validando que no exista previamente
@@ -85,6 +98,42 @@ class TeamService:
 
         return team
 
+    def get_team_representation(self, team_id: int) -> DeferredRepresentation:
+        """
+        Obtiene la representación serializada de un team (read-through cache)
+
+        En un acierto no se consulta la base de datos ni se ejecuta
+        TeamReadSchema. En un fallo TeamReadSchema corre (y se guarda la
+        representación) recién con build(): un 304/HEAD no serializa
+
+        Args:
+            team_id: ID del team
+
+        Returns:
+            DeferredRepresentation: validadores ETag/Last-Modified + build()
+
+        Raises:
+            NotFound: Si el team no existe
+        """
+        if team_id <= 0:
+            raise ValidationError({
+                "id": "El ID debe ser un número positivo"
+            })
+
+        representation, token = team_cache.lookup(team_id)
+        if representation is not None:
+            return DeferredRepresentation.ready(representation)
+
+        team = self.get_team_by_id(team_id)
+        validators = self.get_team_validators(team)
+
+        def build() -> Representation:
+            representation = Representation(TeamReadSchema(team).data, validators)
+            team_cache.store(team_id, token, representation)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
     def get_team_by_name(self, nombre: str) -> Team:
         """
         Obtiene un team por su nombre validando que exista
@@ -156,6 +205,97 @@ class TeamService:
             "has_previous": offset > 0
         }
 
+    def get_teams_page(self, offset: int = 0, limit: int = 10) -> DeferredRepresentation:
+        """
+        Obtiene una página del listado de teams ya serializada
+
+        Pasa por teams_page_cache: una página fresca se sirve sin queries
+        ni serializer; una página obsoleta puede servirse (hasta max_stale
+        segundos) mientras se recalcula en segundo plano. Sin página
+        cacheada solo se calculan los validadores: COUNT, página y
+        serializer corren recién con build() (un 304/HEAD no los ejecuta)
+
+        Args:
+            offset: Índice de inicio (default: 0)
+            limit: Cantidad de resultados (default: 10, max: 100)
+
+        Returns:
+            DeferredRepresentation: validadores ETag + build() de la página
+
+        Raises:
+            ValidationError: Si los parámetros de paginación son inválidos
+        """
+        def validate() -> Validators:
+            return self.get_teams_validators(offset=offset, limit=limit)
+
+        def build_page(validators: Validators) -> Representation:
+            result = self.get_all_teams(offset=offset, limit=limit)
+            data = {
+                "teams": TeamReadSchema(result['teams'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous']
+            }
+            return Representation(data, validators)
+
+        return teams_page_cache.lookup({'offset': offset, 'limit': limit}, validate, build_page)
+
+    def get_team_validators(self, team: Team) -> Validators:
+        """
+        Calcula ETag/Last-Modified de un team ya cargado (sin queries extra)
+
+        Args:
+            team: Team cargado
+
+        Returns:
+            Validators: (etag, last_modified)
+        """
+        return build_validators(
+            'team', team.id, team.fecha_actualizacion,
+            last_modified=team.fecha_actualizacion
+        )
+
+    def get_teams_validators(self, offset: int = 0, limit: int = 10) -> Validators:
+        """
+        Calcula el ETag del listado paginado de teams
+        a partir de COUNT + MAX(fecha_actualizacion), sin traer filas
+
+        Sin Last-Modified: MAX(fecha_actualizacion) no cambia al borrar un
+        team (If-Modified-Since daría 304 con el team borrado). El COUNT
+        del ETag sí cambia.
+
+        Args:
+            offset: Índice de inicio
+            limit: Cantidad de resultados
+
+        Returns:
+            Validators: (etag, None)
+
+        Raises:
+            ValidationError: Si los parámetros de paginación son inválidos
+        """
+        if offset < 0:
+            raise ValidationError({
+                "offset": "El offset debe ser un número positivo o cero"
+            })
+
+        if limit <= 0:
+            raise ValidationError({
+                "limit": "El limit debe ser un número positivo mayor a cero"
+            })
+
+        if limit > 100:
+            raise ValidationError({
+                "limit": "El limit no puede ser mayor a 100"
+            })
+
+        total, last_modified = self.repository.get_teams_version()
+
+        return build_validators('teams', total, last_modified, offset, limit)
+
+    @group_commit.batched_write
     def update_team(self, team_id: int, nombre: Optional[str] = None,
                     descripcion: Optional[str] = None) -> Team:
         """
@@ -265,3 +405,236 @@ class TeamService:
             "message": f"Team '{team_name}' eliminado exitosamente",
             "id": team_id
         }
+
+    # ==================== ASYNC ====================
+    async def acreate_team(self, nombre: str, descripcion: Optional[str] = None) -> Team:
+        """
+        Versión async de create_team()
+        """
+        if group_commit.is_enabled():
+            return await group_commit.asubmit(lambda: self.create_team(nombre, descripcion))
+
+        if not nombre or nombre.strip() == "":
+            raise ValidationError({
+                "nombre": "El nombre del team es requerido y no puede estar vacío"
+            })
+
+        if len(nombre) > 255:
+            raise ValidationError({
+                "nombre": "El nombre del team no puede exceder 255 caracteres"
+            })
+
+        if await self.repository.aexists_by_name(nombre):
+            raise ValidationError({
+                "nombre": f"Ya existe un team con el nombre '{nombre}'"
+            })
+
+        return await self.repository.acreate_team(
+            nombre=nombre.strip(),
+            descripcion=descripcion.strip() if descripcion else None
+        )
+
+    async def aget_team_by_id(self, team_id: int) -> Team:
+        """
+        Versión async de get_team_by_id()
+        """
+        if team_id <= 0:
+            raise ValidationError({
+                "id": "El ID debe ser un número positivo"
+            })
+
+        team = await self.repository.aget_team_by_id(team_id)
+
+        if not team:
+            raise NotFound({
+                "detail": f"No se encontró el team con ID {team_id}"
+            })
+
+        return team
+
+    async def aget_team_representation(self, team_id: int) -> DeferredRepresentation:
+        """
+        Versión async de get_team_representation() (misma team_cache)
+        """
+        if team_id <= 0:
+            raise ValidationError({
+                "id": "El ID debe ser un número positivo"
+            })
+
+        representation, token = team_cache.lookup(team_id)
+        if representation is not None:
+            return DeferredRepresentation.aready(representation)
+
+        team = await self.aget_team_by_id(team_id)
+        validators = self.get_team_validators(team)
+
+        async def build() -> Representation:
+            representation = Representation(TeamReadSchema(team).data, validators)
+            team_cache.store(team_id, token, representation)
+            return representation
+
+        return DeferredRepresentation(validators, build)
+
+    async def aget_team_by_name(self, nombre: str) -> Team:
+        """
+        Versión async de get_team_by_name()
+        """
+        if not nombre or nombre.strip() == "":
+            raise ValidationError({
+                "nombre": "El nombre del team es requerido para la búsqueda"
+            })
+
+        team = await self.repository.aget_team_by_name(nombre.strip())
+
+        if not team:
+            raise NotFound({
+                "detail": f"No se encontró el team con nombre '{nombre}'"
+            })
+
+        return team
+
+    async def aget_all_teams(self, offset: int = 0, limit: int = 10) -> Dict:
+        """
+        Versión async de get_all_teams()
+        """
+        self._validate_pagination(offset, limit)
+
+        teams, total = await self.repository.aget_all_teams(offset=offset, limit=limit)
+
+        return {
+            "teams": teams,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "has_next": (offset + limit) < total,
+            "has_previous": offset > 0
+        }
+
+    async def aget_teams_page(self, offset: int = 0, limit: int = 10) -> DeferredRepresentation:
+        """
+        Versión async de get_teams_page() (misma teams_page_cache)
+        """
+        async def validate() -> Validators:
+            return await self.aget_teams_validators(offset=offset, limit=limit)
+
+        async def build_page(validators: Validators) -> Representation:
+            result = await self.aget_all_teams(offset=offset, limit=limit)
+            data = {
+                "teams": TeamReadSchema(result['teams'], many=True).data,
+                "total": result['total'],
+                "offset": result['offset'],
+                "limit": result['limit'],
+                "has_next": result['has_next'],
+                "has_previous": result['has_previous']
+            }
+            return Representation(data, validators)
+
+        return await teams_page_cache.alookup({'offset': offset, 'limit': limit}, validate, build_page)
+
+    async def aget_teams_validators(self, offset: int = 0, limit: int = 10) -> Validators:
+        """
+        Versión async de get_teams_validators()
+        """
+        self._validate_pagination(offset, limit)
+
+        total, last_modified = await self.repository.aget_teams_version()
+
+        return build_validators('teams', total, last_modified, offset, limit)
+
+    async def aupdate_team(self, team_id: int, nombre: Optional[str] = None,
+                           descripcion: Optional[str] = None) -> Team:
+        """
+        Versión async de update_team()
+        """
+        if group_commit.is_enabled():
+            return await group_commit.asubmit(lambda: self.update_team(team_id, nombre, descripcion))
+
+        if team_id <= 0:
+            raise ValidationError({
+                "id": "El ID debe ser un número positivo"
+            })
+
+        if not await self.repository.aexists_by_id(team_id):
+            raise NotFound({
+                "detail": f"No se encontró el team con ID {team_id}"
+            })
+
+        if nombre is None and descripcion is None:
+            raise ValidationError({
+                "detail": "Debe proporcionar al menos un campo para actualizar (nombre o descripcion)"
+            })
+
+        update_data = {}
+
+        if nombre is not None:
+            if nombre.strip() == "":
+                raise ValidationError({
+                    "nombre": "El nombre no puede estar vacío"
+                })
+
+            if len(nombre) > 255:
+                raise ValidationError({
+                    "nombre": "El nombre del team no puede exceder 255 caracteres"
+                })
+
+            existing_team = await self.repository.aget_team_by_name(nombre.strip())
+            if existing_team and existing_team.id != team_id:
+                raise ValidationError({
+                    "nombre": f"Ya existe otro team con el nombre '{nombre}'"
+                })
+
+            update_data['nombre'] = nombre.strip()
+
+        if descripcion is not None:
+            update_data['descripcion'] = descripcion.strip() if descripcion else None
+
+        return await self.repository.aupdate_team(team_id, **update_data)
+
+    async def adelete_team(self, team_id: int) -> Dict:
+        """
+        Versión async de delete_team()
+        """
+        if team_id <= 0:
+            raise ValidationError({
+                "id": "El ID debe ser un número positivo"
+            })
+
+        team = await self.repository.aget_team_by_id(team_id)
+        if not team:
+            raise NotFound({
+                "detail": f"No se encontró el team con ID {team_id}"
+            })
+
+        team_name = team.nombre
+
+        deleted = await self.repository.adelete_team(team_id)
+
+        if not deleted:
+            raise ValidationError({
+                "detail": "No se pudo eliminar el team"
+            })
+
+        return {
+            "message": f"Team '{team_name}' eliminado exitosamente",
+            "id": team_id
+        }
+
+    @staticmethod
+    def _validate_pagination(offset: int, limit: int) -> None:
+        """
+        Validaciones de paginación compartidas por las versiones async
+        """
+        if offset < 0:
+            raise ValidationError({
+                "offset": "El offset debe ser un número positivo o cero"
+            })
+
+        if limit <= 0:
+            raise ValidationError({
+                "limit": "El limit debe ser un número positivo mayor a cero"
+            })
+
+        if limit > 100:
+            raise ValidationError({
+                "limit": "El limit no puede ser mayor a 100"
+            })
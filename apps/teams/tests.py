@@ -1,3 +1,180 @@
-from django.test import TestCase
+"""
+Tests de presupuesto de queries para los endpoints de Teams
 
-# Create your tests here.
+Cada ruta registrada en teams_router tiene un máximo explícito de queries
+(con las cachés vacías). Si se supera, el test muestra el SQL agrupado por
+el punto del código que lo ejecutó.
+"""
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.testing import QueryBudgetMixin
+from apps.core.url_dispatch import compiled_path
+from apps.heroes.models import Hero
+from config.routers import get_api_router
+from .cache import team_lookup_cache
+from .models import Team
+from .repository import TeamRepository
+from .routers import teams_router
+from .schemas import TeamReadSchema
+
+PAGE_SIZES = [1, 10, 100]
+
+# URLconf con los ViewSets async para AsyncTeamQueryBudgetTests
+urlpatterns = [compiled_path('api/', get_api_router(async_views=True).urls)]
+
+# Máximo de queries por (ruta, método) con las cachés vacías
+QUERY_BUDGETS = {
+    # aggregate teams + COUNT + página
+    ('team-list', 'GET'): 3,
+    # nombre único + INSERT
+    ('team-list', 'POST'): 2,
+    # SELECT team
+    ('team-detail', 'GET'): 1,
+    # team (existe; la escritura lo toma del Identity Map) + nombre único + UPDATE
+    ('team-detail', 'PATCH'): 3,
+    # team (la escritura lo toma del Identity Map) + DELETE heroes y heroes_archive (CASCADE) + DELETE team
+    ('team-detail', 'DELETE'): 4,
+    # SELECT team
+    ('team-get-by-name', 'GET'): 1,
+}
+
+
+class TeamQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Presupuesto de queries de cada ruta de teams_router
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Team.objects.bulk_create([
+            Team(nombre=f"Team {i}", descripcion="Descripción") for i in range(120)
+        ])
+        cls.team = Team.objects.get(nombre="Team 0")
+        Hero.objects.bulk_create([
+            Hero(nombre=f"Hero {i}", nivel=10, team=cls.team) for i in range(20)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        # Las cachés no se deshacen con el rollback de cada test
+        cache.clear()
+        team_lookup_cache.clear()
+
+    def test_every_route_has_a_budget(self):
+        """Cada (ruta, método) del router, salvo la raíz de la API, tiene presupuesto"""
+        routes = {
+            (pattern.name, method.upper())
+            for pattern in teams_router.urls
+            if pattern.name != 'api-root'
+            for method in pattern.callback.actions
+            if method != 'head'
+        }
+        self.assertEqual(routes - set(QUERY_BUDGETS), set())
+
+    def test_list(self):
+        for limit in PAGE_SIZES:
+            cache.clear()
+            with self.subTest(limit=limit), self.assertMaxQueries(QUERY_BUDGETS[('team-list', 'GET')], f'GET /api/teams/?limit={limit}'):
+                response = self.client.get(reverse('team-list'), {'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['teams']), limit)
+
+    def test_retrieve(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('team-detail', 'GET')], 'GET /api/teams/{id}/'):
+            response = self.client.get(reverse('team-detail', args=[self.team.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_by_name(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('team-get-by-name', 'GET')], 'GET /api/teams/by-name/'):
+            response = self.client.get(reverse('team-get-by-name'), {'nombre': self.team.nombre})
+        self.assertEqual(response.status_code, 200)
+
+    def test_create(self):
+        data = {'nombre': 'Justice League', 'descripcion': 'Los más poderosos'}
+        with self.assertMaxQueries(QUERY_BUDGETS[('team-list', 'POST')], 'POST /api/teams/'):
+            response = self.client.post(reverse('team-list'), data, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_partial_update(self):
+        data = {'nombre': 'Nuevo nombre', 'descripcion': 'Nueva descripción'}
+        with self.assertMaxQueries(QUERY_BUDGETS[('team-detail', 'PATCH')], 'PATCH /api/teams/{id}/'):
+            response = self.client.patch(reverse('team-detail', args=[self.team.id]), data, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_destroy(self):
+        with self.assertMaxQueries(QUERY_BUDGETS[('team-detail', 'DELETE')], 'DELETE /api/teams/{id}/'):
+            response = self.client.delete(reverse('team-detail', args=[self.team.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Hero.objects.filter(team_id=self.team.id).exists())
+
+    def test_cached_reads_do_not_query(self):
+        """Con las cachés calientes, detalle y listado no consultan la BD"""
+        for url in [reverse('team-list'), reverse('team-detail', args=[self.team.id])]:
+            self.client.get(url)
+            with self.subTest(url=url), self.assertMaxQueries(0, f'GET {url} (caché)'):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_cold_conditional_retrieve_does_not_serialize(self):
+        """Con la caché fría, 304 y HEAD del detalle responden sin ejecutar TeamReadSchema"""
+        url = reverse('team-detail', args=[self.team.id])
+        etag = self.client.get(url)['ETag']
+        requests = [
+            ('304', lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag), 304),
+            ('HEAD', lambda: self.client.head(url), 200),
+        ]
+        for label, send, expected in requests:
+            cache.clear()
+            with self.subTest(label), mock.patch.object(TeamReadSchema, 'to_representation') as serialize:
+                response = send()
+            self.assertEqual(response.status_code, expected)
+            self.assertEqual(response['ETag'], etag)
+            serialize.assert_not_called()
+
+    def test_cold_conditional_list_only_reads_versions(self):
+        """Con la caché fría, 304 y HEAD del listado solo hacen la query de versión"""
+        url = reverse('team-list')
+        etag = self.client.get(url, {'limit': 20})['ETag']
+        for method, headers, expected in (('get', {'HTTP_IF_NONE_MATCH': etag}, 304), ('head', {}, 200)):
+            cache.clear()
+            with mock.patch.object(TeamReadSchema, 'to_representation') as serialize:
+                with self.subTest(method=method), self.assertMaxQueries(1, f'{method.upper()} {url} (caché fría)'):
+                    response = getattr(self.client, method)(url, {'limit': 20}, **headers)
+            self.assertEqual(response.status_code, expected)
+            self.assertEqual(response['ETag'], etag)
+            serialize.assert_not_called()
+
+    def test_rename_invalidates_hero_representation(self):
+        """Renombrar un team invalida la representación cacheada de sus heroes"""
+        hero = Hero.objects.filter(team=self.team).first()
+        hero_url = reverse('hero-detail', args=[hero.id])
+        self.client.get(hero_url)
+
+        self.client.patch(reverse('team-detail', args=[self.team.id]), {'nombre': 'Renombrado'}, format='json')
+
+        response = self.client.get(hero_url)
+        self.assertEqual(response.data['team']['nombre'], 'Renombrado')
+
+    def test_reads_do_not_use_team_lookup_cache(self):
+        """
+        Un cambio hecho por otro proceso (sin invalidar team_lookup_cache)
+        se ve enseguida en las lecturas de teams; solo la validación de las
+        escrituras de heroes usa la copia cacheada
+        """
+        TeamRepository.get_cached_team_by_id(self.team.id)
+        Team.objects.filter(id=self.team.id).update(nombre='Cambiado en otro proceso')
+
+        self.assertEqual(TeamRepository.get_team_by_id(self.team.id).nombre, 'Cambiado en otro proceso')
+        self.assertEqual(TeamRepository.get_cached_team_by_id(self.team.id).nombre, 'Team 0')
+        response = self.client.get(reverse('team-detail', args=[self.team.id]))
+        self.assertEqual(response.data['nombre'], 'Cambiado en otro proceso')
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTeamQueryBudgetTests(TeamQueryBudgetTests):
+    """
+    Los mismos presupuestos y respuestas con AsyncTeamViewSet (ASYNC_VIEWS)
+    """
@@ -4,23 +4,28 @@ Views/Controllers para Teams
 Esta capa maneja las peticiones HTTP y las respuestas.
 La documentación Swagger se encuentra en teams/docs.py para mantener
 este archivo limpio y enfocado en la lógica de negocio.
+
+AsyncTeamViewSet sirve las mismas rutas con acciones async (ORM async);
+el router lo usa en lugar de TeamViewSet cuando ASYNC_VIEWS está activo.
+
+Ambos pasan por el control de admisión (rate limit por cliente y
+límite de concurrencia, 429/503): ver apps/core/admission.py.
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from apps.core.admission import AdmissionControlMixin, AsyncAdmissionControlMixin
+from apps.core.api_docs import LazyDocs
+from apps.core.async_views import AsyncViewSet
+from apps.core.conditional import apply_validators, conditional_response
 from .services import TeamService
 from .schemas import TeamCreateSchema, TeamReadSchema, TeamUpdateSchema
-from .docs import (
-    create_team_docs,
-    list_teams_docs,
-    retrieve_team_docs,
-    update_team_docs,
-    delete_team_docs,
-    get_by_name_docs
-)
+
+# Decoradores de documentación de teams/docs.py (se importa recién al pedir /docs/)
+docs = LazyDocs('apps.teams.docs')
 
 
-class TeamViewSet(viewsets.ViewSet):
+class TeamViewSet(AdmissionControlMixin, viewsets.ViewSet):
     """
     ViewSet para operaciones CRUD de Teams
 
@@ -37,7 +42,7 @@ class TeamViewSet(viewsets.ViewSet):
         super().__init__(*args, **kwargs)
         self.service = TeamService()
 
-    @create_team_docs
+    @docs.create_team_docs
     def create(self, request):
         """
         POST /api/teams/
@@ -57,48 +62,48 @@ class TeamViewSet(viewsets.ViewSet):
         response_serializer = TeamReadSchema(team)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
-    @list_teams_docs
+    @docs.list_teams_docs
     def list(self, request):
         """
         GET /api/teams/
         Lista todos los teams con paginación
+        Soporta If-None-Match (304) y HEAD
         """
         # Obtener parámetros de paginación
         offset = int(request.query_params.get('offset', 0))
         limit = int(request.query_params.get('limit', 10))
 
-        # Llamar al servicio
-        result = self.service.get_all_teams(offset=offset, limit=limit)
-
-        # Serializar teams
-        teams_serializer = TeamReadSchema(result['teams'], many=True)
+        # Llamar al servicio (validadores; la página, desde caché si existe)
+        page = self.service.get_teams_page(offset=offset, limit=limit)
 
-        # Construir respuesta
-        response_data = {
-            "teams": teams_serializer.data,
-            "total": result['total'],
-            "offset": result['offset'],
-            "limit": result['limit'],
-            "has_next": result['has_next'],
-            "has_previous": result['has_previous']
-        }
+        # Responder 304/HEAD sin cuerpo (sin COUNT, página ni serializer)
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return apply_validators(Response(page.build().data, status=status.HTTP_200_OK), page.validators)
 
-    @retrieve_team_docs
+    @docs.retrieve_team_docs
     def retrieve(self, request, pk=None):
         """
         GET /api/teams/{id}/
         Obtiene un team por su ID
+        Soporta If-None-Match / If-Modified-Since (304) y HEAD
         """
-        # Llamar al servicio
-        team = self.service.get_team_by_id(int(pk))
+        # Llamar al servicio (validadores; desde caché si existe)
+        representation = self.service.get_team_representation(int(pk))
 
-        # Serializar respuesta
-        serializer = TeamReadSchema(team)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Responder 304/HEAD sin cuerpo (y sin serializar)
+        early_response = conditional_response(request, representation.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(
+            Response(representation.build().data, status=status.HTTP_200_OK),
+            representation.validators
+        )
 
-    @get_by_name_docs
+    @docs.get_by_name_docs
     @action(detail=False, methods=['get'], url_path='by-name')
     def get_by_name(self, request):
         """
@@ -114,7 +119,7 @@ class TeamViewSet(viewsets.ViewSet):
         serializer = TeamReadSchema(team)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    @update_team_docs
+    @docs.update_team_docs
     def partial_update(self, request, pk=None):
         """
         PATCH /api/teams/{id}/
@@ -135,7 +140,7 @@ class TeamViewSet(viewsets.ViewSet):
         response_serializer = TeamReadSchema(team)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
-    @delete_team_docs
+    @docs.delete_team_docs
     def destroy(self, request, pk=None):
         """
         DELETE /api/teams/{id}/
@@ -145,3 +150,105 @@ class TeamViewSet(viewsets.ViewSet):
         result = self.service.delete_team(int(pk))
 
         return Response(result, status=status.HTTP_200_OK)
+
+
+class AsyncTeamViewSet(AsyncAdmissionControlMixin, AsyncViewSet):
+    """
+    Versión async de TeamViewSet (mismas rutas, schemas y respuestas)
+
+    Los schemas de Teams no consultan la base de datos, así que se
+    validan directamente en el event loop
+    """
+    # Misma serie en /api/metrics que la versión sync
+    metrics_name = 'TeamViewSet'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.service = TeamService()
+
+    @docs.create_team_docs
+    async def create(self, request):
+        """
+        POST /api/teams/
+        """
+        serializer = TeamCreateSchema(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        team = await self.service.acreate_team(
+            nombre=serializer.validated_data['nombre'],
+            descripcion=serializer.validated_data.get('descripcion')
+        )
+
+        response_serializer = TeamReadSchema(team)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    @docs.list_teams_docs
+    async def list(self, request):
+        """
+        GET /api/teams/
+        """
+        offset = int(request.query_params.get('offset', 0))
+        limit = int(request.query_params.get('limit', 10))
+
+        page = await self.service.aget_teams_page(offset=offset, limit=limit)
+
+        early_response = conditional_response(request, page.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(Response((await page.build()).data, status=status.HTTP_200_OK), page.validators)
+
+    @docs.retrieve_team_docs
+    async def retrieve(self, request, pk=None):
+        """
+        GET /api/teams/{id}/
+        """
+        representation = await self.service.aget_team_representation(int(pk))
+
+        early_response = conditional_response(request, representation.validators)
+        if early_response is not None:
+            return early_response
+
+        return apply_validators(
+            Response((await representation.build()).data, status=status.HTTP_200_OK),
+            representation.validators
+        )
+
+    @docs.get_by_name_docs
+    @action(detail=False, methods=['get'], url_path='by-name')
+    async def get_by_name(self, request):
+        """
+        GET /api/teams/by-name/?nombre={nombre}
+        """
+        nombre = request.query_params.get('nombre')
+
+        team = await self.service.aget_team_by_name(nombre)
+
+        serializer = TeamReadSchema(team)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @docs.update_team_docs
+    async def partial_update(self, request, pk=None):
+        """
+        PATCH /api/teams/{id}/
+        """
+        serializer = TeamUpdateSchema(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        team = await self.service.aupdate_team(
+            team_id=int(pk),
+            nombre=serializer.validated_data.get('nombre'),
+            descripcion=serializer.validated_data.get('descripcion')
+        )
+
+        response_serializer = TeamReadSchema(team)
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+    @docs.delete_team_docs
+    async def destroy(self, request, pk=None):
+        """
+        DELETE /api/teams/{id}/
+        """
+        result = await self.service.adelete_team(int(pk))
+
+        return Response(result, status=status.HTTP_200_OK)
@@ -47,6 +47,39 @@ def check_database_connection():
         return False
 
 
+def check_sqlite_pragmas():
+    """
+    Muestra los PRAGMAs activos de SQLite y los compara con settings.SQLITE_PROFILE
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    from django.conf import settings
+    from apps.core.sqlite_profile import active_pragmas, get_profile
+
+    try:
+        expected = get_profile()
+        active = active_pragmas(connection)
+    except Exception as e:
+        print(f"\n⚠ No se pudieron leer los PRAGMAs de SQLite: {str(e)}")
+        return
+
+    print(f"\nPRAGMAs de SQLite (perfil '{settings.SQLITE_PROFILE}'):")
+    mismatches = 0
+    for name, value in active.items():
+        wanted = expected.get(name)
+        if wanted is None:
+            print(f"  {name} = {value}")
+        elif str(wanted).upper() == str(value).upper():
+            print(f"  ✓ {name} = {value}")
+        else:
+            mismatches += 1
+            print(f"  ⚠ {name} = {value} (el perfil pide {wanted})")
+
+    if mismatches:
+        print("⚠ Algunos PRAGMAs no coinciden con el perfil (¿base de solo lectura o en memoria?)")
+
+
 def check_migrations():
     """
     Verifica si hay migraciones pendientes
@@ -72,6 +105,7 @@ if __name__ == '__main__':
     print("=" * 50 + "\n")
 
     if check_database_connection():
+        check_sqlite_pragmas()
         check_migrations()
         print("\n✓ Verificación completada exitosamente\n")
         sys.exit(0)
@@ -0,0 +1,34 @@
+"""
+Router único de la API
+
+Registra en un solo DefaultRouter los ViewSets de todas las apps (cada
+app sigue declarando los suyos en su routers.py). Una sola vista raíz
+(/api/) que lista todos los recursos y una sola lista de rutas que
+config/urls.py compila con compiled_path (ver apps/core/url_dispatch.py).
+"""
+from rest_framework.routers import DefaultRouter
+from apps.heroes.routers import get_heroes_router
+from apps.teams.routers import get_teams_router
+
+APP_ROUTERS = (get_teams_router, get_heroes_router)
+
+
+def get_api_router(async_views: bool = None):
+    """
+    Crea el router de la API con los ViewSets de todas las apps.
+
+    Args:
+        async_views: Usar los ViewSets async (default: settings.ASYNC_VIEWS)
+
+    Returns:
+        DefaultRouter: Router con teams y heroes registrados
+    """
+    router = DefaultRouter()
+    for get_app_router in APP_ROUTERS:
+        for prefix, viewset, basename in get_app_router(async_views).registry:
+            router.register(prefix, viewset, basename=basename)
+    return router
+
+
+# Exportar el router ya configurado
+api_router = get_api_router()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,6 +21,13 @@ load_dotenv()
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Perfil de settings (ver "Perfil production" al final del archivo)
+# - development: el stack completo de Django (admin, sesiones, CSRF, DEBUG=True por defecto)
+# - production: solo lo que usa la API JSON, DEBUG=False por defecto
+SETTINGS_PROFILE = os.getenv('SETTINGS_PROFILE', 'development')
+if SETTINGS_PROFILE not in ('development', 'production'):
+    raise ImproperlyConfigured(f'SETTINGS_PROFILE inválido: {SETTINGS_PROFILE!r} (development o production)')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
@@ -28,7 +36,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-*6jo$&3^2q2ue6vvspr*7#q(as9nwb9oen4aa-#w3-c1t9yud=')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.getenv('DEBUG', 'True') == 'True'
+DEBUG = os.getenv('DEBUG', str(SETTINGS_PROFILE != 'production')) == 'True'
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '').split(',') if os.getenv('ALLOWED_HOSTS') else []
 
@@ -45,11 +53,15 @@ INSTALLED_APPS = [
     'rest_framework',
     'drf_yasg',
     # Apps
+    'apps.core',
     'apps.teams',
     'apps.heroes',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.QueryLogMiddleware',
+    'apps.core.middleware.ReadYourWritesMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +69,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.middleware.IdentityMapMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -94,6 +107,244 @@ DATABASES = {
     }
 }
 
+# Pool de conexiones (apps/core/db_pool.py)
+# - min_size / max_size: conexiones abiertas mínimas y máximas por alias y proceso
+# - checkout_timeout: segundos que se espera una conexión libre antes de fallar
+# - health_check: SELECT 1 al prestar una conexión ociosa
+# - recycle: segundos de vida máxima de una conexión
+# CONN_MAX_AGE queda en 0: Django devuelve la conexión al pool al final de
+# cada request y el pool la reutiliza en el siguiente.
+# Activo por defecto solo en el perfil production (en desarrollo y en los
+# tests quedan los ENGINE de Django tal cual); DB_POOL=True/False lo fuerza.
+DB_POOL_ENABLED = os.getenv('DB_POOL', str(SETTINGS_PROFILE == 'production')) == 'True'
+DB_POOL = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '0')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    'checkout_timeout': float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '5')),
+    'health_check': os.getenv('DB_POOL_HEALTH_CHECK', 'True') == 'True',
+    'recycle': float(os.getenv('DB_POOL_RECYCLE', '3600')),
+}
+POOLED_ENGINES = {
+    f'django.db.backends.{vendor}': f'apps.core.db_backends.{vendor}'
+    for vendor in ('sqlite3', 'postgresql', 'mysql')
+}
+if DB_POOL_ENABLED and DATABASES['default']['ENGINE'] in POOLED_ENGINES:
+    DATABASES['default']['ENGINE'] = POOLED_ENGINES[DATABASES['default']['ENGINE']]
+    DATABASES['default']['POOL'] = DB_POOL
+
+
+def database_from_env(alias, **overrides):
+    """
+    Configuración de un alias extra (réplica o shard): DB_<ALIAS>_ENGINE,
+    DB_<ALIAS>_NAME, DB_<ALIAS>_USER... y, si falta alguno, el valor de default.
+    """
+    prefix = f'DB_{alias.upper()}_'
+    database = {**DATABASES['default']}
+    for key in ('ENGINE', 'NAME', 'USER', 'PASSWORD', 'HOST', 'PORT'):
+        database[key] = os.getenv(prefix + key, DATABASES['default'][key])
+    database.update(overrides)
+    if DB_POOL_ENABLED:
+        database['ENGINE'] = POOLED_ENGINES.get(database['ENGINE'], database['ENGINE'])
+    return database
+
+
+# Réplicas de lectura (apps/core/db_router.py)
+# DB_REPLICAS=replica1,replica2 agrega esos alias, configurados con database_from_env().
+# Con SQLite, DB_<ALIAS>_MODE elige:
+# - readonly: el mismo archivo que default abierto en solo lectura (por defecto)
+# - copy: un archivo aparte (DB_<ALIAS>_NAME) actualizado con `manage.py refresh_replicas`
+DB_REPLICAS = [alias.strip() for alias in os.getenv('DB_REPLICAS', '').split(',') if alias.strip()]
+for alias in DB_REPLICAS:
+    replica = database_from_env(alias, TEST={'MIRROR': 'default'})
+    if replica['ENGINE'].endswith('.sqlite3'):
+        replica['REPLICA_MODE'] = os.getenv(f'DB_{alias.upper()}_MODE', 'readonly')
+        if replica['REPLICA_MODE'] == 'readonly':
+            replica['NAME'] = f"file:{BASE_DIR / replica['NAME']}?mode=ro"
+            replica['OPTIONS'] = {'uri': True}
+        else:
+            replica['NAME'] = BASE_DIR / os.getenv(f'DB_{alias.upper()}_NAME', f'{alias}.sqlite3')
+    DATABASES[alias] = replica
+
+# Sharding de heroes por team (apps/heroes/sharding.py)
+# HERO_SHARDS=heroes_0,heroes_1 reparte los heroes entre esos alias por un hash
+# del team_id (teams y el índice hero_shards quedan en default). Cada alias se
+# configura con database_from_env(); con SQLite, por defecto en <alias>.sqlite3.
+# Puede incluir `default`. Vacío: sin sharding, todo en default.
+HERO_SHARDS = [alias.strip() for alias in os.getenv('HERO_SHARDS', '').split(',') if alias.strip()]
+for alias in HERO_SHARDS:
+    if alias in DATABASES:
+        continue
+    shard = database_from_env(alias)
+    if shard['ENGINE'].endswith('.sqlite3'):
+        shard['NAME'] = BASE_DIR / os.getenv(f'DB_{alias.upper()}_NAME', f'{alias}.sqlite3')
+    DATABASES[alias] = shard
+
+DATABASE_ROUTERS = ['apps.heroes.sharding.HeroShardRouter', 'apps.core.db_router.ReadReplicaRouter']
+
+# Read-your-writes: segundos que un cliente lee de default después de escribir
+# (dentro del mismo request y, vía cookie, en los siguientes)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', '5'))
+DB_READ_YOUR_WRITES_COOKIE = 'db_primary_until'
+
+# PRAGMAs de SQLite aplicados a cada conexión (apps/core/sqlite_profile.py)
+# - stock: los valores de fábrica de SQLite
+# - production: WAL + synchronous=NORMAL, caché de páginas y mmap más grandes,
+#   temporales en memoria y espera de hasta busy_timeout ms por el lock de escritura
+# Por defecto stock en desarrollo (WAL queda guardado en el archivo de la base y
+# crea -wal/-shm al lado) y production con SETTINGS_PROFILE=production
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'production' if SETTINGS_PROFILE == 'production' else 'stock')
+SQLITE_PROFILES = {
+    'stock': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),  # KiB (64 MB)
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        'temp_store': 'MEMORY',
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')),
+    },
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# LocMemCache es por proceso: con varios workers usar un backend compartido
+# (Redis/Memcached) para que las invalidaciones lleguen a todos.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+        },
+    }
+}
+
+# Segundos que vive una representación serializada de Hero/Team en caché
+REPRESENTATION_CACHE_TIMEOUT = int(os.getenv('REPRESENTATION_CACHE_TIMEOUT', '300'))
+
+# Caché en memoria (LRU + TTL) de los teams usados al escribir heroes
+TEAM_LOOKUP_CACHE_SIZE = int(os.getenv('TEAM_LOOKUP_CACHE_SIZE', '1024'))
+TEAM_LOOKUP_CACHE_TTL = float(os.getenv('TEAM_LOOKUP_CACHE_TTL', '60'))
+
+# Caché en memoria (LRU + TTL) del shard de cada héroe (solo con HERO_SHARDS)
+HERO_SHARD_CACHE_SIZE = int(os.getenv('HERO_SHARD_CACHE_SIZE', '10000'))
+HERO_SHARD_CACHE_TTL = float(os.getenv('HERO_SHARD_CACHE_TTL', '300'))
+
+# Cabecera X-Identity-Map-Saved-Queries (queries evitadas por el Identity Map del request)
+IDENTITY_MAP_DEBUG_HEADER = os.getenv('IDENTITY_MAP_DEBUG_HEADER', str(DEBUG)) == 'True'
+
+# Caché de páginas completas de los listados (stale-while-revalidate)
+# - timeout: segundos que vive la página en caché
+# - max_stale: segundos que se puede servir una página obsoleta mientras se recalcula
+# - max_offset: solo se cachean las primeras páginas (offset menor a este valor)
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True') == 'True'
+PAGE_CACHE = {
+    'heroes-list': {
+        'timeout': 300,
+        'max_stale': int(os.getenv('HEROES_LIST_MAX_STALE', '5')),
+        'max_offset': 100,
+    },
+    'heroes-by-team': {
+        'timeout': 300,
+        'max_stale': int(os.getenv('HEROES_BY_TEAM_MAX_STALE', '5')),
+        'max_offset': 100,
+    },
+    'teams-list': {
+        'timeout': 300,
+        'max_stale': int(os.getenv('TEAMS_LIST_MAX_STALE', '5')),
+        'max_offset': 100,
+    },
+}
+
+# Log de queries lentas y N+1 (apps/core/query_log.py). Activo por defecto solo en
+# el perfil production; en desarrollo se activa con QUERY_LOG_ENABLED=True (así
+# `manage.py test` no escribe muestras de N+1 en logs/)
+# - slow_ms: umbral para registrar una query como lenta
+# - n_plus_one_threshold: repeticiones del mismo fingerprint en un request para marcar N+1
+# - sample_rate: fracción de los N+1 que se guardan en samples_file (JSONL rotativo)
+QUERY_LOG = {
+    'enabled': os.getenv('QUERY_LOG_ENABLED', str(SETTINGS_PROFILE == 'production')) == 'True',
+    'slow_ms': float(os.getenv('SLOW_QUERY_MS', '100')),
+    'n_plus_one_threshold': int(os.getenv('N_PLUS_ONE_THRESHOLD', '5')),
+    'sample_rate': float(os.getenv('QUERY_LOG_SAMPLE_RATE', '1.0')),
+    'samples_file': os.getenv('QUERY_LOG_SAMPLES_FILE', str(BASE_DIR / 'logs' / 'query_samples.jsonl')),
+    'max_bytes': 5 * 1024 * 1024,
+    'backup_count': 3,
+}
+
+# ViewSets async (AsyncHeroViewSet/AsyncTeamViewSet con el ORM async).
+# Pensado para ASGI; bajo WSGI conviene dejarlo en False
+# (cada vista async se ejecutaría con async_to_sync)
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# Lecturas independientes de un Service en paralelo (apps/core/concurrency.py)
+# - enabled: por defecto solo con bases de red (con SQLite la query local es más barata que el thread)
+# - max_workers: threads (y conexiones) del pool compartido por el proceso
+PARALLEL_READS = {
+    'enabled': os.getenv('PARALLEL_READS', str(not DATABASES['default']['ENGINE'].endswith('.sqlite3'))) == 'True',
+    'max_workers': int(os.getenv('PARALLEL_READS_MAX_WORKERS', '4')),
+}
+
+
+# Group commit de las altas/modificaciones de heroes y teams (apps/core/group_commit.py)
+# - enabled: un único thread escritor confirma las escrituras concurrentes en lotes
+# - window_ms: cuánto espera el escritor para juntar escrituras en un lote
+# - max_batch: escrituras máximas por lote
+GROUP_COMMIT = {
+    'enabled': os.getenv('GROUP_COMMIT', 'False') == 'True',
+    'window_ms': float(os.getenv('GROUP_COMMIT_WINDOW_MS', '2')),
+    'max_batch': int(os.getenv('GROUP_COMMIT_MAX_BATCH', '128')),
+}
+
+# Control de admisión de HeroViewSet/TeamViewSet (apps/core/admission.py)
+# Activo por defecto solo en el perfil production. Por clase de endpoint
+# (reads, writes y exports: GET con limit >= export_min_limit o include_archived):
+# - rate / burst: token bucket por cliente, requests por segundo y ráfaga (→ 429)
+# - max_concurrency: requests de la clase en curso en el proceso
+# - max_queue / queue_timeout: requests que esperan un lugar y cuántos segundos (→ 503)
+# retry_after: segundos del Retry-After de los 503
+
+
+def admission_class(name, rate, burst, max_concurrency, max_queue, queue_timeout):
+    """
+    Límites de una clase de endpoint, con ADMISSION_<CLASE>_RATE, ..._BURST,
+    ..._MAX_CONCURRENCY, ..._MAX_QUEUE y ..._QUEUE_TIMEOUT.
+    """
+    prefix = f'ADMISSION_{name.upper()}_'
+    return {
+        'rate': float(os.getenv(prefix + 'RATE', str(rate))),
+        'burst': float(os.getenv(prefix + 'BURST', str(burst))),
+        'max_concurrency': int(os.getenv(prefix + 'MAX_CONCURRENCY', str(max_concurrency))),
+        'max_queue': int(os.getenv(prefix + 'MAX_QUEUE', str(max_queue))),
+        'queue_timeout': float(os.getenv(prefix + 'QUEUE_TIMEOUT', str(queue_timeout))),
+    }
+
+
+ADMISSION = {
+    'enabled': os.getenv('ADMISSION_CONTROL', str(SETTINGS_PROFILE == 'production')) == 'True',
+    'export_min_limit': int(os.getenv('ADMISSION_EXPORT_MIN_LIMIT', '50')),
+    'max_clients': int(os.getenv('ADMISSION_MAX_CLIENTS', '10000')),
+    'retry_after': int(os.getenv('ADMISSION_RETRY_AFTER', '1')),
+    'classes': {
+        'reads': admission_class('reads', rate=50, burst=100, max_concurrency=32, max_queue=64, queue_timeout=0.5),
+        # SQLite escribe de a una conexión: pocas escrituras en curso, el resto espera
+        'writes': admission_class('writes', rate=10, burst=20, max_concurrency=4, max_queue=32, queue_timeout=1.0),
+        'exports': admission_class('exports', rate=1, burst=5, max_concurrency=2, max_queue=4, queue_timeout=0.5),
+    },
+}
+
+# `manage.py test` corre con el control de admisión desactivado (apps/core/testing.py)
+TEST_RUNNER = 'apps.core.testing.TestRunner'
+
+# Archivo de heroes viejos (apps/heroes/archive.py, `manage.py archive_heroes`)
+# - HERO_ARCHIVE_AFTER_DAYS: antigüedad (fecha_creacion) a partir de la cual
+#   un héroe pasa de heroes a heroes_archive
+# - HERO_ARCHIVE_BATCH_SIZE: heroes movidos por transacción
+HERO_ARCHIVE_AFTER_DAYS = int(os.getenv('HERO_ARCHIVE_AFTER_DAYS', '365'))
+HERO_ARCHIVE_BATCH_SIZE = int(os.getenv('HERO_ARCHIVE_BATCH_SIZE', '500'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -136,6 +387,11 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Documentación OpenAPI en /docs/, /redoc/ y /swagger.json (apps/core/api_docs.py)
+# drf_yasg y los docs.py se cargan recién en el primer request de esas rutas.
+# API_DOCS=False las quita y los decoradores de documentación no hacen nada.
+API_DOCS_ENABLED = os.getenv('API_DOCS', 'True') == 'True'
+
 # Swagger Settings
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -147,4 +403,68 @@ SWAGGER_SETTINGS = {
     },
     'USE_SESSION_AUTH': False,
     'JSON_EDITOR': True,
+    # Swagger UI y ReDoc cargan el schema prearmado de /swagger.json
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
+}
+
+REDOC_SETTINGS = {
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
 }
+
+# Schema OpenAPI prearmado (manage.py build_openapi, ver apps/core/api_docs.py).
+# Si el archivo no existe, /swagger.json lo genera una vez por proceso.
+OPENAPI_SCHEMA_DIR = BASE_DIR / os.getenv('OPENAPI_SCHEMA_DIR', 'openapi')
+# max-age de /swagger.json y /swagger.yaml (0: el cliente revalida con ETag)
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv('OPENAPI_SCHEMA_MAX_AGE', '0'))
+
+
+# Perfil production: API JSON sin el stack de templates
+# La API no usa sesiones, CSRF, mensajes, admin ni usuarios de Django.
+# Sacarlos evita 5 middlewares y la autenticación de DRF en cada request.
+# DEBUG queda en False, así que Django no guarda el SQL de cada query en
+# connection.queries. Con SETTINGS_PROFILE=production:
+# - INSTALLED_APPS sin admin, auth, contenttypes, sessions ni messages
+#   (drf_yasg y staticfiles solo con API_DOCS=True)
+# - MIDDLEWARE sin sesiones, CSRF, autenticación, mensajes ni clickjacking
+# - DRF sin autenticadores (request.user es None) y solo JSONRenderer
+# - conexiones persistentes (CONN_MAX_AGE) en los alias sin pool; con
+#   DB_POOL el pool ya las reutiliza y CONN_MAX_AGE queda en 0
+# `manage.py bench_settings` compara el costo por request contra development.
+PRODUCTION_EXCLUDED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+]
+PRODUCTION_EXCLUDED_DOCS_APPS = ['drf_yasg', 'django.contrib.staticfiles']
+PRODUCTION_EXCLUDED_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+if SETTINGS_PROFILE == 'production':
+    API_DOCS_ENABLED = os.getenv('API_DOCS', 'False') == 'True'
+    excluded_apps = PRODUCTION_EXCLUDED_APPS + ([] if API_DOCS_ENABLED else PRODUCTION_EXCLUDED_DOCS_APPS)
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in excluded_apps]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in PRODUCTION_EXCLUDED_MIDDLEWARE]
+    TEMPLATES[0]['OPTIONS']['context_processors'] = [
+        'django.template.context_processors.debug',
+        'django.template.context_processors.request',
+    ]
+    AUTH_PASSWORD_VALIDATORS = []
+
+    REST_FRAMEWORK = {
+        'DEFAULT_AUTHENTICATION_CLASSES': [],
+        'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+        'UNAUTHENTICATED_USER': None,
+        'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    }
+
+    for database in DATABASES.values():
+        if database['ENGINE'] not in POOLED_ENGINES.values():
+            database['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', '600'))
+            database['CONN_HEALTH_CHECKS'] = True
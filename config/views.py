@@ -1,9 +1,12 @@
 """
 Views básicas del proyecto
 """
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from apps.core.metrics import registry
 
 
 @api_view(['GET'])
@@ -20,3 +23,12 @@ def hola_mundo(request):
         },
         status=status.HTTP_200_OK
     )
+
+
+@require_GET
+def metrics(request):
+    """
+    Métricas de la API en formato de texto de Prometheus
+    (ver apps/core/metrics.py)
+    """
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
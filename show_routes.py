@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """
-Script para mostrar todas las rutas generadas por el router de Teams
+Script para mostrar todas las rutas de la API (router único de config/routers.py)
+y cómo las resuelve la tabla de rutas compilada (apps/core/url_dispatch.py)
 """
 import os
 import django
@@ -13,64 +14,72 @@ load_dotenv()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
-from apps.teams.routers import teams_router
+from django.urls import get_resolver
+from apps.core.url_dispatch import CompiledRouteResolver, route_key
+from config.routers import api_router
+
+api = next(pattern for pattern in get_resolver().url_patterns if isinstance(pattern, CompiledRouteResolver))
+prefix = str(api.pattern)
+table = api.route_table
 
 print("\n" + "=" * 80)
-print("RUTAS GENERADAS AUTOMÁTICAMENTE POR EL ROUTER DE TEAMS")
+print("RUTAS DE LA API (ROUTER ÚNICO)")
 print("=" * 80 + "\n")
 
 print("Configuración del router:")
-print(f"  - Prefijo en router.register(): 'teams'")
-print(f"  - Prefijo en config/urls.py:    'api/'")
-print(f"  - URL base resultante:          '/api/teams/'\n")
+for registered_prefix, viewset, basename in api_router.registry:
+    print(f"  - router.register('{registered_prefix}', {viewset.__name__}, basename='{basename}')")
+print(f"  - Prefijo en config/urls.py:    '{prefix}' (compiled_path)\n")
 
 print("=" * 80)
-print("ENDPOINTS GENERADOS:")
+print("ENDPOINTS (en el orden en que se resuelven):")
 print("=" * 80 + "\n")
 
-for idx, pattern in enumerate(teams_router.urls, 1):
-    # Obtener el patrón de URL
+for idx, pattern in enumerate(api.url_patterns, 1):
     url_pattern = str(pattern.pattern)
+    route = url_pattern.lstrip('^').rstrip('$')
+    callback = pattern.callback
+    actions = getattr(callback, 'actions', None)
+    view_class = getattr(callback, 'cls', None)
 
-    # Obtener el nombre de la ruta
-    name = pattern.name if hasattr(pattern, 'name') else 'N/A'
+    # Métodos HTTP: los del ViewSet en esta ruta, o los de la vista
+    if actions:
+        methods = ", ".join(f"{method.upper()} → {action}()" for method, action in actions.items())
+        view = view_class.__name__
+    elif view_class is not None:
+        methods = ", ".join(method.upper() for method in view_class().allowed_methods)
+        view = view_class.__name__
+    else:
+        methods = "GET"
+        view = callback.__name__
 
-    # Mapear a métodos HTTP
-    if 'list' in name or ('^teams/$' in url_pattern):
-        if '{' not in url_pattern:
-            methods = "GET, POST"
-            description = "Listar todos / Crear nuevo"
-        else:
-            methods = "GET, PUT, PATCH, DELETE"
-            description = "Obtener / Actualizar / Eliminar"
+    # Cómo la encuentra la tabla compilada
+    key = route_key(pattern)
+    if table.exact.get(route) is pattern:
+        dispatch = "exacta (lookup en dict)"
+    elif key is not None:
+        dispatch = f"prefijo '{key}' ({len(table.buckets[key])} candidatas)"
     else:
-        methods = "Varies"
-        description = "Endpoint personalizado"
+        dispatch = "wildcard (se prueba siempre)"
 
-    print(f"{idx}. Patrón: ^{url_pattern}")
-    print(f"   URL completa: /api/{url_pattern}")
-    print(f"   Nombre: {name}")
+    print(f"{idx}. Patrón: {url_pattern}")
+    print(f"   URL completa: /{prefix}{route}")
+    print(f"   Nombre: {pattern.name}")
+    print(f"   Vista: {view}")
     print(f"   Métodos HTTP: {methods}")
-    print(f"   Descripción: {description}")
+    print(f"   Resolución: {dispatch}")
     print()
 
 print("=" * 80)
-print("\nMAPEO DE MÉTODOS DEL VIEWSET A URLs:")
+print("TABLA DE RUTAS COMPILADA:")
 print("=" * 80 + "\n")
 
-mappings = [
-    ("list()", "GET", "/api/teams/", "Listar todos los teams"),
-    ("create()", "POST", "/api/teams/", "Crear un nuevo team"),
-    ("retrieve()", "GET", "/api/teams/{id}/", "Obtener team por ID"),
-    ("partial_update()", "PATCH", "/api/teams/{id}/", "Actualizar team parcialmente"),
-    ("destroy()", "DELETE", "/api/teams/{id}/", "Eliminar team"),
-    ("get_by_name()", "GET", "/api/teams/by-name/", "Buscar team por nombre (custom action)"),
-]
-
-for method, http, url, desc in mappings:
-    print(f"  {method:<20} → {http:<7} {url:<25} ({desc})")
+print(f"  Rutas exactas:   {', '.join(f'/{prefix}{path}' for path in table.exact)}")
+for key, candidates in table.buckets.items():
+    print(f"  Prefijo '{key}':{' ' * max(1, 14 - len(key))}{len(candidates)} patrones")
+print(f"  Wildcard:        {len(table.wildcard)} patrones")
 
 print("\n" + "=" * 80)
-print("NOTA: Estas rutas se generan AUTOMÁTICAMENTE cuando haces:")
-print("  router.register(r'teams', TeamViewSet, basename='team')")
+print("NOTA: Las rutas se generan AUTOMÁTICAMENTE a partir de los ViewSets")
+print("registrados en cada apps/<app>/routers.py (ver config/routers.py)")
 print("=" * 80 + "\n")